@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from ai_app.services.ingredient_index import rebuild_index
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild parsed ingredient data (matching entries and scaling "
+        "templates) for every recipe from scratch. Run it after deploying "
+        "migrations that add stored ingredient data (e.g. ai_app 0002)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        count = rebuild_index(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Indexed {count} recipes."))
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.7 on 2026-10-18 09:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('recipes_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecipeIngredientIndex',
+            fields=[
+                ('recipe', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='ingredient_index', serialize=False, to='recipes_app.recipe')),
+                ('items', models.JSONField(default=list)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='IngredientToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(db_index=True, max_length=500)),
+                ('recipe', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ingredient_tokens', to='recipes_app.recipe')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('token', 'recipe'), name='unique_ingredient_token_recipe')],
+            },
+        ),
+    ]
@@ -0,0 +1,22 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """Parsed scaling templates next to the matching entries.
+
+    No data migration here: existing rows keep ``lines=[]`` and entries
+    without quantity/unit until 0004 re-parses them; until then the code falls
+    back to parsing ``Recipe.ingredients``.
+    """
+
+    dependencies = [
+        ("ai_app", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="recipeingredientindex",
+            name="lines",
+            field=models.JSONField(default=list),
+        ),
+    ]
@@ -0,0 +1,16 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """Drop the per-token table: it was written on every save but never read,
+    candidate selection happens in the in-memory ``CatalogMatrix``."""
+
+    dependencies = [
+        ("ai_app", "0002_recipeingredientindex_lines"),
+    ]
+
+    operations = [
+        migrations.DeleteModel(
+            name="IngredientToken",
+        ),
+    ]
@@ -0,0 +1,254 @@
+import re
+from fractions import Fraction
+
+from django.db import migrations
+
+# Копія розбору з ai_app.services на момент цієї міграції: міграція не
+# імпортує код застосунку, який надалі може змінитися.
+
+BASIC_IGNORED = {
+    "сіль",
+    "перець",
+    "вода",
+    "олія",
+    "масло",
+    "цукор",
+    "salt",
+    "pepper",
+    "water",
+    "oil",
+    "sugar",
+}
+UNITS = [
+    "г",
+    "гр",
+    "кг",
+    "мл",
+    "л",
+    "шт",
+    "ст.л",
+    "ч.л",
+    "стл",
+    "чл",
+    "tbsp",
+    "tsp",
+    "cup",
+    "cups",
+]
+QUANTITY_UNITS = [
+    "г",
+    "гр",
+    "g",
+    "кг",
+    "kg",
+    "мл",
+    "ml",
+    "л",
+    "l",
+    "cup",
+    "cups",
+    "ч.л",
+    "чл",
+    "tsp",
+    "ст.л",
+    "стл",
+    "tbsp",
+    "шт",
+]
+FRACTIONS = str.maketrans(
+    {
+        "½": "1/2",
+        "⅓": "1/3",
+        "⅔": "2/3",
+        "¼": "1/4",
+        "¾": "3/4",
+        "⅕": "1/5",
+        "⅖": "2/5",
+        "⅗": "3/5",
+        "⅘": "4/5",
+        "⅙": "1/6",
+        "⅚": "5/6",
+        "⅛": "1/8",
+        "⅜": "3/8",
+        "⅝": "5/8",
+        "⅞": "7/8",
+    }
+)
+
+_NUM = r"(?:\d+(?:[\.,]\d+)?)"
+_FRAC = r"(?:\d+\s*/\s*\d+)"
+_MIXED = rf"(?:{_NUM}\s+{_FRAC})"
+_ONE = rf"(?:{_MIXED}|{_FRAC}|{_NUM})"
+TOKEN_RE = re.compile(
+    rf"(?P<range>(?P<a>{_ONE})\s*(?:-|–|—|\bto\b|\bдо\b|\bпо\b)\s*(?P<b>{_ONE}))"
+    rf"|(?P<single>{_ONE})",
+    flags=re.IGNORECASE,
+)
+MIXED_RE = re.compile(_MIXED)
+FRAC_RE = re.compile(_FRAC)
+UNIT_RE = re.compile(
+    r"\s*(?P<unit>"
+    + "|".join(re.escape(u) for u in sorted(QUANTITY_UNITS, key=len, reverse=True))
+    + r")(?![a-zа-яіїєґ])\.?",
+    flags=re.IGNORECASE,
+)
+UNITS_RE = re.compile(
+    r"\b(?:"
+    + "|".join(re.escape(u) for u in sorted(UNITS, key=len, reverse=True))
+    + r")\b"
+)
+
+
+def split_list(text):
+    return [p.strip() for p in re.split(r"[\n,;]+", text) if p.strip()]
+
+
+def split_ingredients(text):
+    return [x.strip() for x in re.split(r"[\n,]+", text) if x.strip()]
+
+
+def normalize(s):
+    s = s.lower().strip().replace("’", "'")
+    s = re.sub(r"\(.*?\)", " ", s)
+    s = re.sub(r"[\d]+([\/\.,-][\d]+)*", " ", s)
+    s = UNITS_RE.sub(" ", s)
+    s = re.sub(r"[^a-zа-яіїєґ'\s-]", " ", s)
+    return re.sub(r"\s+", " ", s).strip()
+
+
+def tokens(s):
+    parts = re.split(r"[\s-]+", normalize(s))
+    return {t for t in parts if t and t not in BASIC_IGNORED}
+
+
+def parse_number(token):
+    token = " ".join(token.strip().translate(FRACTIONS).replace(",", ".").split())
+    if "/" not in token:
+        return float(token)
+    if MIXED_RE.fullmatch(token):
+        whole, frac = token.split(" ", 1)
+        return float(whole) + float(Fraction(frac))
+    if FRAC_RE.fullmatch(token):
+        return float(Fraction(token))
+    return float(token)
+
+
+def parse_quantity(line):
+    line = line.strip()
+    m = TOKEN_RE.search(line)
+    if m and m.start() > 0 and line[m.start() - 1].isalpha():
+        m = None
+    if not m:
+        return None, None, line
+
+    quantity = parse_number(m.group("b") if m.group("range") else m.group("single"))
+    rest_start = m.end()
+    unit = None
+    um = UNIT_RE.match(line, m.end())
+    if um:
+        unit = um.group("unit").lower()
+        rest_start = um.end()
+
+    label = re.sub(r"\s+", " ", f"{line[:m.start()]} {line[rest_start:]}")
+    label = label.strip(" .,;-")
+    return quantity, unit, label or line
+
+
+def parse_template(line):
+    if "°" in line or "º" in line:
+        return [line]
+    parts = []
+    pos = 0
+    for m in TOKEN_RE.finditer(line):
+        parts.append(line[pos : m.start()])
+        if m.group("range"):
+            parts.append([parse_number(m.group("a")), parse_number(m.group("b"))])
+        else:
+            parts.append([parse_number(m.group("single"))])
+        pos = m.end()
+    parts.append(line[pos:])
+    return parts
+
+
+def build_entries(text):
+    entries = []
+    for item in split_list(text or ""):
+        name = normalize(item)
+        if not name or name in BASIC_IGNORED:
+            continue
+        quantity, unit, label = parse_quantity(item)
+        entries.append(
+            {
+                "raw": item.strip(),
+                "name": name,
+                "tokens": sorted(tokens(item)),
+                "quantity": quantity,
+                "unit": unit,
+                "label": label,
+            }
+        )
+    return entries
+
+
+def build_lines(text):
+    return [
+        {"raw": line, "parts": parse_template(line)}
+        for line in split_ingredients(text or "")
+    ]
+
+
+def backfill(apps, schema_editor):
+    Recipe = apps.get_model("recipes_app", "Recipe")
+    RecipeIngredientIndex = apps.get_model("ai_app", "RecipeIngredientIndex")
+    batch_size = 1000
+
+    # рецепти без рядка індексу: створені до 0001 або в обхід сигналів
+    missing = (
+        Recipe.objects.filter(ingredient_index__isnull=True)
+        .only("id", "ingredients")
+        .order_by("id")
+    )
+    batch = []
+    for recipe in missing.iterator(chunk_size=batch_size):
+        batch.append(
+            RecipeIngredientIndex(
+                recipe_id=recipe.pk,
+                items=build_entries(recipe.ingredients),
+                lines=build_lines(recipe.ingredients),
+            )
+        )
+        if len(batch) >= batch_size:
+            RecipeIngredientIndex.objects.bulk_create(batch)
+            batch = []
+    RecipeIngredientIndex.objects.bulk_create(batch)
+
+    # рядки з часів до 0002: без lines і без кількостей у items
+    stale = (
+        RecipeIngredientIndex.objects.filter(lines=[])
+        .exclude(recipe__ingredients="")
+        .select_related("recipe")
+        .order_by("recipe_id")
+    )
+    batch = []
+    for index in stale.iterator(chunk_size=batch_size):
+        index.items = build_entries(index.recipe.ingredients)
+        index.lines = build_lines(index.recipe.ingredients)
+        batch.append(index)
+        if len(batch) >= batch_size:
+            RecipeIngredientIndex.objects.bulk_update(batch, ["items", "lines"])
+            batch = []
+    RecipeIngredientIndex.objects.bulk_update(batch, ["items", "lines"])
+
+
+class Migration(migrations.Migration):
+    """Parse ingredients of every recipe that has no index row, or an index
+    row written before 0002, so nothing depends on a manual
+    ``rebuild_ingredient_index`` after deploying."""
+
+    dependencies = [
+        ("ai_app", "0003_delete_ingredienttoken"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -1,3 +1,22 @@
 from django.db import models
 
-# Create your models here.
+from recipes_app.models import Recipe
+
+
+class RecipeIngredientIndex(models.Model):
+    recipe = models.OneToOneField(
+        Recipe,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="ingredient_index",
+    )
+    # інгредієнти для підбору рецептів, без базових (сіль, вода, ...):
+    # [{"raw", "name", "tokens", "quantity", "unit", "label"}, ...]
+    items = models.JSONField(default=list)
+    # усі рядки рецепта для масштабування: [{"raw", "parts"}, ...]
+    lines = models.JSONField(default=list)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Ingredient index for recipe {self.recipe_id}"
+
@@ -6,6 +6,7 @@ class ScaleIngredientsRequestSerializer(serializers.Serializer):
     ingredients_text = serializers.CharField(required=False, allow_blank=False)
     factor = serializers.FloatField(required=True, min_value=0.01, max_value=100.0)
     use_ai = serializers.BooleanField(required=False, default=False)
+    defer_ai = serializers.BooleanField(required=False, default=False)
 
     def validate(self, attrs):
         if not attrs.get("recipe_id") and not attrs.get("ingredients_text"):
@@ -13,6 +14,30 @@ class ScaleIngredientsRequestSerializer(serializers.Serializer):
         return attrs
 
 
+class ScaleRecipeQuerySerializer(serializers.Serializer):
+    recipe_id = serializers.IntegerField(min_value=1)
+    factor = serializers.FloatField(min_value=0.01, max_value=100.0)
+
+
+class ScaleBatchRequestSerializer(serializers.Serializer):
+    recipe_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        required=False,
+        max_length=50,
+    )
+    ingredients_text = serializers.CharField(required=False, allow_blank=False)
+    factors = serializers.ListField(
+        child=serializers.FloatField(min_value=0.01, max_value=100.0),
+        min_length=1,
+        max_length=24,
+    )
+
+    def validate(self, attrs):
+        if not attrs.get("recipe_ids") and not attrs.get("ingredients_text"):
+            raise serializers.ValidationError("Provide either recipe_ids or ingredients_text.")
+        return attrs
+
+
 class SuggestRecipesRequestSerializer(serializers.Serializer):
     products = serializers.ListField(
         child=serializers.CharField(), required=False
@@ -37,8 +62,22 @@ class WeeklyPlanRequestSerializer(serializers.Serializer):
 
     verified_only = serializers.BooleanField(required=False, default=True)
     use_ai = serializers.BooleanField(required=False, default=False)
+    defer_ai = serializers.BooleanField(required=False, default=False)
 
     def validate(self, attrs):
         if not attrs.get("pantry") and not attrs.get("pantry_text"):
             raise serializers.ValidationError("Provide either pantry (list) or pantry_text (string).")
-        return attrs
\ No newline at end of file
+        return attrs
+
+
+class ShoppingListItemSerializer(serializers.Serializer):
+    recipe_id = serializers.IntegerField(min_value=1)
+    factor = serializers.FloatField(required=False, default=1.0, min_value=0.01, max_value=100.0)
+
+
+class ShoppingListRequestSerializer(serializers.Serializer):
+    items = ShoppingListItemSerializer(many=True, allow_empty=False, max_length=200)
+
+
+class AIJobQuerySerializer(serializers.Serializer):
+    wait = serializers.FloatField(required=False, default=0, min_value=0, max_value=25)
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import logging
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+DONE = "done"
+FAILED = "failed"
+
+_executor = ThreadPoolExecutor(
+    max_workers=getattr(settings, "AI_JOB_WORKERS", 4), thread_name_prefix="ai-job"
+)
+
+
+def _key(job_id: str) -> str:
+    return f"ai:job:{job_id}"
+
+
+def _ttl() -> int:
+    return getattr(settings, "AI_JOB_TTL", 3600)
+
+
+def _run(job_id: str, job: dict, func: Callable, args: tuple) -> None:
+    try:
+        pretty = func(*args)
+        job.update(status=DONE, pretty=pretty)
+    except Exception:
+        logger.exception("AI job %s failed", job_id)
+        job.update(status=FAILED)
+    cache.set(_key(job_id), job, _ttl())
+
+
+def submit(user_id: int, func: Callable, *args) -> str:
+    """Run ``func(*args)`` on the worker pool; its return value becomes ``pretty``."""
+    job_id = uuid.uuid4().hex
+    job = {"id": job_id, "user_id": user_id, "status": PENDING, "pretty": None}
+    cache.set(_key(job_id), job, _ttl())
+    _executor.submit(_run, job_id, dict(job), func, args)
+    return job_id
+
+
+def get_job(job_id: str, wait: float = 0, interval: float = 0.25) -> Optional[dict]:
+    """Current job state; with ``wait`` polls until it leaves PENDING or times out.
+
+    The poll sleeps in the request thread, so every waiting client holds a
+    WSGI worker. ``wait`` is therefore capped at ``AI_JOB_MAX_WAIT`` seconds;
+    clients poll again while the job is pending.
+    """
+    wait = min(wait, getattr(settings, "AI_JOB_MAX_WAIT", 2))
+    deadline = time.monotonic() + wait
+    while True:
+        job = cache.get(_key(job_id))
+        if job is None or job["status"] != PENDING or time.monotonic() >= deadline:
+            return job
+        time.sleep(interval)
@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import heapq
+import threading
+from array import array
+from bisect import bisect_right
+from collections import Counter, defaultdict
+from itertools import chain
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from recipes_app.models import Recipe
+
+from ..models import RecipeIngredientIndex
+from .catalog import catalog_version
+from .ingredient_index import build_entries
+from .ingredient_matcher import PantryLike, prepare_pantry
+from .similarity import TrigramIndex
+
+
+def _rank_key(x):
+    score, neg_matched, neg_total, row = x
+    return score, neg_matched, neg_total, -row
+
+
+class CatalogMatrix:
+    """All indexed recipes as sparse rows over an integer ingredient vocabulary.
+
+    ``postings[name_id]`` holds the rows that use ``names[name_id]``. A pantry
+    is encoded once into the set of vocabulary ids it matches, and matched
+    counts for the whole catalog come from a single ``Counter`` pass over the
+    postings of those ids. Repeated names inside one recipe count once.
+    """
+
+    def __init__(self, rows: Iterable[Tuple[int, bool, int, str, List[dict]]]):
+        self.vocab: Dict[str, int] = {}
+        self.names: List[str] = []
+        self.recipe_ids: List[int] = []
+        self.verified: List[bool] = []
+        self.categories: List[int] = []
+        self.difficulties: List[str] = []
+        self.totals: List[int] = []
+        self.entries: List[List[Tuple[str, int]]] = []
+        self.items: List[List[dict]] = []
+        postings: Dict[int, array] = defaultdict(lambda: array("I"))
+        token_ids: Dict[str, Set[int]] = defaultdict(set)
+
+        for row, (recipe_id, verified, category_id, difficulty, items) in enumerate(
+            rows
+        ):
+            row_ids = set()
+            entries = []
+            for item in items:
+                name_id = self.vocab.get(item["name"])
+                if name_id is None:
+                    name_id = len(self.names)
+                    self.vocab[item["name"]] = name_id
+                    self.names.append(item["name"])
+                    for t in item["tokens"]:
+                        token_ids[t].add(name_id)
+                row_ids.add(name_id)
+                entries.append((item["raw"], name_id))
+            for name_id in row_ids:
+                postings[name_id].append(row)
+            self.recipe_ids.append(recipe_id)
+            self.verified.append(bool(verified))
+            self.categories.append(category_id)
+            self.difficulties.append(difficulty)
+            self.totals.append(len(row_ids))
+            self.entries.append(entries)
+            self.items.append(items)
+
+        self.postings = dict(postings)
+        self.token_ids = dict(token_ids)
+        self._trigrams: Optional[TrigramIndex] = None
+
+        # усі назви одним рядком: пошук підрядка через str.find замість циклу
+        self._joined = "\n".join(self.names)
+        self._offsets = []
+        pos = 0
+        for name in self.names:
+            self._offsets.append(pos)
+            pos += len(name) + 1
+
+    def __len__(self):
+        return len(self.recipe_ids)
+
+    @property
+    def trigrams(self) -> TrigramIndex:
+        if self._trigrams is None:
+            self._trigrams = TrigramIndex(self.names)
+        return self._trigrams
+
+    def _names_containing(self, needle: str) -> Set[int]:
+        found = set()
+        start = self._joined.find(needle)
+        while start != -1:
+            name_id = bisect_right(self._offsets, start) - 1
+            found.add(name_id)
+            if name_id + 1 >= len(self._offsets):
+                break
+            start = self._joined.find(needle, self._offsets[name_id + 1])
+        return found
+
+    def _names_within(self, text: str) -> Set[int]:
+        found = set()
+        n = len(text)
+        for i in range(n):
+            for j in range(i + 1, n + 1):
+                name_id = self.vocab.get(text[i:j])
+                if name_id is not None:
+                    found.add(name_id)
+        return found
+
+    def encode_pantry(self, pantry_items: PantryLike) -> Set[int]:
+        """Vocabulary ids that ``entry_matches_pantry`` would accept."""
+        pantry = prepare_pantry(pantry_items)
+        matched: Set[int] = set()
+        for pn, _ in pantry.items:
+            matched |= self._names_containing(pn)
+            matched |= self._names_within(pn)
+            matched.update(self.vocab[name] for name in self.trigrams.near(pn))
+        for t in pantry.all_tokens:
+            matched |= self.token_ids.get(t, set())
+        return matched
+
+    def matched_counts(self, matched_ids: Set[int]) -> Counter:
+        return Counter(
+            chain.from_iterable(self.postings[name_id] for name_id in matched_ids)
+        )
+
+    def missing(self, row: int, matched_ids: Set[int]) -> List[str]:
+        return [raw for raw, name_id in self.entries[row] if name_id not in matched_ids]
+
+    def missing_items(self, row: int, matched_ids: Set[int]) -> List[dict]:
+        """Stored ingredient dicts (with parsed quantity/unit) not in the pantry."""
+        return [
+            item
+            for item, (_, name_id) in zip(self.items[row], self.entries[row])
+            if name_id not in matched_ids
+        ]
+
+    def top(
+        self, pantry_items: PantryLike, limit: int, verified_only: bool = True
+    ) -> List[dict]:
+        matched_ids = self.encode_pantry(pantry_items)
+        counts = self.matched_counts(matched_ids)
+
+        def scored():
+            for row, matched in counts.items():
+                if verified_only and not self.verified[row]:
+                    continue
+                total = self.totals[row]
+                yield round(matched / total, 3), -matched, -total, row
+
+        def unmatched():
+            for row in range(len(self)):
+                if row in counts or (verified_only and not self.verified[row]):
+                    continue
+                yield 0.0, 0, -self.totals[row], row
+
+        # рядки йдуть від новіших рецептів: при рівних балах виграє новіший
+        best = heapq.nlargest(limit, scored(), key=_rank_key)
+        # як і раніше, решту limit добираємо рецептами без жодного збігу
+        if len(best) < limit:
+            best += heapq.nlargest(limit - len(best), unmatched(), key=_rank_key)
+
+        results = []
+        for score, neg_matched, neg_total, row in best:
+            results.append(
+                {
+                    "recipe_id": self.recipe_ids[row],
+                    "score": score,
+                    "matched_count": -neg_matched,
+                    "total_count": -neg_total,
+                    "missing": self.missing(row, matched_ids),
+                }
+            )
+        return results
+
+
+def load_catalog_matrix() -> CatalogMatrix:
+    indexed = (
+        RecipeIngredientIndex.objects.order_by("-recipe__created_at")
+        .values_list(
+            "recipe_id",
+            "recipe__verified_by_chef",
+            "recipe__category_id",
+            "recipe__difficulty",
+            "items",
+        )
+        .iterator(chunk_size=2000)
+    )
+    # рецепти без рядка індексу (до міграції 0004 або створені в обхід
+    # сигналів) розбираємо тут, як recipes_lines
+    unindexed = (
+        (pk, verified, category_id, difficulty, build_entries(ingredients))
+        for pk, verified, category_id, difficulty, ingredients in (
+            Recipe.objects.filter(ingredient_index__isnull=True)
+            .order_by("-created_at")
+            .values_list(
+                "id", "verified_by_chef", "category_id", "difficulty", "ingredients"
+            )
+            .iterator(chunk_size=2000)
+        )
+    )
+    return CatalogMatrix(chain(indexed, unindexed))
+
+
+_lock = threading.Lock()
+_cached: Tuple[Optional[int], Optional[CatalogMatrix]] = (None, None)
+
+
+def get_catalog_matrix() -> CatalogMatrix:
+    """Process-wide matrix, rebuilt when the catalog version changes."""
+    global _cached
+    version = catalog_version()
+    cached_version, matrix = _cached
+    if matrix is not None and cached_version == version:
+        return matrix
+    with _lock:
+        cached_version, matrix = _cached
+        if matrix is None or cached_version != version:
+            matrix = load_catalog_matrix()
+            _cached = (version, matrix)
+    return matrix
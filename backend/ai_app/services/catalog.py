@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+from kyking_project import counters
+
+CATALOG_VERSION_KEY = "ai:catalog_version"
+
+
+def catalog_version() -> int:
+    return counters.version(CATALOG_VERSION_KEY)
+
+
+def bump_catalog_version() -> None:
+    counters.bump(CATALOG_VERSION_KEY)
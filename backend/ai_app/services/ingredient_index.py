@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import logging
+from typing import Dict, Iterable, List, Optional
+
+from django.db import transaction
+
+from recipes_app.models import Recipe
+
+from ..models import RecipeIngredientIndex
+from .catalog import bump_catalog_version
+from .ingredient_parser import parse_quantity
+from .ingredient_matcher import (
+    BASIC_IGNORED,
+    normalize,
+    split_list,
+    tokens,
+)
+from .portion_scaler import parse_template, split_ingredients
+from .scale_cache import bump_scale_epoch
+
+logger = logging.getLogger(__name__)
+
+
+def build_entries(ingredients_text: str) -> List[dict]:
+    entries = []
+    for item in split_list(ingredients_text or ""):
+        name = normalize(item)
+        if not name or name in BASIC_IGNORED:
+            continue
+        quantity, unit, label = parse_quantity(item)
+        entries.append(
+            {
+                "raw": item.strip(),
+                "name": name,
+                "tokens": sorted(tokens(item)),
+                "quantity": quantity,
+                "unit": unit,
+                "label": label,
+            }
+        )
+    return entries
+
+
+def build_lines(ingredients_text: str) -> List[dict]:
+    return [
+        {"raw": line, "parts": parse_template(line)}
+        for line in split_ingredients(ingredients_text or "")
+    ]
+
+
+def index_recipe(recipe: Recipe, created: bool = False) -> None:
+    entries = build_entries(recipe.ingredients)
+    lines = build_lines(recipe.ingredients)
+    if created:
+        RecipeIngredientIndex.objects.create(
+            recipe_id=recipe.pk, items=entries, lines=lines
+        )
+    else:
+        RecipeIngredientIndex.objects.update_or_create(
+            recipe_id=recipe.pk, defaults={"items": entries, "lines": lines}
+        )
+
+
+def recipes_entries(recipe_ids: Iterable[int]) -> Dict[int, List[dict]]:
+    """Matching entries for many recipes in one query; unknown ids are left out."""
+    recipe_ids = set(recipe_ids)
+    found = dict(
+        RecipeIngredientIndex.objects.filter(recipe_id__in=recipe_ids).values_list(
+            "recipe_id", "items"
+        )
+    )
+    # рецепти без рядка індексу (до міграції 0004 або створені в обхід сигналів)
+    rest = recipe_ids - found.keys()
+    if rest:
+        for pk, ingredients in Recipe.objects.filter(pk__in=rest).values_list(
+            "id", "ingredients"
+        ):
+            found[pk] = build_entries(ingredients)
+    return found
+
+
+def recipes_lines(recipe_ids: Iterable[int]) -> Dict[int, List[dict]]:
+    """Parsed lines for many recipes in one query; unknown ids are left out."""
+    recipe_ids = set(recipe_ids)
+    # порожні lines - рядки індексу з часів до міграції 0002
+    found = {
+        recipe_id: lines
+        for recipe_id, lines in RecipeIngredientIndex.objects.filter(
+            recipe_id__in=recipe_ids
+        ).values_list("recipe_id", "lines")
+        if lines
+    }
+    # рецепти без рядка індексу (до міграції 0004 або створені в обхід сигналів)
+    rest = recipe_ids - found.keys()
+    if rest:
+        for pk, ingredients in Recipe.objects.filter(pk__in=rest).values_list(
+            "id", "ingredients"
+        ):
+            found[pk] = build_lines(ingredients)
+    return found
+
+
+def recipe_lines(recipe_id: int) -> Optional[List[dict]]:
+    """Parsed lines of a recipe, or ``None`` if the recipe does not exist."""
+    return recipes_lines([recipe_id]).get(recipe_id)
+
+
+def index_recipes(recipes: Iterable[Recipe], batch_size: int = 1000) -> int:
+    """Bulk-index recipes that have no index rows yet (e.g. after
+    ``bulk_create``). Only ``pk`` and ``ingredients`` are read."""
+    count = 0
+    indexes = []
+    for recipe in recipes:
+        indexes.append(
+            RecipeIngredientIndex(
+                recipe_id=recipe.pk,
+                items=build_entries(recipe.ingredients),
+                lines=build_lines(recipe.ingredients),
+            )
+        )
+        count += 1
+
+        if len(indexes) >= batch_size:
+            RecipeIngredientIndex.objects.bulk_create(indexes)
+            indexes = []
+
+    RecipeIngredientIndex.objects.bulk_create(indexes)
+    return count
+
+
+def rebuild_index(batch_size: int = 1000) -> int:
+    with transaction.atomic():
+        RecipeIngredientIndex.objects.all().delete()
+
+        qs = Recipe.objects.only("id", "ingredients").order_by("id")
+        count = index_recipes(qs.iterator(chunk_size=batch_size), batch_size)
+
+    bump_catalog_version()
+    bump_scale_epoch()
+    logger.info("Ingredient index rebuilt for %s recipes", count)
+    return count
+
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 import re
-from difflib import SequenceMatcher
-from typing import List, Tuple, Set
+from functools import lru_cache
+from typing import AbstractSet, FrozenSet, Iterable, List, Optional, Tuple, Union
+
+from .similarity import SimilarityBackend, default_backend
 
 BASIC_IGNORED = {
     "сіль",
@@ -36,63 +38,133 @@ UNITS = {
 }
 
 
+_SPLIT_RE = re.compile(r"[\n,;]+")
+_PARENS_RE = re.compile(r"\(.*?\)")
+_NUMBER_RE = re.compile(r"[\d]+([\/\.,-][\d]+)*")
+_NON_WORD_RE = re.compile(r"[^a-zа-яіїєґ'\s-]")
+_SPACES_RE = re.compile(r"\s+")
+_TOKEN_SPLIT_RE = re.compile(r"[\s-]+")
+
+PantryLike = Union["PreparedPantry", Iterable[str]]
+
+
 def split_list(text: str) -> List[str]:
-    parts = re.split(r"[\n,;]+", text)
+    parts = _SPLIT_RE.split(text)
     return [p.strip() for p in parts if p.strip()]
 
 
+class PreparedPantry:
+    """Pantry items normalized once, reusable for every ingredient of a request."""
+
+    def __init__(self, items: List[Tuple[str, FrozenSet[str]]]):
+        self.items = items
+        self.all_tokens = frozenset().union(*(t for _, t in items))
+
+    def __len__(self):
+        return len(self.items)
+
+
+class IngredientNormalizer:
+    def __init__(
+        self,
+        units: Iterable[str] = UNITS,
+        ignored: Iterable[str] = BASIC_IGNORED,
+        cache_size: int = 8192,
+    ):
+        # довші одиниці першими, щоб "ст.л" не розпадалось на "ст." + "л"
+        alternation = "|".join(
+            re.escape(u) for u in sorted(units, key=len, reverse=True)
+        )
+        self._units_re = re.compile(rf"\b(?:{alternation})\b")
+        self.ignored = frozenset(ignored)
+        self.normalize = lru_cache(maxsize=cache_size)(self._normalize)
+        self.tokens = lru_cache(maxsize=cache_size)(self._tokens)
+
+    def _normalize(self, s: str) -> str:
+        s = s.lower().strip()
+        s = s.replace("’", "'")
+        s = _PARENS_RE.sub(" ", s)
+        s = _NUMBER_RE.sub(" ", s)
+        s = self._units_re.sub(" ", s)
+        s = _NON_WORD_RE.sub(" ", s)
+        s = _SPACES_RE.sub(" ", s).strip()
+        return s
+
+    def _tokens(self, s: str) -> FrozenSet[str]:
+        s = self.normalize(s)
+        return frozenset(
+            t for t in _TOKEN_SPLIT_RE.split(s) if t and t not in self.ignored
+        )
+
+    def prepare_pantry(self, pantry_items: Iterable[str]) -> PreparedPantry:
+        items = []
+        for p in pantry_items:
+            pn = self.normalize(p)
+            if pn:
+                items.append((pn, self.tokens(p)))
+        return PreparedPantry(items)
+
+
+default_normalizer = IngredientNormalizer()
+
+
 def normalize(s: str) -> str:
-    s = s.lower().strip()
-    s = s.replace("’", "'")
-    s = re.sub(r"\(.*?\)", " ", s)
-    s = re.sub(r"[\d]+([\/\.,-][\d]+)*", " ", s)
-    for u in UNITS:
-        s = re.sub(rf"\b{re.escape(u)}\b", " ", s)
-    s = re.sub(r"[^a-zа-яіїєґ'\s-]", " ", s)
-    s = re.sub(r"\s+", " ", s).strip()
-    return s
+    return default_normalizer.normalize(s)
 
 
-def tokens(s: str) -> Set[str]:
-    s = normalize(s)
-    return {t for t in re.split(r"[\s-]+", s) if t and t not in BASIC_IGNORED}
+def tokens(s: str) -> FrozenSet[str]:
+    return default_normalizer.tokens(s)
+
+
+def prepare_pantry(pantry_items: PantryLike) -> PreparedPantry:
+    if isinstance(pantry_items, PreparedPantry):
+        return pantry_items
+    return default_normalizer.prepare_pantry(pantry_items)
 
 
 def similar(a: str, b: str) -> float:
-    return SequenceMatcher(None, a, b).ratio()
+    return default_backend.ratio(a, b)
 
 
-def ingredient_matches_pantry(ingredient: str, pantry_items: List[str]) -> bool:
-    ing = normalize(ingredient)
+def entry_matches_pantry(
+    ing: str,
+    ing_tokens: AbstractSet[str],
+    pantry_items: PantryLike,
+    backend: Optional[SimilarityBackend] = None,
+) -> bool:
     if not ing:
         return False
     if ing in BASIC_IGNORED:
         return True
 
-    for p in pantry_items:
-        pn = normalize(p)
-        if not pn:
-            continue
+    backend = backend or default_backend
+    pantry = prepare_pantry(pantry_items)
+    for pn, _ in pantry.items:
         if pn in ing or ing in pn:
             return True
-        if similar(ing, pn) >= 0.86:
+        if backend.is_similar(ing, pn):
             return True
 
     # токени
-    it = tokens(ingredient)
-    if not it:
+    if not ing_tokens:
         return False
-    for p in pantry_items:
-        pt = tokens(p)
-        if it & pt:
-            return True
+    return not pantry.all_tokens.isdisjoint(ing_tokens)
+
 
-    return False
+def ingredient_matches_pantry(
+    ingredient: str,
+    pantry_items: PantryLike,
+    backend: Optional[SimilarityBackend] = None,
+) -> bool:
+    return entry_matches_pantry(
+        normalize(ingredient), tokens(ingredient), pantry_items, backend
+    )
 
 
 def recipe_missing_ingredients(
-    ingredients_text: str, pantry_items: List[str]
+    ingredients_text: str, pantry_items: PantryLike
 ) -> Tuple[List[str], int, int]:
+    pantry = prepare_pantry(pantry_items)
     ing_items = split_list(ingredients_text)
     missing = []
     matched = 0
@@ -106,7 +178,7 @@ def recipe_missing_ingredients(
             continue
 
         total += 1
-        if ingredient_matches_pantry(item, pantry_items):
+        if ingredient_matches_pantry(item, pantry):
             matched += 1
         else:
             missing.append(item.strip())
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import re
+from typing import Dict, Optional, Tuple
+
+from .portion_scaler import _TOKEN_RE, _parse_number
+
+# одиниця -> (вимір, множник до базової одиниці виміру)
+UNIT_TABLE: Dict[str, Tuple[str, float]] = {
+    "г": ("mass", 1),
+    "гр": ("mass", 1),
+    "g": ("mass", 1),
+    "кг": ("mass", 1000),
+    "kg": ("mass", 1000),
+    "мл": ("volume", 1),
+    "ml": ("volume", 1),
+    "л": ("volume", 1000),
+    "l": ("volume", 1000),
+    "cup": ("volume", 240),
+    "cups": ("volume", 240),
+    "ч.л": ("spoon", 1),
+    "чл": ("spoon", 1),
+    "tsp": ("spoon", 1),
+    "ст.л": ("spoon", 3),
+    "стл": ("spoon", 3),
+    "tbsp": ("spoon", 3),
+    "шт": ("count", 1),
+}
+
+_UNIT_RE = re.compile(
+    r"\s*(?P<unit>"
+    + "|".join(re.escape(u) for u in sorted(UNIT_TABLE, key=len, reverse=True))
+    + r")(?![a-zа-яіїєґ])\.?",
+    flags=re.IGNORECASE,
+)
+_SPACES_RE = re.compile(r"\s+")
+
+
+def parse_quantity(line: str) -> Tuple[Optional[float], Optional[str], str]:
+    """Split ``line`` into ``(quantity, unit, label)``.
+
+    ``label`` is the line without the quantity and unit; for a range the
+    upper bound is taken.
+    """
+    line = line.strip()
+    m = _TOKEN_RE.search(line)
+    # цифра всередині слова ("омега3") - не кількість
+    if m and m.start() > 0 and line[m.start() - 1].isalpha():
+        m = None
+    if not m:
+        return None, None, line
+
+    quantity = _parse_number(m.group("b") if m.group("range") else m.group("single"))
+    rest_start = m.end()
+    unit = None
+    um = _UNIT_RE.match(line, m.end())
+    if um:
+        unit = um.group("unit").lower()
+        rest_start = um.end()
+
+    label = f"{line[:m.start()]} {line[rest_start:]}"
+    label = _SPACES_RE.sub(" ", label).strip(" .,;-")
+    return quantity, unit, label or line
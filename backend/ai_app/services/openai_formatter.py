@@ -1,61 +1,150 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import json
 import os
+import threading
+import weakref
 from typing import Optional
 
+from django.conf import settings
+from django.core.cache import cache
+
+from kyking_project import metrics
+
+_lock = threading.Lock()
+_sync_client = None
+# AsyncOpenAI прив'язує пул з'єднань до циклу подій, у якому його вперше
+# використали; async_to_sync щоразу запускає новий цикл, тож клієнт свій
+# для кожного циклу і зникає разом із ним
+_async_clients = weakref.WeakKeyDictionary()
+
 
 def has_openai_key() -> bool:
     return bool(os.getenv("OPENAI_API_KEY"))
 
 
+def _client_options() -> dict:
+    return {
+        "timeout": float(os.getenv("OPENAI_TIMEOUT", "20")),
+        "max_retries": int(os.getenv("OPENAI_MAX_RETRIES", "1")),
+    }
+
+
 def _client():
-    from openai import OpenAI
+    # один клієнт на процес: httpx-пул з'єднань переживає запити
+    global _sync_client
+    if _sync_client is None:
+        with _lock:
+            if _sync_client is None:
+                from openai import OpenAI
+
+                _sync_client = OpenAI(**_client_options())
+    return _sync_client
+
+
+def _aclient():
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        from openai import AsyncOpenAI
 
-    return OpenAI()
+        client = _async_clients[loop] = AsyncOpenAI(**_client_options())
+    return client
 
 
 def model_name() -> str:
     return os.getenv("OPENAI_MODEL", "gpt-5-mini")
 
 
-def pretty_bullets_uk(title: str, lines: list[str]) -> Optional[str]:
+def _bullets_input(title: str, lines: list[str]) -> list[dict]:
+    return [
+        {
+            "role": "system",
+            "content": "Поверни ТІЛЬКИ маркерований список українською. Без пояснень.",
+        },
+        {
+            "role": "user",
+            "content": f"{title}\n" + "\n".join(f"- {x}" for x in lines),
+        },
+    ]
+
+
+def _plan_input(plan: dict) -> list[dict]:
+    return [
+        {
+            "role": "system",
+            "content": "Сформуй короткий гарний план раціону українською + список покупок. Без води.",
+        },
+        {"role": "user", "content": f"Ось дані (JSON):\n{plan}"},
+    ]
+
+
+def _cache_key(model: str, messages: list[dict]) -> str:
+    raw = json.dumps([model, messages], ensure_ascii=False, sort_keys=True)
+    return "ai:openai:" + hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _cache_ttl() -> int:
+    return getattr(settings, "AI_FORMATTER_CACHE_TTL", 86400)
+
+
+def _output_text(resp) -> Optional[str]:
+    return (getattr(resp, "output_text", "") or "").strip() or None
+
+
+def _complete(messages: list[dict]) -> Optional[str]:
     if not has_openai_key():
         return None
+    model = model_name()
+    key = _cache_key(model, messages)
+    cached = cache.get(key)
+    if cached is not None:
+        metrics.incr("openai_cache_hit")
+        return cached
+    metrics.incr("openai_cache_miss")
     try:
-        client = _client()
-        resp = client.responses.create(
-            model=model_name(),
-            input=[
-                {
-                    "role": "system",
-                    "content": "Поверни ТІЛЬКИ маркерований список українською. Без пояснень.",
-                },
-                {
-                    "role": "user",
-                    "content": f"{title}\n" + "\n".join(f"- {x}" for x in lines),
-                },
-            ],
-        )
-        return (getattr(resp, "output_text", "") or "").strip() or None
+        resp = _client().responses.create(model=model, input=messages)
     except Exception:
         return None
+    text = _output_text(resp)
+    if text:
+        cache.set(key, text, _cache_ttl())
+    return text
 
 
-def weekly_plan_text_uk(plan: dict) -> Optional[str]:
+async def _acomplete(messages: list[dict]) -> Optional[str]:
     if not has_openai_key():
         return None
+    model = model_name()
+    key = _cache_key(model, messages)
+    cached = await cache.aget(key)
+    if cached is not None:
+        await metrics.aincr("openai_cache_hit")
+        return cached
+    await metrics.aincr("openai_cache_miss")
     try:
-        client = _client()
-        resp = client.responses.create(
-            model=model_name(),
-            input=[
-                {
-                    "role": "system",
-                    "content": "Сформуй короткий гарний план раціону українською + список покупок. Без води.",
-                },
-                {"role": "user", "content": f"Ось дані (JSON):\n{plan}"},
-            ],
-        )
-        return (getattr(resp, "output_text", "") or "").strip() or None
+        resp = await _aclient().responses.create(model=model, input=messages)
     except Exception:
         return None
+    text = _output_text(resp)
+    if text:
+        await cache.aset(key, text, _cache_ttl())
+    return text
+
+
+def pretty_bullets_uk(title: str, lines: list[str]) -> Optional[str]:
+    return _complete(_bullets_input(title, lines))
+
+
+def weekly_plan_text_uk(plan: dict) -> Optional[str]:
+    return _complete(_plan_input(plan))
+
+
+async def apretty_bullets_uk(title: str, lines: list[str]) -> Optional[str]:
+    return await _acomplete(_bullets_input(title, lines))
+
+
+async def aweekly_plan_text_uk(plan: dict) -> Optional[str]:
+    return await _acomplete(_plan_input(plan))
@@ -3,7 +3,8 @@ from __future__ import annotations
 import math
 import re
 from fractions import Fraction
-from typing import Iterable, List, Optional, Tuple
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple, Union
 
 _UNICODE_FRACTIONS = {
     "½": "1/2",
@@ -33,32 +34,37 @@ _TOKEN_RE = re.compile(
     rf"(?P<range>(?P<a>{_ONE})\s*{_RANGE_SEP}\s*(?P<b>{_ONE}))|(?P<single>{_ONE})",
     flags=re.IGNORECASE,
 )
+_MIXED_RE = re.compile(_MIXED)
+_FRAC_RE = re.compile(_FRAC)
+_SPLIT_RE = re.compile(r"[\n,]+")
+# "½" -> "1/2" одним str.translate замість 15 викликів replace
+_FRACTIONS_TABLE = str.maketrans(_UNICODE_FRACTIONS)
 
 
 def split_ingredients(text: str) -> List[str]:
-    raw = re.split(r"[\n,]+", text)
+    raw = _SPLIT_RE.split(text)
     return [x.strip() for x in raw if x.strip()]
 
 
 def _normalize_token(token: str) -> str:
-    token = token.strip()
-    for u, repl in _UNICODE_FRACTIONS.items():
-        token = token.replace(u, repl)
-    token = token.replace(",", ".")
-    token = re.sub(r"\s+", " ", token)
-    return token
+    token = token.strip().translate(_FRACTIONS_TABLE).replace(",", ".")
+    return " ".join(token.split())
 
 
+@lru_cache(maxsize=4096)
 def _parse_number(token: str) -> float:
     token = _normalize_token(token)
-    if re.fullmatch(_MIXED, token):
+    if "/" not in token:
+        return float(token)
+    if _MIXED_RE.fullmatch(token):
         whole_str, frac_str = token.split(" ", 1)
         return float(whole_str) + float(Fraction(frac_str))
-    if re.fullmatch(_FRAC, token):
+    if _FRAC_RE.fullmatch(token):
         return float(Fraction(token))
     return float(token)
 
 
+@lru_cache(maxsize=4096)
 def _format_number(value: float) -> str:
     if value <= 0:
         return "0"
@@ -95,31 +101,66 @@ def _format_number(value: float) -> str:
     return f"{value:.2f}".rstrip("0").rstrip(".")
 
 
-def _replace(text: str, start: int, end: int, repl: str) -> str:
-    return text[:start] + repl + text[end:]
+def parse_template(line: str) -> List[Union[str, List[float]]]:
+    """Split ``line`` into text pieces and numbers (``[x]`` or ``[a, b]``).
+
+    The result is JSON-serializable, so it can be stored and scaled later by
+    ``render_template`` without running any regex.
+    """
+    if "°" in line or "º" in line:
+        return [line]
+
+    parts: List[Union[str, List[float]]] = []
+    pos = 0
+    for m in _TOKEN_RE.finditer(line):
+        parts.append(line[pos : m.start()])
+        if m.group("range"):
+            parts.append([_parse_number(m.group("a")), _parse_number(m.group("b"))])
+        else:
+            parts.append([_parse_number(m.group("single"))])
+        pos = m.end()
+    parts.append(line[pos:])
+    return parts
+
+
+def render_template(parts: Iterable[Union[str, List[float]]], factor: float) -> str:
+    return "".join(
+        part
+        if isinstance(part, str)
+        else "-".join(_format_number(x * factor) for x in part)
+        for part in parts
+    )
 
 
 def scale_ingredient_line(line: str, factor: float) -> str:
     if "°" in line or "º" in line:
         return line
 
-    out = line
-    matches = list(_TOKEN_RE.finditer(out))
-    for m in reversed(matches):
+    # один прохід по збігах, рядок збирається одним join
+    out = []
+    pos = 0
+    for m in _TOKEN_RE.finditer(line):
+        out.append(line[pos : m.start()])
         if m.group("range"):
             a = _parse_number(m.group("a"))
             b = _parse_number(m.group("b"))
-            out = _replace(
-                out,
-                m.start(),
-                m.end(),
-                f"{_format_number(a*factor)}-{_format_number(b*factor)}",
-            )
-        elif m.group("single"):
-            x = _parse_number(m.group("single"))
-            out = _replace(out, m.start(), m.end(), _format_number(x * factor))
-    return out
+            out.append(f"{_format_number(a * factor)}-{_format_number(b * factor)}")
+        else:
+            out.append(_format_number(_parse_number(m.group("single")) * factor))
+        pos = m.end()
+    if not out:
+        return line
+    out.append(line[pos:])
+    return "".join(out)
 
 
 def scale_ingredients(items: Iterable[str], factor: float) -> List[str]:
     return [scale_ingredient_line(x, factor) for x in items]
+
+
+def scale_table(
+    items: Iterable[str], factors: Iterable[float]
+) -> List[Tuple[float, List[str]]]:
+    """Scale the same lines for several factors, parsing every line once."""
+    templates = [parse_template(x) for x in items]
+    return [(f, [render_template(t, f) for t in templates]) for f in factors]
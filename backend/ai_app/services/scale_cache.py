@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+from kyking_project import counters, metrics
+
+
+# спільна частина версії для всіх рецептів: змінюється після
+# rebuild_ingredient_index, коли могли змінитися правила розбору
+SCALE_EPOCH_KEY = "ai:scale_epoch"
+
+
+def _version_key(recipe_id: int) -> str:
+    return f"ai:recipe_version:{recipe_id}"
+
+
+def recipe_version(recipe_id: int) -> str:
+    keys = [SCALE_EPOCH_KEY, _version_key(recipe_id)]
+    values = counters.versions(keys)
+    return f"{values[keys[0]]}.{values[keys[1]]}"
+
+
+def bump_recipe_version(recipe_id: int) -> None:
+    counters.bump(_version_key(recipe_id))
+
+
+def bump_scale_epoch() -> None:
+    counters.bump(SCALE_EPOCH_KEY)
+
+
+def _factor_str(factor: float) -> str:
+    return f"{factor:g}"
+
+
+def cache_key(recipe_id: int, factor: float, version: str) -> str:
+    return f"ai:scale:{recipe_id}:{_factor_str(factor)}:v{version}"
+
+
+def etag(recipe_id: int, factor: float, version: str) -> str:
+    return f'"scale-{recipe_id}-{_factor_str(factor)}-{version}"'
+
+
+def get_cached(key: str) -> Optional[dict]:
+    payload = cache.get(key)
+    metrics.incr("scale_cache_hit" if payload is not None else "scale_cache_miss")
+    return payload
+
+
+def set_cached(key: str, payload: dict) -> None:
+    cache.set(key, payload, getattr(settings, "AI_SCALE_CACHE_TTL", 86400))
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Tuple
+
+from .ingredient_parser import UNIT_TABLE
+from .portion_scaler import _format_number
+
+# більша одиниця, в яку переводимо суму, якщо вона досить велика
+_PROMOTE = {
+    "г": "кг",
+    "гр": "кг",
+    "g": "kg",
+    "мл": "л",
+    "ml": "l",
+    "ч.л": "ст.л",
+    "чл": "стл",
+    "tsp": "tbsp",
+}
+
+
+def _display(total_base: float, unit: str) -> Tuple[float, str]:
+    dimension, factor = UNIT_TABLE[unit]
+    bigger = _PROMOTE.get(unit)
+    if bigger:
+        big_factor = UNIT_TABLE[bigger][1]
+        # ложки переводимо лише без дробового залишку: "4 ч.л", а не "1⅓ ст.л"
+        if total_base >= big_factor and (
+            dimension != "spoon" or total_base % big_factor == 0
+        ):
+            return total_base / big_factor, bigger
+    return total_base / factor, unit
+
+
+def aggregate(entries: Iterable[Tuple[dict, float]]) -> List[dict]:
+    """Sum ``(entry, factor)`` pairs per ingredient in one pass.
+
+    ``entry`` is an ingredient as stored by ``build_entries`` (name, label,
+    quantity, unit), so no text is parsed here. Quantities in compatible
+    units (г/кг, мл/л, ч.л/ст.л, ...) are converted to a base unit and added
+    up; lines without a quantity are deduplicated.
+    """
+    groups: Dict[tuple, dict] = {}
+    for entry, factor in entries:
+        name = entry["name"]
+        # записи до міграції ai_app 0004 мають лише raw, без кількості
+        label = entry.get("label") or entry["raw"]
+        if entry.get("quantity") is None:
+            key = (name, None)
+            groups.setdefault(key, {"label": label, "unit": None, "base": None})
+            continue
+
+        # "2 яйця" і "1 шт яйця" - одна й та сама лічильна позиція
+        dimension, unit_factor = UNIT_TABLE[entry["unit"] or "шт"]
+        key = (name, dimension)
+        group = groups.setdefault(
+            key, {"label": label, "unit": entry["unit"], "base": 0.0}
+        )
+        group["base"] += entry["quantity"] * factor * unit_factor
+
+    result = []
+    for (name, _), group in groups.items():
+        if group["base"] is None:
+            result.append(
+                {"name": name, "quantity": None, "unit": None, "text": group["label"]}
+            )
+            continue
+        if group["unit"]:
+            value, unit = _display(group["base"], group["unit"])
+            text = f"{_format_number(value)} {unit} {group['label']}"
+        else:
+            value, unit = group["base"], None
+            text = f"{_format_number(value)} {group['label']}"
+        result.append(
+            {
+                "name": name,
+                "quantity": round(value, 3),
+                "unit": unit,
+                "text": text,
+            }
+        )
+    result.sort(key=lambda x: x["name"])
+    return result
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import math
+from collections import Counter, defaultdict
+from difflib import SequenceMatcher
+from functools import lru_cache
+from typing import Dict, Iterable, List, Protocol
+
+SIMILARITY_THRESHOLD = 0.86
+
+
+class SimilarityBackend(Protocol):
+    threshold: float
+
+    def ratio(self, a: str, b: str) -> float: ...
+
+    def is_similar(self, a: str, b: str) -> bool: ...
+
+
+@lru_cache(maxsize=8192)
+def _char_counts(s: str) -> Counter:
+    return Counter(s)
+
+
+def _length_bound(la: int, lb: int) -> float:
+    # SequenceMatcher.ratio() = 2*M / (la + lb), де M <= min(la, lb)
+    total = la + lb
+    return 2.0 * min(la, lb) / total if total else 1.0
+
+
+class SequenceMatcherBackend:
+    """difflib ratio with cheap upper-bound prefilters.
+
+    Both bounds are never below the exact ratio, so rejecting on them gives
+    the same answers as calling SequenceMatcher for every pair.
+    """
+
+    def __init__(self, threshold: float = SIMILARITY_THRESHOLD):
+        self.threshold = threshold
+
+    def ratio(self, a: str, b: str) -> float:
+        return SequenceMatcher(None, a, b).ratio()
+
+    def is_similar(self, a: str, b: str) -> bool:
+        la, lb = len(a), len(b)
+        if _length_bound(la, lb) < self.threshold:
+            return False
+
+        common = sum((_char_counts(a) & _char_counts(b)).values())
+        if 2.0 * common / (la + lb) < self.threshold:
+            return False
+
+        return self.ratio(a, b) >= self.threshold
+
+
+default_backend = SequenceMatcherBackend()
+
+
+def _trigrams(s: str) -> Counter:
+    padded = f"  {s}  "
+    return Counter(padded[i : i + 3] for i in range(len(padded) - 2))
+
+
+class TrigramIndex:
+    """Near-match lookup over a fixed vocabulary.
+
+    Candidates come from shared padded trigrams. The minimum shared count is
+    derived from the q-gram lemma for the largest edit distance the threshold
+    allows, so no true match is filtered out; survivors are confirmed with
+    the backend.
+    """
+
+    def __init__(
+        self, vocabulary: Iterable[str], backend: SimilarityBackend = default_backend
+    ):
+        self.backend = backend
+        self.terms: List[str] = list(dict.fromkeys(t for t in vocabulary if t))
+        self._postings: Dict[str, List[tuple]] = defaultdict(list)
+        self._by_length: Dict[int, List[int]] = defaultdict(list)
+        for term_id, term in enumerate(self.terms):
+            self._by_length[len(term)].append(term_id)
+            for gram, count in _trigrams(term).items():
+                self._postings[gram].append((term_id, count))
+
+    def __len__(self):
+        return len(self.terms)
+
+    def _required_shared(self, la: int, lb: int) -> int:
+        max_edits = math.floor((1 - self.backend.threshold) * (la + lb))
+        return max(la, lb) + 2 - 3 * max_edits
+
+    def near(self, query: str) -> List[str]:
+        if not query:
+            return []
+        t = self.backend.threshold
+        lq = len(query)
+        lo = math.ceil(lq * t / (2 - t))
+        hi = math.floor(lq * (2 - t) / t)
+
+        shared: Dict[int, int] = defaultdict(int)
+        for gram, q_count in _trigrams(query).items():
+            for term_id, count in self._postings.get(gram, ()):
+                shared[term_id] += min(q_count, count)
+
+        result = []
+        for length in range(lo, hi + 1):
+            need = self._required_shared(lq, length)
+            for term_id in self._by_length.get(length, ()):
+                if shared.get(term_id, 0) < need:
+                    continue
+                term = self.terms[term_id]
+                if self.backend.is_similar(query, term):
+                    result.append(term)
+        return result
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import List, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+from kyking_project import metrics
+
+from .catalog import catalog_version
+from .ingredient_matcher import PantryLike, prepare_pantry
+
+
+def canonical_pantry(pantry_items: PantryLike) -> List[str]:
+    return sorted({pn for pn, _ in prepare_pantry(pantry_items).items})
+
+
+def cache_key(pantry_items: PantryLike, limit: int, verified_only: bool) -> str:
+    raw = json.dumps(
+        [canonical_pantry(pantry_items), limit, verified_only], ensure_ascii=False
+    )
+    digest = hashlib.sha1(raw.encode("utf-8")).hexdigest()
+    return f"ai:suggest:v{catalog_version()}:{digest}"
+
+
+def get_cached(key: str) -> Optional[list]:
+    results = cache.get(key)
+    metrics.incr("suggest_cache_hit" if results is not None else "suggest_cache_miss")
+    return results
+
+
+def set_cached(key: str, results: list) -> None:
+    cache.set(key, results, getattr(settings, "AI_SUGGEST_CACHE_TTL", 300))
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import heapq
+from dataclasses import dataclass
+from typing import AbstractSet, List, Optional, Set
+
+from .batch_scoring import CatalogMatrix
+from .ingredient_matcher import PantryLike
+
+# скільки кандидатів розглядати на один слот плану
+CANDIDATES_PER_SLOT = 12
+MIN_CANDIDATES = 100
+# штраф за кожен новий рядок у списку покупок
+SHOPPING_PENALTY = 0.1
+MAX_HARD_PER_DAY = 1
+
+
+@dataclass
+class Candidate:
+    row: int
+    coverage: float
+    missing_ids: Set[int]
+    category_id: Optional[int]
+    difficulty: str
+    uses: int = 0
+    last_slot: int = -1
+
+
+@dataclass
+class PlannedMeal:
+    row: int
+    coverage: float
+    missing_items: List[dict]
+
+    @property
+    def missing(self) -> List[str]:
+        return [item["raw"] for item in self.missing_items]
+
+
+def _candidates(
+    matrix: CatalogMatrix,
+    matched_ids: Set[int],
+    limit: int,
+    verified_only: bool,
+    exclude: AbstractSet[int],
+) -> List[Candidate]:
+    counts = matrix.matched_counts(matched_ids)
+
+    def scored():
+        for row in range(len(matrix)):
+            if verified_only and not matrix.verified[row]:
+                continue
+            if row in exclude:
+                continue
+            total = matrix.totals[row]
+            coverage = counts.get(row, 0) / total if total else 0.0
+            yield coverage, -row
+
+    best = heapq.nlargest(limit, scored())
+    result = []
+    for coverage, neg_row in best:
+        row = -neg_row
+        result.append(
+            Candidate(
+                row=row,
+                coverage=coverage,
+                missing_ids={
+                    name_id
+                    for _, name_id in matrix.entries[row]
+                    if name_id not in matched_ids
+                },
+                category_id=matrix.categories[row],
+                difficulty=matrix.difficulties[row],
+            )
+        )
+    return result
+
+
+def _diverse(c: Candidate, day: List[Candidate]) -> bool:
+    if any(m.category_id == c.category_id for m in day):
+        return False
+    if c.difficulty == "hard":
+        return sum(m.difficulty == "hard" for m in day) < MAX_HARD_PER_DAY
+    return True
+
+
+def plan_meals(
+    matrix: CatalogMatrix,
+    pantry_items: PantryLike,
+    days: int,
+    meals_per_day: int,
+    verified_only: bool = True,
+    exclude: AbstractSet[int] = frozenset(),
+) -> List[List[PlannedMeal]]:
+    """Greedy plan: each slot takes the candidate with the best pantry coverage
+    minus a penalty for ingredients not already on the shopping list.
+
+    Every recipe is scored once; only the top ``CANDIDATES_PER_SLOT`` per slot
+    are considered, so the cost does not grow with the catalog beyond the
+    single scoring pass. Unused recipes are preferred over repeats; after that,
+    meals of one day should differ in category and have at most
+    ``MAX_HARD_PER_DAY`` hard recipes. Rows in ``exclude`` are never chosen.
+    """
+    matched_ids = matrix.encode_pantry(pantry_items)
+    limit = max(MIN_CANDIDATES, days * meals_per_day * CANDIDATES_PER_SLOT)
+    candidates = _candidates(matrix, matched_ids, limit, verified_only, exclude)
+    if not candidates and verified_only:
+        candidates = _candidates(matrix, matched_ids, limit, False, exclude)
+    if not candidates:
+        return []
+
+    shopping: Set[int] = set()
+    plan: List[List[PlannedMeal]] = []
+    slot = 0
+    for _ in range(days):
+        day: List[Candidate] = []
+        meals = []
+        for _ in range(meals_per_day):
+            chosen = max(
+                candidates,
+                key=lambda c: (
+                    -c.uses,
+                    _diverse(c, day),
+                    c.coverage - SHOPPING_PENALTY * len(c.missing_ids - shopping),
+                    -c.last_slot,
+                    -c.row,
+                ),
+            )
+            chosen.uses += 1
+            chosen.last_slot = slot
+            shopping |= chosen.missing_ids
+            day.append(chosen)
+            meals.append(
+                PlannedMeal(
+                    chosen.row,
+                    chosen.coverage,
+                    matrix.missing_items(chosen.row, matched_ids),
+                )
+            )
+            slot += 1
+        plan.append(meals)
+    return plan
@@ -0,0 +1,31 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from recipes_app.models import Recipe
+from recipes_app.signals import recipes_imported
+
+from .services.catalog import bump_catalog_version
+from .services.ingredient_index import index_recipe, index_recipes
+from .services.scale_cache import bump_recipe_version
+
+
+@receiver(post_save, sender=Recipe)
+def reindex_recipe_ingredients(
+    sender, instance, created=False, update_fields=None, **kwargs
+):
+    if update_fields is None or "ingredients" in update_fields:
+        index_recipe(instance, created=created)
+        bump_recipe_version(instance.pk)
+    bump_catalog_version()
+
+
+@receiver(post_delete, sender=Recipe)
+def drop_recipe_from_catalog(sender, instance, **kwargs):
+    bump_recipe_version(instance.pk)
+    bump_catalog_version()
+
+
+@receiver(recipes_imported, sender=Recipe)
+def index_imported_recipes(sender, recipes, **kwargs):
+    index_recipes(recipes, batch_size=len(recipes) or 1)
+    bump_catalog_version()
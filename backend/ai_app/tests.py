@@ -1,3 +1,493 @@
-from django.test import TestCase
+import asyncio
+import os
+from difflib import SequenceMatcher
+from importlib import import_module
+from itertools import product
+from types import SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+import openai
+from asgiref.sync import async_to_sync
+from django.apps import apps as django_apps
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import resolve, reverse
+from rest_framework.test import APIClient
+
+from kyking_project import metrics
+from recipes_app.models import Category, Recipe
+from users_app.models import UserProfile
+
+from . import views
+from .services.batch_scoring import get_catalog_matrix
+from .models import RecipeIngredientIndex
+from .services import ai_jobs, openai_formatter
+from .services.catalog import CATALOG_VERSION_KEY
+from .services.ingredient_index import build_entries, build_lines
+from .services.ingredient_matcher import normalize
+from .services.similarity import (
+    SIMILARITY_THRESHOLD,
+    SequenceMatcherBackend,
+    TrigramIndex,
+)
+
+# Golden corpus: ingredient names with typos, plural/case forms and
+# near-threshold variants, in Ukrainian and English.
+# fmt: off
+SIMILARITY_CORPUS_UK = [
+    "картопля", "картопла", "картоплі", "картопляне пюре", "капуста",
+    "капуста квашена", "капусти", "морква", "моркву", "морквa",
+    "цибуля", "цибуля зелена", "цибулі", "часник", "часнику",
+    "помідор", "помідори", "помидор", "буряк", "буряки", "буряк червоний",
+    "молоко", "молока", "молоко згущене", "вершкове масло", "масло вершкове",
+    "олія", "олія соняшникова", "борошно", "борошна", "борошно пшеничне",
+    "яйця", "яйце", "цукор", "цукру", "сир", "сир твердий", "сметана",
+    "сметани", "гриби", "печериці", "курка", "куряче філе", "філе куряче",
+]
+SIMILARITY_CORPUS_EN = [
+    "potato", "potatoes", "potatos", "tomato", "tomatoes", "tomatoe",
+    "onion", "onions", "green onion", "garlic", "garlik", "carrot", "carrots",
+    "cabbage", "cabage", "milk", "whole milk", "butter", "buter", "flour",
+    "wheat flour", "sugar", "brown sugar", "egg", "eggs", "chicken breast",
+    "chicken breasts", "mushroom", "mushrooms", "sour cream", "cream",
+]
+# fmt: on
+
+
+class AIUrlsTests(SimpleTestCase):
+    def test_routes_resolve(self):
+        routes = [
+            ("ai-scale", {}, "/api/ai/scale/", views.ScaleIngredientsView),
+            ("ai-scale-batch", {}, "/api/ai/scale/batch/", views.ScaleBatchView),
+            ("ai-suggest", {}, "/api/ai/suggest/", views.SuggestRecipesView),
+            ("ai-weekly-plan", {}, "/api/ai/weekly-plan/", views.WeeklyPlanView),
+            ("ai-shopping-list", {}, "/api/ai/shopping-list/", views.ShoppingListView),
+            ("ai-job", {"job_id": "abc"}, "/api/ai/jobs/abc/", views.AIJobView),
+            ("ai-metrics", {}, "/api/ai/metrics/", views.MetricsView),
+        ]
+        for name, kwargs, path, view in routes:
+            with self.subTest(name=name):
+                self.assertEqual(reverse(name, kwargs=kwargs), path)
+                self.assertIs(resolve(path).func.view_class, view)
+
+
+class CatalogTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user("cook", "cook@example.com", "pw")
+        UserProfile.objects.create(user=self.user, role=UserProfile.Role.CHEF)
+        self.category = Category.objects.create(name="Супи", slug="soups")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def recipe(self, title, ingredients, **kwargs):
+        return Recipe.objects.create(
+            author=self.user,
+            category=self.category,
+            title=title,
+            ingredients=ingredients,
+            steps="Зварити",
+            **kwargs,
+        )
+
+    def suggest(self, products, limit=5):
+        return self.client.post(
+            reverse("ai-suggest"),
+            {"products": products, "limit": limit, "verified_only": False},
+            format="json",
+        )
+
+
+class SuggestTests(CatalogTestCase):
+    def test_limit_is_filled_with_unmatched_recipes(self):
+        borsch = self.recipe("Борщ", "буряк, капуста, картопля")
+        omelette = self.recipe("Омлет", "яйця, молоко")
+
+        response = self.suggest(["буряк"], limit=5)
+
+        self.assertEqual(response.status_code, 200)
+        results = response.data["results"]
+        self.assertEqual([x["recipe_id"] for x in results], [borsch.id, omelette.id])
+        self.assertEqual(results[1]["score"], 0.0)
+        self.assertEqual(results[1]["missing"], ["яйця", "молоко"])
+
+    def test_stale_matrix_skips_deleted_recipes(self):
+        kept = self.recipe("Борщ", "буряк, капуста")
+        deleted = self.recipe("Вінегрет", "буряк, горошок")
+        stale = get_catalog_matrix()
+        deleted.delete()
+
+        with mock.patch.object(views, "get_catalog_matrix", return_value=stale):
+            response = self.suggest(["буряк"])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([x["recipe_id"] for x in response.data["results"]], [kept.id])
+
+    def test_stale_matrix_weekly_plan_replaces_deleted_recipes(self):
+        kept = [self.recipe("Борщ", "буряк, капуста"), self.recipe("Омлет", "яйця")]
+        deleted = self.recipe("Вінегрет", "буряк, горошок")
+        stale = get_catalog_matrix()
+        deleted.delete()
+
+        with mock.patch.object(views, "get_catalog_matrix", return_value=stale):
+            response = self.client.post(
+                reverse("ai-weekly-plan"),
+                {
+                    "pantry": ["буряк", "горошок"],
+                    "days": 1,
+                    "meals_per_day": 2,
+                    "verified_only": False,
+                },
+                format="json",
+            )
+
+        self.assertEqual(response.status_code, 200)
+        meals = response.data["plan"][0]["meals"]
+        self.assertEqual(
+            sorted(m["recipe_id"] for m in meals), sorted(r.id for r in kept)
+        )
+        self.assertTrue(all(m["title"] for m in meals))
+
+    def test_evicted_version_does_not_revive_old_matrix(self):
+        kept = self.recipe("Борщ", "буряк, капуста")
+        deleted = self.recipe("Вінегрет", "буряк, горошок")
+        self.recipe("Омлет", "яйця, молоко")
+
+        # матриця будується на версії, створеній уже після витіснення ключа
+        cache.delete(CATALOG_VERSION_KEY)
+        self.suggest(["буряк"])
+        deleted.delete()
+        cache.delete(CATALOG_VERSION_KEY)
+
+        response = self.suggest(["буряк"])
+
+        self.assertEqual(response.status_code, 200)
+        ids = [x["recipe_id"] for x in response.data["results"]]
+        self.assertNotIn(deleted.id, ids)
+        self.assertEqual(ids[0], kept.id)
+
+
+class AIJobTests(CatalogTestCase):
+    def pending_job(self, user=None):
+        job_id = "job1"
+        job = {
+            "id": job_id,
+            "user_id": (user or self.user).id,
+            "status": ai_jobs.PENDING,
+            "pretty": None,
+        }
+        cache.set(ai_jobs._key(job_id), job)
+        return job_id
+
+    @override_settings(AI_JOB_MAX_WAIT=0.3)
+    def test_long_poll_is_capped(self):
+        job_id = self.pending_job()
+
+        slept = []
+
+        with mock.patch.object(
+            ai_jobs.time, "monotonic", side_effect=lambda: sum(slept)
+        ), mock.patch.object(ai_jobs.time, "sleep", side_effect=slept.append):
+            response = self.client.get(reverse("ai-job", args=[job_id]), {"wait": 25})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["status"], ai_jobs.PENDING)
+        self.assertEqual(slept, [0.25, 0.25])
+
+    def test_finished_job_is_returned_at_once(self):
+        job_id = self.pending_job()
+        cache.set(
+            ai_jobs._key(job_id),
+            {"id": job_id, "user_id": self.user.id, "status": "done", "pretty": "ok"},
+        )
+
+        with mock.patch.object(ai_jobs.time, "sleep") as sleep:
+            response = self.client.get(reverse("ai-job", args=[job_id]), {"wait": 2})
+
+        self.assertEqual(response.data, {"id": job_id, "status": "done", "pretty": "ok"})
+        sleep.assert_not_called()
+
+    def test_other_users_job_is_hidden(self):
+        other = User.objects.create_user("other", "other@example.com", "pw")
+        job_id = self.pending_job(other)
+
+        response = self.client.get(reverse("ai-job", args=[job_id]))
+
+        self.assertEqual(response.status_code, 404)
+
+
+class LegacyIndexTests(CatalogTestCase):
+    """Index rows written before ai_app 0002 (no ``lines``, no quantities)."""
+
+    def setUp(self):
+        super().setUp()
+        self.borsch = self.recipe("Борщ", "200 г буряка, 2 картоплини")
+        RecipeIngredientIndex.objects.filter(recipe=self.borsch).update(
+            lines=[],
+            items=[
+                {"raw": "200 г буряка", "name": "буряка", "tokens": ["буряк"]},
+                {"raw": "2 картоплини", "name": "картоплини", "tokens": ["картоплин"]},
+            ],
+        )
+
+    def test_scaling_parses_ingredients_text(self):
+        response = self.client.get(
+            reverse("ai-scale"), {"recipe_id": self.borsch.id, "factor": 2}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["scaled_items"], ["400 г буряка", "4 картоплини"])
+
+    def test_shopping_list_uses_raw_lines(self):
+        response = self.client.post(
+            reverse("ai-shopping-list"),
+            {"items": [{"recipe_id": self.borsch.id}]},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            sorted(response.data["shopping_list"]), ["2 картоплини", "200 г буряка"]
+        )
+
+
+class MissingIndexTests(CatalogTestCase):
+    """Recipes without an index row (created before ai_app or bypassing signals)."""
+
+    def setUp(self):
+        super().setUp()
+        self.borsch = self.recipe("Борщ", "200 г буряка, 2 картоплини")
+        RecipeIngredientIndex.objects.filter(recipe=self.borsch).delete()
+
+    def test_suggest_parses_ingredients_text(self):
+        response = self.suggest(["буряк"])
+
+        self.assertEqual(response.status_code, 200)
+        results = response.data["results"]
+        self.assertEqual([x["recipe_id"] for x in results], [self.borsch.id])
+        self.assertEqual(results[0]["missing"], ["2 картоплини"])
+
+    def test_weekly_plan_uses_unindexed_recipe(self):
+        response = self.client.post(
+            reverse("ai-weekly-plan"),
+            {
+                "pantry": ["буряк"],
+                "days": 1,
+                "meals_per_day": 1,
+                "verified_only": False,
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["used_recipe_ids"], [self.borsch.id])
+
+    def test_shopping_list_parses_ingredients_text(self):
+        response = self.client.post(
+            reverse("ai-shopping-list"),
+            {"items": [{"recipe_id": self.borsch.id, "factor": 2}]},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["not_found_recipe_ids"], [])
+        self.assertEqual(
+            sorted(response.data["shopping_list"]), ["4 картоплини", "400 г буряка"]
+        )
+
+    def test_migration_backfills_missing_and_legacy_rows(self):
+        legacy = self.recipe("Омлет", "3 яйця, 250 мл молока")
+        RecipeIngredientIndex.objects.filter(recipe=legacy).update(
+            lines=[], items=[{"raw": "3 яйця", "name": "яйця", "tokens": ["яйця"]}]
+        )
+        indexed = self.recipe("Салат", "2 помідори, 1 огірок")
+        expected = {
+            r.pk: (build_entries(r.ingredients), build_lines(r.ingredients))
+            for r in (self.borsch, legacy, indexed)
+        }
+
+        backfill = import_module(
+            "ai_app.migrations.0004_backfill_ingredient_index"
+        ).backfill
+        backfill(django_apps, None)
+
+        stored = {
+            pk: (items, lines)
+            for pk, items, lines in RecipeIngredientIndex.objects.values_list(
+                "recipe_id", "items", "lines"
+            )
+        }
+        self.assertEqual(stored, expected)
+
+
+class SimilarityGoldenTests(SimpleTestCase):
+    """Prefilters and the trigram index must agree exactly with difflib."""
+
+    backend = SequenceMatcherBackend()
+
+    def expected(self, a, b):
+        return SequenceMatcher(None, a, b).ratio() >= SIMILARITY_THRESHOLD
+
+    def assert_pairs(self, corpus):
+        terms = [normalize(x) for x in corpus]
+        for a, b in product(terms, repeat=2):
+            with self.subTest(a=a, b=b):
+                self.assertEqual(self.backend.is_similar(a, b), self.expected(a, b))
+
+    def assert_index(self, corpus, queries):
+        terms = [normalize(x) for x in corpus]
+        index = TrigramIndex(terms)
+        for query in [normalize(q) for q in queries] + terms:
+            with self.subTest(query=query):
+                self.assertEqual(
+                    sorted(index.near(query)),
+                    sorted(t for t in set(terms) if self.expected(query, t)),
+                )
+
+    def test_ukrainian_pairs(self):
+        self.assert_pairs(SIMILARITY_CORPUS_UK)
+
+    def test_english_pairs(self):
+        self.assert_pairs(SIMILARITY_CORPUS_EN)
+
+    def test_mixed_pairs(self):
+        self.assert_pairs(SIMILARITY_CORPUS_UK[:15] + SIMILARITY_CORPUS_EN[:15])
+
+    def test_corpus_has_matches_on_both_sides_of_threshold(self):
+        terms = [normalize(x) for x in SIMILARITY_CORPUS_UK + SIMILARITY_CORPUS_EN]
+        ratios = [
+            SequenceMatcher(None, a, b).ratio() for a, b in product(terms, repeat=2)
+        ]
+        self.assertTrue(any(0.8 <= r < SIMILARITY_THRESHOLD for r in ratios))
+        self.assertTrue(any(SIMILARITY_THRESHOLD <= r < 1 for r in ratios))
+
+    def test_trigram_index_ukrainian(self):
+        self.assert_index(
+            SIMILARITY_CORPUS_UK,
+            ["картопли", "капуста свіжа", "морков", "цибуль", "молоко коров'яче"],
+        )
+
+    def test_trigram_index_english(self):
+        self.assert_index(
+            SIMILARITY_CORPUS_EN,
+            ["potatto", "tomatos", "onoin", "garlick", "chiken breast", "mushrom"],
+        )
+
+    def test_trigram_index_empty_query(self):
+        self.assertEqual(TrigramIndex(SIMILARITY_CORPUS_EN).near(""), [])
+
+
+class FakeResponses:
+    """Stand-in for ``client.responses`` that echoes the user message."""
+
+    def __init__(self, client):
+        self.client = client
+
+    def _reply(self, model, input):
+        self.client.calls.append(input)
+        if self.client.error:
+            raise self.client.error
+        return SimpleNamespace(output_text=f"- {input[-1]['content']}")
+
+
+class FakeOpenAI:
+    instances = []
+    error = None
+
+    def __init__(self, **options):
+        self.options = options
+        self.calls = []
+        self.responses = SimpleNamespace(create=self._create)
+        type(self).instances.append(self)
+
+    def _create(self, model, input):
+        return FakeResponses(self)._reply(model, input)
+
+
+class FakeAsyncOpenAI(FakeOpenAI):
+    instances = []
+
+    def __init__(self, **options):
+        super().__init__(**options)
+        self.loop = None
+
+    async def _create(self, model, input):
+        # як httpx: пул з'єднань працює лише в циклі першого запиту
+        loop = asyncio.get_running_loop()
+        if self.loop is None:
+            self.loop = loop
+        elif self.loop is not loop:
+            raise RuntimeError("Event loop is closed")
+        return FakeResponses(self)._reply(model, input)
+
+
+class OpenAIFormatterTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        FakeOpenAI.instances = []
+        FakeAsyncOpenAI.instances = []
+        FakeOpenAI.error = None
+        openai_formatter._sync_client = None
+        openai_formatter._async_clients.clear()
+        for patcher in (
+            mock.patch.dict(os.environ, {"OPENAI_API_KEY": "test"}),
+            mock.patch.object(openai, "OpenAI", FakeOpenAI),
+            mock.patch.object(openai, "AsyncOpenAI", FakeAsyncOpenAI),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_sync_client_is_shared_and_answers_cached(self):
+        first = openai_formatter.pretty_bullets_uk("Борщ", ["буряк"])
+        second = openai_formatter.pretty_bullets_uk("Борщ", ["буряк"])
+        openai_formatter.pretty_bullets_uk("Суп", ["вода"])
+
+        self.assertEqual(first, "- Борщ\n- буряк")
+        self.assertEqual(second, first)
+        self.assertEqual(len(FakeOpenAI.instances), 1)
+        self.assertEqual(len(FakeOpenAI.instances[0].calls), 2)
+        self.assertEqual(FakeOpenAI.instances[0].options["max_retries"], 1)
+        counters = metrics.snapshot()
+        self.assertEqual(counters["openai_cache_hit"], 1)
+        self.assertEqual(counters["openai_cache_miss"], 2)
+
+    def test_async_works_across_event_loops(self):
+        bullets = async_to_sync(openai_formatter.apretty_bullets_uk)
+        plan = async_to_sync(openai_formatter.aweekly_plan_text_uk)
+
+        self.assertEqual(bullets("Борщ", ["буряк"]), "- Борщ\n- буряк")
+        self.assertTrue(plan({"days": []}).startswith("- Ось дані"))
+        self.assertEqual(bullets("Борщ", ["буряк"]), "- Борщ\n- буряк")
+
+        # кожен async_to_sync - новий цикл подій і свій клієнт
+        self.assertEqual(len(FakeAsyncOpenAI.instances), 2)
+        counters = metrics.snapshot()
+        self.assertEqual(counters["openai_cache_hit"], 1)
+        self.assertEqual(counters["openai_cache_miss"], 2)
+
+    def test_async_client_is_shared_within_a_loop(self):
+        async def format_all():
+            return await asyncio.gather(
+                openai_formatter.apretty_bullets_uk("Борщ", ["буряк"]),
+                openai_formatter.apretty_bullets_uk("Суп", ["вода"]),
+            )
+
+        self.assertEqual(len(async_to_sync(format_all)()), 2)
+        self.assertEqual(len(FakeAsyncOpenAI.instances), 1)
+
+    def test_api_error_returns_none_and_is_not_cached(self):
+        FakeOpenAI.error = RuntimeError("timeout")
+
+        self.assertIsNone(openai_formatter.pretty_bullets_uk("Борщ", ["буряк"]))
+        self.assertIsNone(
+            async_to_sync(openai_formatter.apretty_bullets_uk)("Борщ", ["буряк"])
+        )
+
+        FakeOpenAI.error = None
+        self.assertIsNotNone(openai_formatter.pretty_bullets_uk("Борщ", ["буряк"]))
+
+    def test_without_key_no_client_is_created(self):
+        with mock.patch.dict(os.environ, {"OPENAI_API_KEY": ""}):
+            self.assertIsNone(openai_formatter.weekly_plan_text_uk({}))
+        self.assertEqual(FakeOpenAI.instances, [])
@@ -1,8 +1,20 @@
 from django.urls import path
-from .views import ScaleIngredientsView, SuggestRecipesView, WeeklyPlanView
+from .views import (
+    AIJobView,
+    MetricsView,
+    ScaleBatchView,
+    ScaleIngredientsView,
+    ShoppingListView,
+    SuggestRecipesView,
+    WeeklyPlanView,
+)
 
 urlpatterns = [
     path("scale/", ScaleIngredientsView.as_view(), name="ai-scale"),
+    path("scale/batch/", ScaleBatchView.as_view(), name="ai-scale-batch"),
     path("suggest/", SuggestRecipesView.as_view(), name="ai-suggest"),
     path("weekly-plan/", WeeklyPlanView.as_view(), name="ai-weekly-plan"),
+    path("shopping-list/", ShoppingListView.as_view(), name="ai-shopping-list"),
+    path("jobs/<str:job_id>/", AIJobView.as_view(), name="ai-job"),
+    path("metrics/", MetricsView.as_view(), name="ai-metrics"),
 ]
@@ -2,26 +2,70 @@ from __future__ import annotations
 
 from datetime import date, timedelta
 
+from django.utils.cache import get_conditional_response, patch_cache_control
+
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework import status
 
+from kyking_project import metrics
 from recipes_app.models import Recipe
+from recipes_app.permissions import RoleRequired
 
 from .serializers import (
+    AIJobQuerySerializer,
+    ScaleBatchRequestSerializer,
     ScaleIngredientsRequestSerializer,
+    ScaleRecipeQuerySerializer,
+    ShoppingListRequestSerializer,
     SuggestRecipesRequestSerializer,
     WeeklyPlanRequestSerializer,
 )
-from .services.portion_scaler import split_ingredients, scale_ingredients
-from .services.ingredient_matcher import split_list, recipe_missing_ingredients
+from .services.portion_scaler import (
+    render_template,
+    scale_ingredients,
+    scale_table,
+    split_ingredients,
+)
+from .services.ingredient_index import recipe_lines, recipes_entries, recipes_lines
+from .services.ingredient_matcher import split_list
+from .services import ai_jobs, scale_cache, suggest_cache
+from .services.batch_scoring import get_catalog_matrix
+from .services.weekly_planner import plan_meals
+from .services.shopping_list import aggregate
 from .services.openai_formatter import pretty_bullets_uk, weekly_plan_text_uk
 
 
 class ScaleIngredientsView(APIView):
     permission_classes = [IsAuthenticated]
 
+    def get(self, request):
+        # GET /scale/?recipe_id=..&factor=.. - та сама відповідь, але з ETag,
+        # тож фронтенд може перевикористати свою копію (304 Not Modified)
+        ser = ScaleRecipeQuerySerializer(data=request.query_params)
+        ser.is_valid(raise_exception=True)
+        recipe_id = ser.validated_data["recipe_id"]
+        factor = float(ser.validated_data["factor"])
+
+        version = scale_cache.recipe_version(recipe_id)
+        etag = scale_cache.etag(recipe_id, factor, version)
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            metrics.incr("scale_not_modified")
+            patch_cache_control(not_modified, private=True, no_cache=True)
+            return not_modified
+
+        payload = self._scale_recipe(recipe_id, factor, version)
+        if payload is None:
+            return Response(
+                {"detail": "Recipe not found."}, status=status.HTTP_404_NOT_FOUND
+            )
+        response = Response(payload, status=200)
+        response["ETag"] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
     def post(self, request):
         ser = ScaleIngredientsRequestSerializer(data=request.data)
         ser.is_valid(raise_exception=True)
@@ -31,30 +75,104 @@ class ScaleIngredientsView(APIView):
         use_ai = bool(data.get("use_ai", False))
 
         if data.get("recipe_id"):
-            recipe = Recipe.objects.filter(id=data["recipe_id"]).first()
-            if not recipe:
+            payload = self._scale_recipe(data["recipe_id"], factor)
+            if payload is None:
                 return Response(
                     {"detail": "Recipe not found."}, status=status.HTTP_404_NOT_FOUND
                 )
-            original_items = split_ingredients(recipe.ingredients)
         else:
             original_items = split_ingredients(data["ingredients_text"])
-
-        scaled_items = scale_ingredients(original_items, factor)
-
-        pretty = None
-        if use_ai:
+            payload = {
+                "factor": factor,
+                "original_items": original_items,
+                "scaled_items": scale_ingredients(original_items, factor),
+            }
+        scaled_items = payload["scaled_items"]
+
+        if use_ai and data.get("defer_ai"):
+            job_id = ai_jobs.submit(
+                request.user.id,
+                pretty_bullets_uk,
+                "Масштабовані інгредієнти:",
+                scaled_items,
+            )
+            payload["ai_job"] = {"id": job_id, "status": ai_jobs.PENDING}
+        elif use_ai:
             pretty = pretty_bullets_uk("Масштабовані інгредієнти:", scaled_items)
+            if pretty:
+                payload["pretty"] = pretty
+
+        return Response(payload, status=200)
 
+    def _scale_recipe(self, recipe_id, factor, version=None):
+        if version is None:
+            version = scale_cache.recipe_version(recipe_id)
+        key = scale_cache.cache_key(recipe_id, factor, version)
+        cached = scale_cache.get_cached(key)
+        if cached is not None:
+            return dict(cached)
+
+        lines = recipe_lines(recipe_id)
+        if lines is None:
+            return None
         payload = {
             "factor": factor,
-            "original_items": original_items,
-            "scaled_items": scaled_items,
+            "original_items": [x["raw"] for x in lines],
+            "scaled_items": [render_template(x["parts"], factor) for x in lines],
         }
-        if pretty:
-            payload["pretty"] = pretty
+        scale_cache.set_cached(key, payload)
+        return dict(payload)
 
-        return Response(payload, status=200)
+
+class ScaleBatchView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        ser = ScaleBatchRequestSerializer(data=request.data)
+        ser.is_valid(raise_exception=True)
+        data = ser.validated_data
+        factors = data["factors"]
+
+        results = []
+        not_found = []
+        if data.get("recipe_ids"):
+            lines_by_recipe = recipes_lines(data["recipe_ids"])
+            for recipe_id in data["recipe_ids"]:
+                lines = lines_by_recipe.get(recipe_id)
+                if lines is None:
+                    not_found.append(recipe_id)
+                    continue
+                results.append(
+                    {
+                        "recipe_id": recipe_id,
+                        "original_items": [x["raw"] for x in lines],
+                        "scaled": [
+                            {
+                                "factor": f,
+                                "scaled_items": [
+                                    render_template(x["parts"], f) for x in lines
+                                ],
+                            }
+                            for f in factors
+                        ],
+                    }
+                )
+        else:
+            original_items = split_ingredients(data["ingredients_text"])
+            results.append(
+                {
+                    "recipe_id": None,
+                    "original_items": original_items,
+                    "scaled": [
+                        {"factor": f, "scaled_items": items}
+                        for f, items in scale_table(original_items, factors)
+                    ],
+                }
+            )
+
+        return Response(
+            {"results": results, "not_found_recipe_ids": not_found}, status=200
+        )
 
 
 class SuggestRecipesView(APIView):
@@ -73,32 +191,11 @@ class SuggestRecipesView(APIView):
         else:
             pantry = split_list(data["products_text"])
 
-        qs = Recipe.objects.all()
-        if verified_only:
-            qs = qs.filter(verified_by_chef=True)
-
-        results = []
-        for r in qs:
-            missing, matched, total = recipe_missing_ingredients(r.ingredients, pantry)
-            score = 0.0 if total == 0 else matched / total
-            results.append(
-                {
-                    "recipe_id": r.id,
-                    "title": r.title,
-                    "category": getattr(r.category, "name", None),
-                    "difficulty": r.difficulty,
-                    "score": round(score, 3),
-                    "matched_count": matched,
-                    "total_count": total,
-                    "missing": missing,
-                }
-            )
-
-        results.sort(
-            key=lambda x: (x["score"], -x["matched_count"], -x["total_count"]),
-            reverse=True,
-        )
-        results = results[:limit]
+        key = suggest_cache.cache_key(pantry, limit, verified_only)
+        results = suggest_cache.get_cached(key)
+        if results is None:
+            results = self._rank(pantry, limit, verified_only)
+            suggest_cache.set_cached(key, results)
 
         return Response(
             {
@@ -109,6 +206,28 @@ class SuggestRecipesView(APIView):
             status=200,
         )
 
+    def _rank(self, pantry, limit, verified_only):
+        matrix = get_catalog_matrix()
+        results = matrix.top(pantry, limit, verified_only=verified_only)
+
+        recipes = (
+            Recipe.objects.select_related("category")
+            .defer("search_vector")
+            .in_bulk([x["recipe_id"] for x in results])
+        )
+        # матриця може бути трохи старішою за базу: видалені рецепти пропускаємо
+        results = [x for x in results if x["recipe_id"] in recipes]
+        for x in results:
+            r = recipes[x["recipe_id"]]
+            x.update(
+                {
+                    "title": r.title,
+                    "category": getattr(r.category, "name", None),
+                    "difficulty": r.difficulty,
+                }
+            )
+        return results
+
 
 class WeeklyPlanView(APIView):
     permission_classes = [IsAuthenticated]
@@ -128,46 +247,55 @@ class WeeklyPlanView(APIView):
         else:
             pantry = split_list(data["pantry_text"])
 
-        qs = Recipe.objects.all()
-        if verified_only:
-            qs = qs.filter(verified_by_chef=True)
-        recipes = list(qs.order_by("-created_at"))
-
-        if not recipes:
-            recipes = list(Recipe.objects.all().order_by("-created_at"))
-
-        if not recipes:
-            return Response({"detail": "No recipes in database."}, status=400)
+        matrix = get_catalog_matrix()
+        # матриця може бути трохи старішою за базу: видалені рецепти
+        # виключаємо і складаємо план заново з решти кандидатів
+        deleted = set()
+        while True:
+            planned = plan_meals(
+                matrix,
+                pantry,
+                days,
+                meals_per_day,
+                verified_only=verified_only,
+                exclude=deleted,
+            )
+            if not planned:
+                return Response({"detail": "No recipes in database."}, status=400)
+
+            rows = {m.row for day in planned for m in day}
+            titles = dict(
+                Recipe.objects.filter(
+                    pk__in={matrix.recipe_ids[row] for row in rows}
+                ).values_list("id", "title")
+            )
+            missing = {row for row in rows if matrix.recipe_ids[row] not in titles}
+            if not missing:
+                break
+            deleted |= missing
 
         plan = []
-        idx = 0
-        shopping_set = set()
+        shopping_lines = []
         used = []
 
         start = date.today()
-        for d in range(days):
+        for d, day_meals in enumerate(planned):
             day_date = start + timedelta(days=d)
             meals = []
-            for m in range(meals_per_day):
-                r = recipes[idx % len(recipes)]
-                idx += 1
-
-                missing, matched, total = recipe_missing_ingredients(
-                    r.ingredients, pantry
-                )
-                for x in missing:
-                    shopping_set.add(x.strip())
+            for m, meal in enumerate(day_meals):
+                recipe_id = matrix.recipe_ids[meal.row]
+                shopping_lines.extend((x, 1.0) for x in meal.missing_items)
 
                 meals.append(
                     {
                         "meal": f"Meal {m+1}",
-                        "recipe_id": r.id,
-                        "title": r.title,
-                        "missing": missing,
-                        "score": round(0.0 if total == 0 else matched / total, 3),
+                        "recipe_id": recipe_id,
+                        "title": titles.get(recipe_id),
+                        "missing": meal.missing,
+                        "score": round(meal.coverage, 3),
                     }
                 )
-                used.append(r.id)
+                used.append(recipe_id)
 
             plan.append(
                 {
@@ -176,21 +304,89 @@ class WeeklyPlanView(APIView):
                 }
             )
 
-        shopping_list = sorted(shopping_set, key=lambda s: s.lower())
+        shopping_items = aggregate(shopping_lines)
 
         payload = {
             "pantry": pantry,
             "days": days,
             "meals_per_day": meals_per_day,
             "plan": plan,
-            "shopping_list": shopping_list,
+            "shopping_list": [x["text"] for x in shopping_items],
+            "shopping_items": shopping_items,
             "used_recipe_ids": used,
         }
 
-        pretty = None
-        if use_ai:
+        if use_ai and data.get("defer_ai"):
+            job_id = ai_jobs.submit(request.user.id, weekly_plan_text_uk, dict(payload))
+            payload["ai_job"] = {"id": job_id, "status": ai_jobs.PENDING}
+        elif use_ai:
             pretty = weekly_plan_text_uk(payload)
-        if pretty:
-            payload["pretty"] = pretty
+            if pretty:
+                payload["pretty"] = pretty
+
+        return Response(payload, status=200)
+
+
+class ShoppingListView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        ser = ShoppingListRequestSerializer(data=request.data)
+        ser.is_valid(raise_exception=True)
+        items = ser.validated_data["items"]
+
+        entries = recipes_entries(x["recipe_id"] for x in items)
+
+        lines = []
+        not_found = []
+        for x in items:
+            recipe_entries = entries.get(x["recipe_id"])
+            if recipe_entries is None:
+                not_found.append(x["recipe_id"])
+                continue
+            lines.extend((e, x["factor"]) for e in recipe_entries)
 
+        shopping_items = aggregate(lines)
+        return Response(
+            {
+                "shopping_list": [x["text"] for x in shopping_items],
+                "shopping_items": shopping_items,
+                "not_found_recipe_ids": not_found,
+            },
+            status=200,
+        )
+
+
+class AIJobView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, job_id):
+        ser = AIJobQuerySerializer(data=request.query_params)
+        ser.is_valid(raise_exception=True)
+
+        job = ai_jobs.get_job(job_id, wait=ser.validated_data["wait"])
+        if not job or job["user_id"] != request.user.id:
+            return Response(
+                {"detail": "Job not found."}, status=status.HTTP_404_NOT_FOUND
+            )
+
+        payload = {"id": job["id"], "status": job["status"]}
+        if job["pretty"]:
+            payload["pretty"] = job["pretty"]
         return Response(payload, status=200)
+
+
+class MetricsView(APIView):
+
+    def get_permissions(self):
+        return [RoleRequired(["ADMIN"])]
+
+    def get(self, request):
+        return Response(
+            {
+                "counters": metrics.snapshot(),
+                "suggest_cache_hit_rate": metrics.hit_rate("suggest_cache"),
+                "scale_cache_hit_rate": metrics.hit_rate("scale_cache"),
+            },
+            status=200,
+        )
@@ -0,0 +1,4 @@
+"""Benchmarks for the hot paths of the API (run from ``backend/``).
+
+``python -m benchmarks.<script> --help`` lists the options of a script.
+"""
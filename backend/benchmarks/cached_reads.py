@@ -0,0 +1,51 @@
+"""Conditional GET and cached bodies for the public read endpoints.
+
+Compares a cold request (empty cache), a warm one (cached JSON body) and a
+revalidation with ``If-None-Match`` (304).
+
+    python -m benchmarks.cached_reads --chefs 500 --requests 300
+"""
+
+from benchmarks import common
+
+common.setup()
+
+from django.core.cache import cache  # noqa: E402
+
+URLS = ("/api/categories/", "/api/auth/chefs/", "/api/recipes/?page_size=50")
+
+
+def main():
+    p = common.parser(__doc__)
+    p.add_argument("--chefs", type=int, default=500)
+    p.add_argument("--requests", type=int, default=300)
+    args = p.parse_args()
+
+    with common.test_database():
+        common.make_catalog(args.recipes, seed=args.seed)
+        common.make_users(args.chefs, role="CHEF", prefix="extra-chef")
+        client = common.api_client()
+
+        for url in URLS:
+
+            def get(**headers):
+                response = client.get(url, **headers)
+                assert response.status_code in (200, 304), response.status_code
+                return response
+
+            def cold():
+                cache.clear()
+                get()
+
+            print(url)
+            common.report("  200, empty cache", common.measure(cold, args.requests))
+            etag = get()["ETag"]
+            common.report("  200, warm cache", common.measure(get, args.requests))
+            common.report(
+                "  304, If-None-Match",
+                common.measure(lambda: get(HTTP_IF_NONE_MATCH=etag), args.requests),
+            )
+
+
+if __name__ == "__main__":
+    main()
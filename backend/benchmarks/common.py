@@ -0,0 +1,189 @@
+"""Shared setup for the benchmark scripts.
+
+Each script creates a throw-away test database from the configured
+``DATABASES`` (``test_<NAME>``, as ``manage.py test`` does), fills it with a
+synthetic catalog and drops it at the end, so real data is never touched.
+"""
+
+import argparse
+import logging
+import os
+import random
+import statistics
+import time
+from contextlib import contextmanager
+
+INGREDIENT_LINES = [
+    "500 г буряка",
+    "2 картоплини",
+    "200 г капусти",
+    "1 морква",
+    "1 цибуля",
+    "2 зубчики часнику",
+    "3 яйця",
+    "250 мл молока",
+    "200 г борошна",
+    "1 ст.л цукру",
+    "100 г вершкового масла",
+    "150 г твердого сиру",
+    "200 г сметани",
+    "300 г курячого філе",
+    "250 г печериць",
+    "2 помідори",
+    "1 огірок",
+    "1 болгарський перець",
+    "200 г рису",
+    "400 г свинини",
+    "1 ч.л солі",
+    "2 ст.л олії",
+    "пучок кропу",
+    "200 g flour",
+    "2 eggs",
+    "1 cup milk",
+    "100 g butter",
+    "2 tomatoes",
+    "1 onion",
+    "300 g chicken breast",
+    "200 g mushrooms",
+    "1 tbsp sugar",
+]
+PANTRY_ITEMS = [
+    "буряк",
+    "картопля",
+    "капуста",
+    "морква",
+    "цибуля",
+    "часник",
+    "яйця",
+    "молоко",
+    "борошно",
+    "сир",
+    "сметана",
+    "курка",
+    "гриби",
+    "помідори",
+    "рис",
+    "eggs",
+    "milk",
+    "flour",
+    "onion",
+    "butter",
+]
+CATEGORIES = ["Супи", "Салати", "Випічка", "Основні страви", "Десерти"]
+PASSWORD = "bench-password"
+
+
+def setup():
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "kyking_project.settings")
+    import django
+
+    django.setup()
+    logging.disable(logging.WARNING)
+
+
+def parser(description, recipes=2000):
+    p = argparse.ArgumentParser(description=description)
+    p.add_argument("--recipes", type=int, default=recipes, help="catalog size")
+    p.add_argument("--seed", type=int, default=1)
+    return p
+
+
+@contextmanager
+def test_database():
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    setup_test_environment()
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+def make_users(count, role="USER", prefix="user"):
+    from django.contrib.auth.hashers import make_password
+    from django.contrib.auth.models import User
+
+    from users_app.models import UserProfile
+
+    # один хеш на всіх: PBKDF2 для кожного користувача займав би хвилини
+    password = make_password(PASSWORD)
+    users = User.objects.bulk_create(
+        [
+            User(
+                username=f"{prefix}{i}",
+                email=f"{prefix}{i}@example.com",
+                password=password,
+            )
+            for i in range(count)
+        ]
+    )
+    UserProfile.objects.bulk_create([UserProfile(user=u, role=role) for u in users])
+    return users
+
+
+def make_catalog(recipes, seed=1, authors=50):
+    """``recipes`` recipes with random ingredient lists, indexed for ai_app."""
+    from recipes_app.catalog_io import import_rows
+
+    rnd = random.Random(seed)
+    chefs = make_users(max(1, authors // 5), role="CHEF", prefix="chef")
+    users = make_users(authors - len(chefs), prefix="author")
+    usernames = [u.username for u in chefs + users]
+    rows = (
+        (
+            i,
+            {
+                "title": f"Рецепт {i}",
+                "category": rnd.choice(CATEGORIES),
+                "author": rnd.choice(usernames),
+                "difficulty": rnd.choice(["easy", "medium", "hard"]),
+                "description": "Синтетичний рецепт для бенчмарку",
+                "ingredients": ", ".join(
+                    rnd.sample(INGREDIENT_LINES, rnd.randint(3, 9))
+                ),
+                "steps": "Змішати і приготувати",
+            },
+        )
+        for i in range(recipes)
+    )
+    return import_rows(rows, create_categories=True)
+
+
+def random_pantries(count, seed=1, size=(2, 6)):
+    rnd = random.Random(seed)
+    return [rnd.sample(PANTRY_ITEMS, rnd.randint(*size)) for _ in range(count)]
+
+
+def api_client(user=None):
+    from rest_framework.test import APIClient
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    client = APIClient()
+    if user is not None:
+        token = AccessToken.for_user(user)
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+    return client
+
+
+def measure(func, repeat):
+    """Wall times (seconds) of ``repeat`` calls of ``func``."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def report(label, times, items=1):
+    times = sorted(times)
+    p95 = times[min(len(times) - 1, int(len(times) * 0.95))]
+    rate = items * len(times) / sum(times) if sum(times) else float("inf")
+    print(
+        f"{label:<40} median {statistics.median(times) * 1000:8.2f} ms"
+        f"  p95 {p95 * 1000:8.2f} ms  {rate:12,.0f}/s"
+    )
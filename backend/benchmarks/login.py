@@ -0,0 +1,78 @@
+"""POST /api/auth/token/ under a burst of wrong passwords.
+
+Reports CPU time per attempt with and without the failed-login throttle and
+how long a legitimate login takes during the burst.
+
+    python -m benchmarks.login --attempts 300
+"""
+
+import resource
+import time
+
+from benchmarks import common
+
+common.setup()
+
+from django.conf import settings  # noqa: E402
+from django.core.cache import cache, caches  # noqa: E402
+from django.test.utils import override_settings  # noqa: E402
+
+from users_app import throttling  # noqa: E402
+
+
+def cpu_seconds():
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def burst(client, attempts):
+    cache.clear()
+    caches[throttling.CACHE_ALIAS].clear()
+    codes = {}
+    start = cpu_seconds()
+    for i in range(attempts):
+        response = client.post(
+            "/api/auth/token/",
+            {"username": f"victim{i % 30}", "password": f"guess{i}"},
+            format="json",
+            REMOTE_ADDR=f"10.0.0.{i % 5}",
+        )
+        codes[response.status_code] = codes.get(response.status_code, 0) + 1
+    cpu = cpu_seconds() - start
+
+    legit = time.perf_counter()
+    response = client.post(
+        "/api/auth/token/",
+        {"username": "real0", "password": common.PASSWORD},
+        format="json",
+        REMOTE_ADDR="10.9.9.9",
+    )
+    legit = time.perf_counter() - legit
+    print(
+        f"  responses {codes}, CPU {cpu / attempts * 1000:.1f} ms/attempt,"
+        f" legitimate login {response.status_code} in {legit * 1000:.0f} ms"
+    )
+
+
+def main():
+    p = common.parser(__doc__)
+    p.add_argument("--attempts", type=int, default=300)
+    args = p.parse_args()
+
+    with common.test_database():
+        common.make_users(30, prefix="victim")
+        common.make_users(1, prefix="real")
+        client = common.api_client()
+        print(f"PBKDF2 iterations: {settings.PASSWORD_PBKDF2_ITERATIONS}")
+
+        print("throttle off")
+        with override_settings(
+            LOGIN_MAX_FAILURES_PER_IP=10**9, LOGIN_MAX_FAILURES_PER_USER=10**9
+        ):
+            burst(client, args.attempts)
+        print("throttle on")
+        burst(client, args.attempts)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Ingredient normalization and fuzzy matching, without the database.
+
+    python -m benchmarks.matching --lines 20000
+"""
+
+import random
+from difflib import SequenceMatcher
+
+from benchmarks import common
+
+common.setup()
+
+from ai_app.services.ingredient_matcher import (  # noqa: E402
+    IngredientNormalizer,
+    recipe_missing_ingredients,
+)
+from ai_app.services.similarity import (  # noqa: E402
+    SIMILARITY_THRESHOLD,
+    SequenceMatcherBackend,
+    TrigramIndex,
+)
+
+
+def main():
+    p = common.parser(__doc__)
+    p.add_argument("--lines", type=int, default=20000)
+    args = p.parse_args()
+    rnd = random.Random(args.seed)
+
+    # унікальні рядки, щоб холодний прохід не влучав у lru_cache
+    lines = [
+        f"{rnd.randint(1, 999)} {rnd.choice(common.INGREDIENT_LINES)} ({i})"
+        for i in range(args.lines)
+    ]
+    normalizer = IngredientNormalizer(cache_size=2 * args.lines)
+    common.report(
+        "normalize, cold",
+        common.measure(lambda: [normalizer.normalize(x) for x in lines], 1),
+        items=len(lines),
+    )
+    common.report(
+        "normalize, cached",
+        common.measure(lambda: [normalizer.normalize(x) for x in lines], 3),
+        items=len(lines),
+    )
+
+    vocabulary = sorted({normalizer.normalize(x) for x in common.INGREDIENT_LINES})
+    queries = [normalizer.normalize(x) for x in common.PANTRY_ITEMS] * 50
+    backend = SequenceMatcherBackend()
+    index = TrigramIndex(vocabulary)
+
+    def difflib_scan():
+        for q in queries:
+            for v in vocabulary:
+                SequenceMatcher(None, q, v).ratio() >= SIMILARITY_THRESHOLD
+
+    def prefiltered_scan():
+        for q in queries:
+            [v for v in vocabulary if backend.is_similar(q, v)]
+
+    def trigram_lookup():
+        for q in queries:
+            index.near(q)
+
+    for label, func in (
+        ("similar names, difflib scan", difflib_scan),
+        ("similar names, prefiltered scan", prefiltered_scan),
+        ("similar names, TrigramIndex.near", trigram_lookup),
+    ):
+        common.report(label, common.measure(func, 5), items=len(queries))
+
+    recipes = [", ".join(rnd.sample(common.INGREDIENT_LINES, 8)) for _ in range(500)]
+    pantry = common.PANTRY_ITEMS[:8]
+    common.report(
+        "recipe_missing_ingredients",
+        common.measure(
+            lambda: [recipe_missing_ingredients(r, pantry) for r in recipes], 3
+        ),
+        items=len(recipes),
+    )
+
+
+if __name__ == "__main__":
+    main()
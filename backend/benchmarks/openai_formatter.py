@@ -0,0 +1,145 @@
+"""AI formatting of POST /api/ai/scale/ against a local OpenAI stub.
+
+The stub answers the Responses API after ``--latency`` ms, so no key or
+network is needed. For every mode the request time is the time a web worker
+stays busy with the request.
+
+    python -m benchmarks.openai_formatter --requests 20 --latency 300
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmarks import common
+
+common.setup()
+
+from asgiref.sync import async_to_sync  # noqa: E402
+
+from ai_app.services import ai_jobs, openai_formatter  # noqa: E402
+
+
+def stub_server(latency):
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            time.sleep(latency)
+            body = json.dumps(
+                {
+                    "id": "resp_stub",
+                    "object": "response",
+                    "created_at": int(time.time()),
+                    "model": openai_formatter.model_name(),
+                    "status": "completed",
+                    "output": [
+                        {
+                            "id": "msg_stub",
+                            "type": "message",
+                            "role": "assistant",
+                            "status": "completed",
+                            "content": [
+                                {
+                                    "type": "output_text",
+                                    "text": "- відформатовано",
+                                    "annotations": [],
+                                }
+                            ],
+                        }
+                    ],
+                }
+            ).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    p = common.parser(__doc__)
+    p.add_argument("--requests", type=int, default=20)
+    p.add_argument("--latency", type=float, default=300, help="stub latency, ms")
+    args = p.parse_args()
+
+    server = stub_server(args.latency / 1000)
+    # клієнти створюються ліниво, тож змінні діють і після django.setup()
+    os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{server.server_port}/v1"
+    os.environ["OPENAI_API_KEY"] = "stub"
+    os.environ["OPENAI_MAX_RETRIES"] = "0"
+
+    with common.test_database():
+        client = common.api_client(common.make_users(1, prefix="bench")[0])
+        counter = iter(range(10**9))
+
+        def scale(cold, defer=False):
+            # холодний запит - новий текст, тобто промах кешу відповідей
+            n = next(counter) if cold else 0
+            response = client.post(
+                "/api/ai/scale/",
+                {
+                    "ingredients_text": f"{n + 1} г борошна, 2 яйця",
+                    "factor": 2,
+                    "use_ai": True,
+                    "defer_ai": defer,
+                },
+                format="json",
+            )
+            assert response.status_code == 200, response.content
+            assert defer or "pretty" in response.data, response.data
+            return response.data
+
+        scale(cold=False)
+        for label, cold in (
+            ("scale use_ai, cold", True),
+            ("scale use_ai, cached", False),
+        ):
+            common.report(
+                label, common.measure(lambda: scale(cold=cold), args.requests)
+            )
+
+        jobs = []
+        common.report(
+            "scale use_ai, deferred (cold)",
+            common.measure(
+                lambda: jobs.append(scale(cold=True, defer=True)["ai_job"]["id"]),
+                args.requests,
+            ),
+        )
+        start = time.perf_counter()
+        for job_id in jobs:
+            while ai_jobs.get_job(job_id)["status"] == ai_jobs.PENDING:
+                time.sleep(0.01)
+        print(
+            f"  deferred jobs finished {time.perf_counter() - start:.2f} s after"
+            " the last request"
+        )
+
+        texts = [[f"{i} г борошна"] for i in range(10**6, 10**6 + args.requests)]
+
+        async def gather():
+            await asyncio.gather(
+                *(openai_formatter.apretty_bullets_uk("Бенчмарк:", t) for t in texts)
+            )
+
+        common.report(
+            f"{args.requests} async calls on one loop, cold",
+            common.measure(async_to_sync(gather), 1),
+            items=args.requests,
+        )
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
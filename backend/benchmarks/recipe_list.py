@@ -0,0 +1,74 @@
+"""GET /api/recipes/: pages, field selection and the streamed full list.
+
+Prints time, query count and peak Python memory (tracemalloc) per request.
+
+    python -m benchmarks.recipe_list --recipes 20000
+"""
+
+import time
+import tracemalloc
+
+from benchmarks import common
+
+common.setup()
+
+from django.db import connection  # noqa: E402
+from django.test.utils import CaptureQueriesContext  # noqa: E402
+
+from recipes_app.models import Favorite, Recipe  # noqa: E402
+
+
+def fetch(client, url, label=None):
+    tracemalloc.start()
+    start = time.perf_counter()
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+        if response.streaming:
+            size = sum(len(part) for part in response.streaming_content)
+        else:
+            size = len(response.content)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    assert response.status_code == 200, response.status_code
+    print(
+        f"{label or url:<45} {elapsed * 1000:9.1f} ms  {len(queries):3} queries"
+        f"  {size / 1e6:7.2f} MB body  peak {peak / 1e6:7.1f} MB"
+    )
+
+
+def main():
+    p = common.parser(__doc__, recipes=20000)
+    args = p.parse_args()
+
+    with common.test_database():
+        common.make_catalog(args.recipes, seed=args.seed)
+        user = common.make_users(1, prefix="bench")[0]
+        ids = Recipe.objects.values_list("id", flat=True)[: args.recipes // 10]
+        Favorite.objects.bulk_create([Favorite(user=user, recipe_id=pk) for pk in ids])
+
+        for label, client in (
+            ("anonymous", common.api_client()),
+            ("authenticated", common.api_client(user)),
+        ):
+            print(label)
+            # прогрів: кеш ролі та версій моделей
+            client.get("/api/recipes/?page_size=1")
+            for url in (
+                "/api/recipes/",
+                "/api/recipes/?page_size=100",
+                "/api/recipes/?page_size=100&fields=id,title",
+                "/api/recipes/?difficulty=easy&page_size=100",
+                "/api/recipes/?search=рецепт&page_size=100",
+                "/api/recipes/?stream=1",
+                "/api/recipes/?stream=1&fields=id,title",
+            ):
+                fetch(client, url)
+            url = "/api/recipes/?page_size=100"
+            for _ in range(4):
+                url = client.get(url).data["next"] or url
+            fetch(client, url, "page 5 (cursor), page_size=100")
+
+
+if __name__ == "__main__":
+    main()
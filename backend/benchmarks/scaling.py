@@ -0,0 +1,61 @@
+"""Portion scaling: the line parser and POST /api/ai/scale/batch/.
+
+    python -m benchmarks.scaling --lines 20000 --recipes 500
+"""
+
+import random
+
+from benchmarks import common
+
+common.setup()
+
+from ai_app.services.portion_scaler import (  # noqa: E402
+    scale_ingredients,
+    scale_table,
+)
+from recipes_app.models import Recipe  # noqa: E402
+
+FACTORS = [0.5, 1.5, 2, 3]
+QUANTITIES = ["1", "2", "½", "1 1/2", "0.5", "2,5", "3/4", "200", "1-2", "¼"]
+
+
+def main():
+    p = common.parser(__doc__, recipes=500)
+    p.add_argument("--lines", type=int, default=20000)
+    args = p.parse_args()
+    rnd = random.Random(args.seed)
+
+    lines = [
+        f"{rnd.choice(QUANTITIES)} {rnd.choice(common.INGREDIENT_LINES)}"
+        for _ in range(args.lines)
+    ]
+    items = len(lines) * len(FACTORS)
+    common.report(
+        "scale_ingredients per factor",
+        common.measure(lambda: [scale_ingredients(lines, f) for f in FACTORS], 3),
+        items=items,
+    )
+    common.report(
+        "scale_table (parse once)",
+        common.measure(lambda: scale_table(lines, FACTORS), 3),
+        items=items,
+    )
+
+    with common.test_database():
+        common.make_catalog(args.recipes, seed=args.seed)
+        client = common.api_client(common.make_users(1, prefix="bench")[0])
+        ids = list(Recipe.objects.values_list("id", flat=True)[:50])
+
+        def batch():
+            response = client.post(
+                "/api/ai/scale/batch/",
+                {"recipe_ids": ids, "factors": FACTORS},
+                format="json",
+            )
+            assert response.status_code == 200, response.content
+
+        common.report("scale/batch 50 recipes x 4 factors", common.measure(batch, 20))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Recipe search plans on PostgreSQL: ``icontains`` vs ``search_recipes``.
+
+Prints the scan nodes and execution time from ``EXPLAIN ANALYZE`` for the
+old ``title/description__icontains`` filter, for ``search_recipes`` with
+index scans disabled, and for ``search_recipes`` as the planner runs it.
+
+    python -m benchmarks.search --recipes 100000
+"""
+
+import re
+import sys
+
+from benchmarks import common
+
+common.setup()
+
+from django.db import connection  # noqa: E402
+from django.db.models import Q  # noqa: E402
+
+from recipes_app.models import Recipe  # noqa: E402
+from recipes_app.search import search_recipes  # noqa: E402
+
+# рідкісні рецепти серед синтетичного каталогу: запит має бути вибірковим
+NAMED = [
+    ("Борщ полтавський", "Густий борщ з галушками"),
+    ("Борщ зелений", "Зі щавлем і яйцем"),
+    ("Вареники з вишнями", "Літні вареники"),
+    ("Деруни", "Картопляні деруни зі сметаною"),
+    ("Голубці", "Голубці з рисом і м'ясом"),
+]
+QUERIES = ["борщ", "вареники", "борш", "голубці з рисом"]
+
+_SCAN_RE = re.compile(
+    r"((?:Parallel )?(?:Bitmap Index|Bitmap Heap|Index Only|Index|Seq) Scan"
+    r" (?:using|on) \S+)"
+)
+_TIME_RE = re.compile(r"Execution Time: ([\d.]+) ms")
+
+
+def icontains(text):
+    qs = Recipe.objects.all()
+    return qs.filter(Q(title__icontains=text) | Q(description__icontains=text))
+
+
+def explain(qs, indexes=True):
+    with connection.cursor() as cursor:
+        value = "on" if indexes else "off"
+        cursor.execute(f"SET enable_indexscan = {value}")
+        cursor.execute(f"SET enable_bitmapscan = {value}")
+    try:
+        plan = qs.only("id")[:20].explain(analyze=True)
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute("RESET enable_indexscan")
+            cursor.execute("RESET enable_bitmapscan")
+    scans = sorted(set(_SCAN_RE.findall(plan)))
+    return float(_TIME_RE.search(plan).group(1)), scans
+
+
+def main():
+    p = common.parser(__doc__, recipes=100000)
+    args = p.parse_args()
+
+    if connection.vendor != "postgresql":
+        sys.exit("search plans need PostgreSQL (pg_trgm, tsvector)")
+
+    with common.test_database():
+        common.make_catalog(args.recipes, seed=args.seed)
+        sample = Recipe.objects.first()
+        Recipe.objects.bulk_create(
+            Recipe(
+                author_id=sample.author_id,
+                category_id=sample.category_id,
+                title=title,
+                description=description,
+                ingredients="буряк, капуста",
+                steps="Зварити",
+            )
+            for title, description in NAMED
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE recipes_app_recipe")
+
+        for query in QUERIES:
+            print(f"--- search={query!r}")
+            ranked = search_recipes(Recipe.objects.all(), query)
+            for label, qs, indexes in (
+                ("icontains (before)", icontains(query), True),
+                ("search_recipes, no index scans", ranked, False),
+                ("search_recipes", ranked, True),
+            ):
+                elapsed, scans = explain(qs, indexes)
+                print(f"{label:<32} {elapsed:9.2f} ms  {', '.join(scans)}")
+
+
+if __name__ == "__main__":
+    main()
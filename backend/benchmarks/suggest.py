@@ -0,0 +1,56 @@
+"""POST /api/ai/suggest/ and the catalog matrix behind it.
+
+    python -m benchmarks.suggest --recipes 5000 --requests 200
+"""
+
+from benchmarks import common
+
+common.setup()
+
+from django.test.utils import override_settings  # noqa: E402
+
+from ai_app.services.batch_scoring import load_catalog_matrix  # noqa: E402
+
+
+def main():
+    p = common.parser(__doc__, recipes=5000)
+    p.add_argument("--requests", type=int, default=200)
+    args = p.parse_args()
+
+    with common.test_database():
+        common.make_catalog(args.recipes, seed=args.seed)
+        client = common.api_client(common.make_users(1, prefix="bench")[0])
+        pantries = common.random_pantries(args.requests, seed=args.seed)
+
+        common.report("load_catalog_matrix", common.measure(load_catalog_matrix, 3))
+        matrix = load_catalog_matrix()
+        it = iter(pantries)
+        common.report(
+            "CatalogMatrix.top(limit=10)",
+            common.measure(
+                lambda: matrix.top(next(it), 10, verified_only=False), len(pantries)
+            ),
+        )
+
+        def suggest(products):
+            response = client.post(
+                "/api/ai/suggest/",
+                {"products": products, "limit": 10, "verified_only": False},
+                format="json",
+            )
+            assert response.status_code == 200, response.content
+
+        # перший запит будує матрицю каталогу
+        suggest(pantries[0])
+        for label, ttl in (("suggest, result cache miss", 0), ("suggest, cached", 300)):
+            it = iter(pantries)
+            with override_settings(AI_SUGGEST_CACHE_TTL=ttl):
+                if ttl:
+                    for products in pantries:
+                        suggest(products)
+                times = common.measure(lambda: suggest(next(it)), len(pantries))
+            common.report(label, times)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Recipe suggestions: per-request scan of every recipe vs the catalog matrix.
+
+The scan is the pre-index ``SuggestRecipesView``: load all recipes, parse and
+match each ingredient line against the pantry, sort in Python.
+
+    python -m benchmarks.suggest_scan --sizes 1000,10000,100000 --requests 5
+"""
+
+from benchmarks import common
+
+common.setup()
+
+from ai_app.services.batch_scoring import load_catalog_matrix  # noqa: E402
+from ai_app.services.ingredient_matcher import (  # noqa: E402
+    recipe_missing_ingredients,
+)
+from recipes_app.models import Recipe  # noqa: E402
+
+
+def scan(pantry, limit=10):
+    results = []
+    for r in Recipe.objects.all():
+        missing, matched, total = recipe_missing_ingredients(r.ingredients, pantry)
+        score = 0.0 if total == 0 else matched / total
+        results.append(
+            {
+                "recipe_id": r.id,
+                "title": r.title,
+                "category": getattr(r.category, "name", None),
+                "score": score,
+                "matched_count": matched,
+                "total_count": total,
+                "missing": missing,
+            }
+        )
+    results.sort(
+        key=lambda x: (x["score"], -x["matched_count"], -x["total_count"]),
+        reverse=True,
+    )
+    return results[:limit]
+
+
+def main():
+    p = common.parser(__doc__)
+    p.add_argument("--sizes", default="1000,10000,100000")
+    p.add_argument("--requests", type=int, default=5)
+    args = p.parse_args()
+
+    for size in (int(x) for x in args.sizes.split(",")):
+        # окрема база на кожен розмір: make_catalog створює тих самих авторів
+        with common.test_database():
+            common.make_catalog(size, seed=args.seed)
+            pantries = common.random_pantries(args.requests, seed=args.seed)
+            print(f"--- {size} recipes")
+
+            it = iter(pantries)
+            common.report(
+                "scan, per request",
+                common.measure(lambda: scan(next(it)), len(pantries)),
+            )
+
+            load = common.measure(load_catalog_matrix, 1)
+            common.report("matrix, build (once per catalog change)", load)
+            matrix = load_catalog_matrix()
+            it = iter(pantries)
+            common.report(
+                "matrix, per request",
+                common.measure(
+                    lambda: matrix.top(next(it), 10, verified_only=False),
+                    len(pantries),
+                ),
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""POST /api/ai/weekly-plan/ (no OpenAI call) over the cached catalog matrix.
+
+    python -m benchmarks.weekly_plan --recipes 5000 --requests 100
+"""
+
+from benchmarks import common
+
+common.setup()
+
+
+def main():
+    p = common.parser(__doc__, recipes=5000)
+    p.add_argument("--requests", type=int, default=100)
+    args = p.parse_args()
+
+    with common.test_database():
+        common.make_catalog(args.recipes, seed=args.seed)
+        client = common.api_client(common.make_users(1, prefix="bench")[0])
+        pantries = common.random_pantries(args.requests, seed=args.seed)
+
+        for days, meals in ((7, 2), (14, 3)):
+            it = iter(pantries)
+
+            def plan():
+                response = client.post(
+                    "/api/ai/weekly-plan/",
+                    {
+                        "pantry": next(it),
+                        "days": days,
+                        "meals_per_day": meals,
+                        "verified_only": False,
+                    },
+                    format="json",
+                )
+                assert response.status_code == 200, response.content
+
+            common.report(
+                f"weekly-plan {days} days x {meals} meals",
+                common.measure(plan, len(pantries)),
+            )
+
+
+if __name__ == "__main__":
+    main()
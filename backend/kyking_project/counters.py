@@ -0,0 +1,64 @@
+"""Integer counters in a cache backend (the default one unless ``using`` says
+otherwise).
+
+Two kinds share the same primitives:
+
+* tallies (``incr``) start at ``delta`` and only ever grow;
+* version counters (``versions``/``bump``) start at ``time.time_ns()``, so a
+  key that was evicted never comes back with a value an older reader (an
+  ETag, a cached matrix, a cache key) has already seen.
+"""
+
+import time
+
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+
+
+def incr(
+    key: str, delta: int = 1, timeout=None, using: str = DEFAULT_CACHE_ALIAS
+) -> bool:
+    """Add ``delta`` to ``key``; ``True`` if this call created the counter.
+
+    ``timeout`` applies only when the counter is created.
+    """
+    backend = caches[using]
+    if backend.add(key, delta, timeout=timeout):
+        return True
+    try:
+        backend.incr(key, delta)
+    except ValueError:
+        # ключ витіснили між add і incr
+        backend.set(key, delta, timeout=timeout)
+    return False
+
+
+async def aincr(key: str, delta: int = 1, timeout=None) -> bool:
+    """``incr`` for async code, through the cache's async API."""
+    if await cache.aadd(key, delta, timeout=timeout):
+        return True
+    try:
+        await cache.aincr(key, delta)
+    except ValueError:
+        await cache.aset(key, delta, timeout=timeout)
+    return False
+
+
+def versions(keys) -> dict:
+    """Current value of every version counter in ``keys``, seeding missing ones."""
+    values = cache.get_many(keys)
+    for key in keys:
+        if key not in values:
+            cache.add(key, time.time_ns(), timeout=None)
+            values[key] = cache.get(key)
+    return values
+
+
+def version(key: str) -> int:
+    return versions([key])[key]
+
+
+def bump(key: str) -> None:
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), timeout=None)
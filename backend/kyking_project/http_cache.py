@@ -0,0 +1,177 @@
+"""Conditional GET for read endpoints, driven by per-model version counters.
+
+Every tracked model has a counter in the default cache that is bumped on
+``post_save``/``post_delete``. A view's ETag is a digest of the counters of
+the models its response is built from, so a matching ``If-None-Match`` is
+answered with ``304 Not Modified`` before any query or serializer runs.
+
+With ``cache_body=True`` the rendered JSON bytes are stored under the same
+ETag, so a warm endpoint answers without touching the database or DRF
+serializers, and every tracked write invalidates it implicitly. The key is
+built from the path and only the query parameters the view declares in
+``params``; a request carrying any other parameter is served uncached, so
+junk query strings cannot fill the cache.
+
+Writes that bypass signals (``QuerySet.update``, ``bulk_create``) must call
+``bump_model_version`` themselves.
+"""
+
+import hashlib
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.http import HttpResponse
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+    patch_vary_headers,
+)
+
+from kyking_project import counters, metrics
+
+MODEL_VERSION_PREFIX = "model_version:"
+BODY_KEY_PREFIX = "http_cache:body:"
+
+
+def _key(model) -> str:
+    return f"{MODEL_VERSION_PREFIX}{model._meta.label_lower}"
+
+
+def model_versions(models) -> list:
+    keys = [_key(m) for m in models]
+    values = counters.versions(keys)
+    return [values[k] for k in keys]
+
+
+def bump_model_version(model) -> None:
+    counters.bump(_key(model))
+
+
+def track(model, ignore_fields=()) -> None:
+    """Bump ``model``'s version on every save and delete.
+
+    Saves limited by ``update_fields`` to ``ignore_fields`` (e.g. ``last_login``)
+    do not change any response and are skipped.
+    """
+    ignored = frozenset(ignore_fields)
+
+    def on_save(sender, update_fields=None, **kwargs):
+        if update_fields is not None and ignored and set(update_fields) <= ignored:
+            return
+        bump_model_version(sender)
+
+    def on_delete(sender, **kwargs):
+        bump_model_version(sender)
+
+    uid = f"http_cache:{model._meta.label_lower}"
+    post_save.connect(on_save, sender=model, weak=False, dispatch_uid=uid)
+    post_delete.connect(on_delete, sender=model, weak=False, dispatch_uid=uid)
+
+
+def _request_key(request, params):
+    if params is None:
+        return request.get_full_path()
+    # format вибирає рендерер (JSON чи browsable API), тож теж входить у ключ
+    query = [(k, request.GET.getlist(k)) for k in sorted({*params, "format"})]
+    return [request.path, [x for x in query if x[1]]]
+
+
+def _only_known_params(request, params) -> bool:
+    return set(request.GET) <= {*(params or ()), "format"}
+
+
+def etag_for(request, models, per_user=False, params=None) -> str:
+    """``params`` lists the query parameters the response depends on; with
+    ``None`` the whole query string is part of the ETag."""
+    parts = [_request_key(request, params), *model_versions(models)]
+    if per_user:
+        user = getattr(request, "user", None)
+        parts.append(user.pk if user is not None and user.is_authenticated else 0)
+    digest = hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()
+    return f'W/"{digest}"'
+
+
+def _wants_json(request) -> bool:
+    renderer = getattr(request, "accepted_renderer", None)
+    return renderer is not None and renderer.format == "json"
+
+
+def _body_key(etag: str) -> str:
+    return f"{BODY_KEY_PREFIX}{etag[3:-1]}"
+
+
+def _cached_body_response(etag):
+    body = cache.get(_body_key(etag))
+    metrics.incr("http_cache_hit" if body is not None else "http_cache_miss")
+    if body is None:
+        return None
+    return HttpResponse(body, content_type="application/json")
+
+
+def _store_body(view, request, response, etag, args, kwargs):
+    # рендеримо тут, а не в dispatch, щоб покласти в кеш готові байти
+    response = view.finalize_response(request, response, *args, **kwargs)
+    response.render()
+    cache.set(
+        _body_key(etag),
+        response.content,
+        getattr(settings, "HTTP_RESPONSE_CACHE_TTL", 600),
+    )
+    return response
+
+
+def _patch_headers(response, request, per_user):
+    if per_user:
+        patch_vary_headers(response, ("Authorization",))
+        if request.user.is_authenticated:
+            patch_cache_control(response, private=True, no_cache=True)
+            return
+    patch_cache_control(
+        response, public=True, max_age=getattr(settings, "HTTP_CACHE_MAX_AGE", 10)
+    )
+
+
+def conditional_get(*models, per_user=False, cache_body=False, params=None):
+    """Decorate an APIView ``get`` whose response depends only on ``models``.
+
+    ``per_user`` marks responses that also depend on the requesting user
+    (e.g. ``is_favorite``); they get ``Vary: Authorization`` and are private
+    for authenticated users. ``cache_body`` keeps the rendered JSON in the
+    cache and serves it on later requests with the same ETag; only requests
+    whose query parameters are all listed in ``params`` use it.
+    """
+
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, request, *args, **kwargs):
+            etag = etag_for(request, models, per_user=per_user, params=params)
+            not_modified = get_conditional_response(request, etag=etag)
+            if not_modified is not None:
+                _patch_headers(not_modified, request, per_user)
+                return not_modified
+
+            use_body_cache = (
+                cache_body
+                and _wants_json(request)
+                and _only_known_params(request, params)
+            )
+            response = _cached_body_response(etag) if use_body_cache else None
+            if response is None:
+                response = method(self, request, *args, **kwargs)
+                # потокову відповідь (?stream=1) не буферизуємо заради кешу
+                if (
+                    use_body_cache
+                    and response.status_code == 200
+                    and not response.streaming
+                ):
+                    response = _store_body(self, request, response, etag, args, kwargs)
+            if 200 <= response.status_code < 300:
+                response["ETag"] = etag
+                _patch_headers(response, request, per_user)
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,53 @@
+"""Counters kept in the default cache backend.
+
+They are shared by all worker processes only if that backend is (Redis,
+Memcached, database); with the default LocMemCache each process keeps and
+reports its own counts.
+"""
+
+from django.core.cache import cache
+
+from kyking_project import counters
+
+METRICS_KEY_PREFIX = "metrics:"
+METRICS_NAMES_KEY = "metrics:names"
+
+
+def _key(name: str) -> str:
+    return f"{METRICS_KEY_PREFIX}{name}"
+
+
+def _register(name: str) -> None:
+    names = cache.get(METRICS_NAMES_KEY) or []
+    if name not in names:
+        cache.set(METRICS_NAMES_KEY, sorted([*names, name]), timeout=None)
+
+
+async def _aregister(name: str) -> None:
+    names = await cache.aget(METRICS_NAMES_KEY) or []
+    if name not in names:
+        await cache.aset(METRICS_NAMES_KEY, sorted([*names, name]), timeout=None)
+
+
+def incr(name: str, delta: int = 1) -> None:
+    if counters.incr(_key(name), delta):
+        _register(name)
+
+
+async def aincr(name: str, delta: int = 1) -> None:
+    if await counters.aincr(_key(name), delta):
+        await _aregister(name)
+
+
+def snapshot() -> dict:
+    names = cache.get(METRICS_NAMES_KEY) or []
+    values = cache.get_many([_key(n) for n in names])
+    return {n: values.get(_key(n), 0) for n in names}
+
+
+def hit_rate(prefix: str) -> float:
+    values = snapshot()
+    hits = values.get(f"{prefix}_hit", 0)
+    misses = values.get(f"{prefix}_miss", 0)
+    total = hits + misses
+    return round(hits / total, 3) if total else 0.0
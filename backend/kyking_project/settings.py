@@ -39,12 +39,14 @@ INSTALLED_APPS = [
     "users_app",
     "recipes_app",
     "ai_app",
+    "notifications_app",
     "django.contrib.admin",
     "django.contrib.auth",
     "django.contrib.contenttypes",
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
 ]
 
 CORS_ALLOWED_ORIGINS = [
@@ -98,6 +100,52 @@ DATABASES = {
     }
 }
 
+THROTTLE_CACHE_BACKEND = os.getenv(
+    "THROTTLE_CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+)
+# LocMem за замовчуванням живе в пам'яті одного процесу. Через кеш процеси
+# дізнаються про зміни (версії каталогу й моделей для ETag, матриці та кешу
+# відповідей), бачать фонові AI-завдання інших процесів і ведуть спільні
+# метрики; з кількома воркерами (gunicorn -w N) потрібен спільний бекенд:
+# CACHE_BACKEND=django.core.cache.backends.redis.RedisCache (або Memcached,
+# DatabaseCache) і CACHE_LOCATION
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.getenv("CACHE_LOCATION", "kyking"),
+    },
+    # лічильники невдалих входів окремо від загального кешу, щоб їх не
+    # витісняли інші ключі. LocMem тримає їх у пам'яті кожного процесу
+    # окремо і забуває після перезапуску - з кількома воркерами потрібен
+    # спільний бекенд (Redis, Memcached)
+    "throttle": {
+        "BACKEND": THROTTLE_CACHE_BACKEND,
+        "LOCATION": os.getenv("THROTTLE_CACHE_LOCATION", "kyking-throttle"),
+        "OPTIONS": (
+            {"MAX_ENTRIES": int(os.getenv("THROTTLE_CACHE_MAX_ENTRIES", "100000"))}
+            if THROTTLE_CACHE_BACKEND.endswith("LocMemCache")
+            else {}
+        ),
+    },
+}
+
+# Cache-Control max-age для анонімних GET з ETag (для reverse proxy)
+HTTP_CACHE_MAX_AGE = int(os.getenv("HTTP_CACHE_MAX_AGE", "10"))
+# скільки зберігати готовий JSON для категорій і списку шефів
+HTTP_RESPONSE_CACHE_TTL = int(os.getenv("HTTP_RESPONSE_CACHE_TTL", "600"))
+
+AI_SUGGEST_CACHE_TTL = int(os.getenv("AI_SUGGEST_CACHE_TTL", "300"))
+AI_FORMATTER_CACHE_TTL = int(os.getenv("AI_FORMATTER_CACHE_TTL", "86400"))
+AI_SCALE_CACHE_TTL = int(os.getenv("AI_SCALE_CACHE_TTL", "86400"))
+AI_JOB_TTL = int(os.getenv("AI_JOB_TTL", "3600"))
+# потоки для відкладених AI-задач у кожному процесі
+AI_JOB_WORKERS = int(os.getenv("AI_JOB_WORKERS", "4"))
+# найдовше очікування (секунди) в GET /api/ai/jobs/<id>/?wait=...:
+# поки запит чекає, він тримає WSGI-воркер
+AI_JOB_MAX_WAIT = float(os.getenv("AI_JOB_MAX_WAIT", "2"))
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -116,6 +164,17 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# той самий pbkdf2_sha256, але кількість ітерацій задається для кожного
+# розгортання; старі хеші перераховуються при наступному успішному вході
+PASSWORD_HASHERS = [
+    "users_app.hashers.TunablePBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+]
+PASSWORD_PBKDF2_ITERATIONS = int(os.getenv("PASSWORD_PBKDF2_ITERATIONS", "1000000"))
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
@@ -141,13 +200,33 @@ STATIC_ROOT = BASE_DIR / "staticfiles"
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "users_app.authentication.ClaimsJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticatedOrReadOnly",
     ),
+    # скільки reverse proxy стоїть перед застосунком; при 0 IP клієнта для
+    # обмежень береться з REMOTE_ADDR, а X-Forwarded-For ігнорується
+    "NUM_PROXIES": int(os.getenv("NUM_PROXIES", "0")),
 }
 
+# скільки рядків серіалізувати за раз у потокових списках (?stream=1)
+STREAMING_CHUNK_SIZE = int(os.getenv("STREAMING_CHUNK_SIZE", "2000"))
+
+# скільки секунд процес довіряє закешованій ролі користувача
+ROLE_CACHE_TTL = int(os.getenv("ROLE_CACHE_TTL", "30"))
+# скільки користувачів процес тримає в кеші ролей
+ROLE_CACHE_SIZE = int(os.getenv("ROLE_CACHE_SIZE", "10000"))
+# роль береться з токена без запиту до бази; зміна ролі чи деактивація
+# діють лише після закінчення access-токена
+AUTH_STATELESS_USER = os.getenv("AUTH_STATELESS_USER", "False") == "True"
+
+# невдалі входи: ковзне вікно (секунди) і ліміти на логін та на IP;
+# понад ліміт запит відхиляється з 429 ще до перевірки пароля
+LOGIN_THROTTLE_WINDOW = int(os.getenv("LOGIN_THROTTLE_WINDOW", "300"))
+LOGIN_MAX_FAILURES_PER_USER = int(os.getenv("LOGIN_MAX_FAILURES_PER_USER", "5"))
+LOGIN_MAX_FAILURES_PER_IP = int(os.getenv("LOGIN_MAX_FAILURES_PER_IP", "20"))
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=60),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
@@ -181,6 +260,11 @@ LOGGING = {
             "level": "INFO",
             "propagate": False,
         },
+        "notifications_app": {
+            "handlers": ["console", "file"],
+            "level": "INFO",
+            "propagate": False,
+        },
     },
 }
 
@@ -195,4 +279,6 @@ EMAIL_USE_TLS = os.getenv("EMAIL_USE_TLS", "True") == "True"
 EMAIL_USE_SSL = os.getenv("EMAIL_USE_SSL", "False") == "True"
 
 DEFAULT_FROM_EMAIL = os.getenv("DEFAULT_FROM_EMAIL", EMAIL_HOST_USER)
+# на скільки секунд send_queued_mail "бронює" пачку листів, поки їх надсилає
+OUTBOX_LEASE_SECONDS = int(os.getenv("OUTBOX_LEASE_SECONDS", "300"))
 FRONTEND_URL = os.getenv("FRONTEND_URL", "http://127.0.0.1:9000")
@@ -0,0 +1,72 @@
+"""Streaming JSON lists for read endpoints that return everything at once.
+
+With ``?stream=1`` a list endpoint walks its queryset with
+``.iterator(chunk_size=...)`` (a server-side cursor on PostgreSQL),
+serializes one chunk at a time and yields the JSON array piece by piece
+through ``StreamingHttpResponse``. Memory then depends on the chunk size,
+not on the number of rows. The JSON matches DRF's ``JSONRenderer`` output.
+"""
+
+import json
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+
+STREAM_QUERY_PARAM = "stream"
+
+_TRUE = ("1", "true", "yes")
+
+
+def stream_requested(request) -> bool:
+    return request.query_params.get(STREAM_QUERY_PARAM, "").lower() in _TRUE
+
+
+def _chunk_size() -> int:
+    return getattr(settings, "STREAMING_CHUNK_SIZE", 2000)
+
+
+def _dumps(data) -> str:
+    separators = (",", ":") if api_settings.COMPACT_JSON else (", ", ": ")
+    return json.dumps(
+        data,
+        cls=JSONEncoder,
+        ensure_ascii=not api_settings.UNICODE_JSON,
+        allow_nan=not api_settings.STRICT_JSON,
+        separators=separators,
+    )
+
+
+def iter_json_array(serializer_class, queryset, chunk_size=None, **serializer_kwargs):
+    chunk_size = chunk_size or _chunk_size()
+    chunk = []
+
+    def encode(objects, first):
+        items = serializer_class(objects, many=True, **serializer_kwargs).data
+        text = ",".join(_dumps(item) for item in items)
+        return (text if first else "," + text).encode("utf-8")
+
+    yield b"["
+    first = True
+    for obj in queryset.iterator(chunk_size=chunk_size):
+        chunk.append(obj)
+        if len(chunk) >= chunk_size:
+            yield encode(chunk, first)
+            first = False
+            chunk = []
+    if chunk:
+        yield encode(chunk, first)
+    yield b"]"
+
+
+def streaming_json_response(serializer_class, queryset, chunk_size=None, **serializer_kwargs):
+    """A ``StreamingHttpResponse`` with ``queryset`` serialized as a JSON array.
+
+    ``serializer_kwargs`` (``context``, ``fields``, ...) are passed to every
+    per-chunk ``serializer_class(..., many=True)``.
+    """
+    return StreamingHttpResponse(
+        iter_json_array(serializer_class, queryset, chunk_size, **serializer_kwargs),
+        content_type="application/json",
+    )
@@ -0,0 +1,67 @@
+"""Change tracking for model fields without re-reading rows before save."""
+
+_MISSING = object()
+
+
+class FieldTrackerMixin:
+    """Remembers the values of ``tracked_fields`` as loaded from the database.
+
+    Values are captured in ``from_db`` and refreshed after every ``save`` and
+    ``refresh_from_db``, so ``previous_value`` answers "what is stored right
+    now" without a query.
+    Fields deferred at load time fall back to one query when asked for.
+    """
+
+    tracked_fields = ()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._capture_tracked()
+        return instance
+
+    def _capture_tracked(self, fields=None):
+        deferred = self.get_deferred_fields()
+        names = [name for name in self.tracked_fields if name not in deferred]
+        if fields is None:
+            self._loaded_values = {name: getattr(self, name) for name in names}
+            return
+        # refresh_from_db(fields=...) оновлює лише частину полів
+        refreshed = set()
+        for name in fields:
+            field = self._meta.get_field(name)
+            refreshed.update((field.name, field.attname))
+        loaded = getattr(self, "_loaded_values", {})
+        for name in names:
+            if name in refreshed:
+                loaded[name] = getattr(self, name)
+        self._loaded_values = loaded
+
+    def previous_value(self, name, default=None):
+        if self.pk is None:
+            return default
+        loaded = getattr(self, "_loaded_values", {})
+        value = loaded.get(name, _MISSING)
+        if value is _MISSING:
+            value = (
+                type(self)
+                ._base_manager.filter(pk=self.pk)
+                .values_list(name, flat=True)
+                .first()
+            )
+        return default if value is None else value
+
+    def has_changed(self, name):
+        return self.pk is None or self.previous_value(name) != getattr(self, name)
+
+    def cached_related(self, name):
+        """Related object if it is already loaded, never hitting the database."""
+        return self._meta.get_field(name).get_cached_value(self, None)
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        self._capture_tracked(fields)
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._capture_tracked()
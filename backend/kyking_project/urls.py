@@ -38,6 +38,7 @@ urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/", include("recipes_app.urls")),
     path("api/auth/", include("users_app.urls")),
+    path("api/ai/", include("ai_app.urls")),
     path(
         "swagger/",
         schema_view.with_ui("swagger", cache_timeout=0),
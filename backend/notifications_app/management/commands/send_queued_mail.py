@@ -0,0 +1,52 @@
+import logging
+import time
+
+from django.core.management.base import BaseCommand
+
+from notifications_app.outbox import send_pending
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Send queued outbound emails in batches over one SMTP connection."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=50)
+        parser.add_argument("--max-attempts", type=int, default=5)
+        parser.add_argument(
+            "--backoff", type=int, default=30, help="Base retry delay in seconds."
+        )
+        parser.add_argument(
+            "--loop", action="store_true", help="Keep polling instead of exiting."
+        )
+        parser.add_argument(
+            "--interval", type=float, default=5.0, help="Poll interval in seconds."
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            total_sent = total_failed = 0
+            while True:
+                try:
+                    sent, failed = send_pending(
+                        batch_size=options["batch_size"],
+                        max_attempts=options["max_attempts"],
+                        base_backoff=options["backoff"],
+                    )
+                except Exception:
+                    # напр. база недоступна: воркер у --loop має пережити збій
+                    if not options["loop"]:
+                        raise
+                    logger.exception("Outbox batch failed")
+                    break
+                total_sent += sent
+                total_failed += failed
+                if sent + failed < options["batch_size"]:
+                    break
+
+            if total_sent or total_failed:
+                self.stdout.write(f"Sent {total_sent}, failed {total_failed}.")
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
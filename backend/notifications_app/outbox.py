@@ -0,0 +1,136 @@
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from notifications_app.models import OutboundEmail
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue_mail(subject, message, recipient_list, from_email=None):
+    """Store a message in the outbox instead of talking to SMTP in the request.
+
+    The row is written in the caller's transaction, so the worker only sees
+    it once that transaction commits (and never if it rolls back).
+    """
+    email = OutboundEmail.objects.create(
+        subject=subject,
+        body=message,
+        from_email=from_email
+        or getattr(settings, "DEFAULT_FROM_EMAIL", "no-reply@kyking.local")
+        or "",
+        to=list(recipient_list),
+        next_attempt_at=timezone.now(),
+    )
+    logger.info("Email id=%s queued for %s", email.pk, ", ".join(email.to))
+    return email
+
+
+def backoff_delay(attempts, base_seconds=30, max_seconds=3600):
+    return timedelta(seconds=min(base_seconds * 2 ** (attempts - 1), max_seconds))
+
+
+def _record_failure(email, exc, max_attempts, base_backoff):
+    email.last_error = str(exc)
+    if email.attempts >= max_attempts:
+        email.status = OutboundEmail.Status.FAILED
+        logger.error(
+            "Email id=%s failed permanently after %s attempts",
+            email.pk,
+            email.attempts,
+        )
+    else:
+        email.next_attempt_at = timezone.now() + backoff_delay(
+            email.attempts, base_backoff
+        )
+        logger.warning(
+            "Email id=%s failed (attempt %s), retry at %s",
+            email.pk,
+            email.attempts,
+            email.next_attempt_at,
+        )
+
+
+def _claim(batch_size):
+    """Lock a batch of due messages and lease it to this worker.
+
+    The lease moves ``next_attempt_at`` forward, so other workers skip these
+    rows after the short claim transaction commits; SMTP I/O then runs
+    without holding row locks. A worker that dies mid-batch leaves its rows
+    to be retried when the lease expires (delivery is at-least-once).
+    """
+    lease = timedelta(seconds=getattr(settings, "OUTBOX_LEASE_SECONDS", 300))
+    with transaction.atomic():
+        batch = list(
+            OutboundEmail.objects.select_for_update(skip_locked=True)
+            .filter(
+                status=OutboundEmail.Status.PENDING,
+                next_attempt_at__lte=timezone.now(),
+            )
+            .order_by("next_attempt_at")[:batch_size]
+        )
+        if batch:
+            OutboundEmail.objects.filter(pk__in=[e.pk for e in batch]).update(
+                next_attempt_at=timezone.now() + lease
+            )
+    return batch
+
+
+def send_pending(batch_size=50, max_attempts=5, base_backoff=30):
+    """Send one batch of due messages over a single SMTP connection.
+
+    Returns ``(sent, failed)`` for the batch. If the connection cannot be
+    opened, every claimed message counts as a failed attempt and is backed
+    off, so an SMTP outage never crashes the worker.
+    """
+    sent = failed = 0
+    batch = _claim(batch_size)
+    if not batch:
+        return sent, failed
+
+    for email in batch:
+        email.attempts += 1
+
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+    except Exception as exc:
+        logger.warning("SMTP connection failed: %s", exc)
+        for email in batch:
+            _record_failure(email, exc, max_attempts, base_backoff)
+        failed = len(batch)
+    else:
+        try:
+            for email in batch:
+                message = EmailMessage(
+                    email.subject,
+                    email.body,
+                    email.from_email or None,
+                    email.to,
+                    connection=connection,
+                )
+                try:
+                    message.send()
+                except Exception as exc:
+                    failed += 1
+                    _record_failure(email, exc, max_attempts, base_backoff)
+                else:
+                    sent += 1
+                    email.status = OutboundEmail.Status.SENT
+                    email.sent_at = timezone.now()
+                    email.last_error = ""
+        finally:
+            try:
+                connection.close()
+            except Exception:
+                logger.warning("SMTP connection close failed", exc_info=True)
+
+    OutboundEmail.objects.bulk_update(
+        batch,
+        ["status", "attempts", "next_attempt_at", "last_error", "sent_at"],
+    )
+    return sent, failed
@@ -0,0 +1,93 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core import mail
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from notifications_app.models import OutboundEmail
+from notifications_app.outbox import enqueue_mail, send_pending
+
+LOCMEM_OPEN = "django.core.mail.backends.locmem.EmailBackend.open"
+
+
+class OutboxTests(TestCase):
+    def setUp(self):
+        for i in range(3):
+            enqueue_mail(f"Hello {i}", "Body", [f"user{i}@example.com"])
+
+    def make_due(self):
+        OutboundEmail.objects.update(next_attempt_at=timezone.now())
+
+    def test_sends_batch(self):
+        self.assertEqual(send_pending(), (3, 0))
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertFalse(
+            OutboundEmail.objects.exclude(status=OutboundEmail.Status.SENT).exists()
+        )
+
+    def test_message_failure_is_backed_off(self):
+        with mock.patch(
+            "django.core.mail.EmailMessage.send", side_effect=OSError("rejected")
+        ):
+            self.assertEqual(send_pending(), (0, 3))
+
+        for email in OutboundEmail.objects.all():
+            self.assertEqual(email.status, OutboundEmail.Status.PENDING)
+            self.assertEqual(email.attempts, 1)
+            self.assertEqual(email.last_error, "rejected")
+            self.assertGreater(email.next_attempt_at, timezone.now())
+        self.assertEqual(send_pending(), (0, 0))
+
+        self.make_due()
+        self.assertEqual(send_pending(), (3, 0))
+
+    def test_connection_failure_backs_off_whole_batch(self):
+        with mock.patch(LOCMEM_OPEN, side_effect=OSError("smtp down")):
+            self.assertEqual(send_pending(), (0, 3))
+
+        for email in OutboundEmail.objects.all():
+            self.assertEqual(email.status, OutboundEmail.Status.PENDING)
+            self.assertEqual(email.attempts, 1)
+            self.assertEqual(email.last_error, "smtp down")
+            self.assertGreater(
+                email.next_attempt_at, timezone.now() + timedelta(seconds=20)
+            )
+
+    def test_gives_up_after_max_attempts(self):
+        with mock.patch(LOCMEM_OPEN, side_effect=OSError("smtp down")):
+            for _ in range(2):
+                self.make_due()
+                send_pending(max_attempts=2)
+
+        self.assertEqual(
+            OutboundEmail.objects.filter(status=OutboundEmail.Status.FAILED).count(), 3
+        )
+
+    def test_claimed_batch_is_leased(self):
+        # після claim інший воркер цих рядків не бачить, навіть поки йде SMTP
+        def send(message):
+            self.assertEqual(send_pending(), (0, 0))
+            return 1
+
+        with mock.patch("django.core.mail.EmailMessage.send", send):
+            self.assertEqual(send_pending(), (3, 0))
+
+    def test_loop_survives_batch_errors(self):
+        calls = []
+
+        def flaky(**kwargs):
+            calls.append(kwargs)
+            if len(calls) == 1:
+                raise RuntimeError("database is down")
+            raise KeyboardInterrupt
+
+        with mock.patch(
+            "notifications_app.management.commands.send_queued_mail.send_pending",
+            flaky,
+        ), mock.patch("time.sleep"):
+            with self.assertRaises(KeyboardInterrupt):
+                call_command("send_queued_mail", "--loop", stdout=StringIO())
+        self.assertEqual(len(calls), 2)
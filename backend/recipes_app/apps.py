@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class RecipesAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'recipes_app'
+
+    def ready(self):
+        from kyking_project.http_cache import track
+
+        from .models import Category, Comment, Favorite, Recipe
+
+        for model in (Category, Recipe, Comment, Favorite):
+            track(model)
@@ -0,0 +1,301 @@
+"""Streaming import/export of the recipe catalog (JSON Lines or CSV).
+
+Rows are processed in batches: categories and authors of a batch are
+resolved with one query each, recipes are inserted with ``bulk_create`` and
+``recipes_imported`` lets derived data (the ingredient index) be built for
+the whole batch at once. ``Recipe.save`` is not called, so there is no
+per-row logging, re-fetch or email.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import logging
+import sys
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Q
+from django.utils.text import slugify
+
+from kyking_project.http_cache import bump_model_version
+from users_app.models import UserProfile
+
+from .models import Category, Recipe
+from .signals import recipes_imported
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+FIELDS = (
+    "title",
+    "difficulty",
+    "category",
+    "author",
+    "description",
+    "ingredients",
+    "steps",
+    "verified_by_chef",
+)
+EXPORT_FIELDS = ("id", *FIELDS, "created_at")
+MAX_REPORTED_ERRORS = 20
+# скільки авторів тримати в пам'яті між пачками
+MAX_CACHED_AUTHORS = 10000
+
+_DIFFICULTIES = {value for value, _ in Recipe.DIFFICULTY_CHOICES}
+_TRUE = {"1", "true", "yes", "y", "так"}
+_VERIFYING_ROLES = {UserProfile.Role.CHEF, UserProfile.Role.ADMIN}
+
+
+def peak_rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux віддає кілобайти, macOS - байти
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def throughput(rows: int, elapsed: float) -> str:
+    rate = rows / elapsed if elapsed else 0
+    peak = peak_rss_mb()
+    peak_text = f"{peak:.1f} MB" if peak is not None else "n/a"
+    return f"{rows} rows in {elapsed:.1f}s ({rate:.0f} rows/s), peak RSS {peak_text}."
+
+
+def detect_format(path: str, fmt: Optional[str]) -> str:
+    if fmt:
+        return fmt
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+
+def read_rows(stream, fmt: str) -> Iterator[Tuple[int, object]]:
+    """``(line number, row dict)`` pairs; a malformed JSON line yields its
+    error message instead of a dict."""
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+        return
+    for line_no, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_no, json.loads(line)
+        except ValueError as e:
+            yield line_no, f"invalid JSON: {e}"
+
+
+def write_rows(stream, fmt: str, rows: Iterable[dict]) -> int:
+    count = 0
+    if fmt == "csv":
+        writer = csv.DictWriter(stream, fieldnames=EXPORT_FIELDS)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+        return count
+    for row in rows:
+        # один write на рядок: OutputWrapper команди дописує "\n" сам,
+        # якщо рядок ним не закінчується
+        stream.write(json.dumps(row, ensure_ascii=False) + "\n")
+        count += 1
+    return count
+
+
+def export_rows(batch_size: int = 2000) -> Iterator[dict]:
+    qs = Recipe.objects.order_by("id").values_list(
+        "id",
+        "title",
+        "difficulty",
+        "category__name",
+        "author__username",
+        "description",
+        "ingredients",
+        "steps",
+        "verified_by_chef",
+        "created_at",
+    )
+    for values in qs.iterator(chunk_size=batch_size):
+        row = dict(zip(EXPORT_FIELDS, values))
+        row["created_at"] = row["created_at"].isoformat()
+        yield row
+
+
+@dataclass
+class ImportStats:
+    imported: int = 0
+    skipped: int = 0
+    categories_created: int = 0
+    errors: List[Tuple[int, str]] = field(default_factory=list)
+
+    def error(self, line_no: int, message: str) -> None:
+        self.skipped += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((line_no, message))
+
+
+def _text(row: dict, name: str) -> str:
+    value = row.get(name)
+    return "" if value is None else str(value).strip()
+
+
+def _clean(row: dict) -> Tuple[Optional[dict], Optional[str]]:
+    data = {name: _text(row, name) for name in FIELDS}
+    for name in ("title", "category", "ingredients", "steps"):
+        if not data[name]:
+            return None, f"{name} is required"
+    for name in ("title", "description", "ingredients", "steps"):
+        max_length = Recipe._meta.get_field(name).max_length
+        if len(data[name]) > max_length:
+            return None, f"{name} is longer than {max_length} characters"
+    data["difficulty"] = data["difficulty"] or "easy"
+    if data["difficulty"] not in _DIFFICULTIES:
+        return None, f"unknown difficulty {data['difficulty']!r}"
+
+    verified = row.get("verified_by_chef")
+    if isinstance(verified, bool) or verified is None:
+        data["verified_by_chef"] = verified
+    else:
+        value = str(verified).strip().lower()
+        data["verified_by_chef"] = (value in _TRUE) if value else None
+    return data, None
+
+
+class _Resolver:
+    """Category and author lookups shared by all batches of one import."""
+
+    def __init__(self, default_author: Optional[str], create_categories: bool):
+        self.default_author = default_author
+        self.create_categories = create_categories
+        self.categories: Dict[str, int] = {}
+        # username -> (id, role)
+        self.authors: Dict[str, Tuple[int, Optional[str]]] = {}
+        self.categories_created = 0
+
+    def resolve(self, batch: List[dict]) -> None:
+        self._categories({x["category"] for x in batch})
+        self._authors({x["author"] or self.default_author for x in batch} - {None})
+
+    def _categories(self, keys) -> None:
+        keys = keys - self.categories.keys()
+        if not keys:
+            return
+        self._load_categories(keys)
+        missing = keys - self.categories.keys()
+        if missing and self.create_categories:
+            Category.objects.bulk_create(
+                [
+                    Category(name=name, slug=slugify(name, allow_unicode=True))
+                    for name in sorted(missing)
+                ],
+                ignore_conflicts=True,
+            )
+            self._load_categories(missing)
+            self.categories_created += len(missing & self.categories.keys())
+
+    def _load_categories(self, keys) -> None:
+        for pk, name, slug in Category.objects.filter(
+            Q(name__in=keys) | Q(slug__in=keys)
+        ).values_list("id", "name", "slug"):
+            self.categories[name] = pk
+            self.categories[slug] = pk
+
+    def _authors(self, usernames) -> None:
+        if len(self.authors) > MAX_CACHED_AUTHORS:
+            self.authors.clear()
+        usernames = usernames - self.authors.keys()
+        if not usernames:
+            return
+        for pk, username, role in User.objects.filter(
+            username__in=usernames
+        ).values_list("id", "username", "profile__role"):
+            self.authors[username] = (pk, role)
+
+    def build(self, data: dict) -> Tuple[Optional[Recipe], Optional[str]]:
+        category_id = self.categories.get(data["category"])
+        if category_id is None:
+            return None, f"unknown category {data['category']!r}"
+        username = data["author"] or self.default_author
+        author = self.authors.get(username) if username else None
+        if author is None:
+            return None, f"unknown author {username!r}"
+
+        verified = data["verified_by_chef"]
+        if verified is None:
+            # як у Recipe.save: рецепти шефів і адмінів одразу підтверджені
+            verified = author[1] in _VERIFYING_ROLES
+        return (
+            Recipe(
+                author_id=author[0],
+                category_id=category_id,
+                title=data["title"],
+                difficulty=data["difficulty"],
+                description=data["description"],
+                ingredients=data["ingredients"],
+                steps=data["steps"],
+                verified_by_chef=verified,
+            ),
+            None,
+        )
+
+
+def import_rows(
+    rows: Iterable[Tuple[int, object]],
+    batch_size: int = 1000,
+    default_author: Optional[str] = None,
+    create_categories: bool = False,
+) -> ImportStats:
+    stats = ImportStats()
+    resolver = _Resolver(default_author, create_categories)
+    rows = iter(rows)
+
+    while True:
+        chunk = list(islice(rows, batch_size))
+        if not chunk:
+            break
+
+        cleaned = []
+        for line_no, row in chunk:
+            if not isinstance(row, dict):
+                stats.error(line_no, row if isinstance(row, str) else "not an object")
+                continue
+            data, error = _clean(row)
+            if error:
+                stats.error(line_no, error)
+            else:
+                cleaned.append((line_no, data))
+
+        resolver.resolve([data for _, data in cleaned])
+        recipes = []
+        for line_no, data in cleaned:
+            recipe, error = resolver.build(data)
+            if error:
+                stats.error(line_no, error)
+            else:
+                recipes.append(recipe)
+
+        with transaction.atomic():
+            created = Recipe.objects.bulk_create(recipes)
+            recipes_imported.send(sender=Recipe, recipes=created)
+        stats.imported += len(created)
+
+    stats.categories_created = resolver.categories_created
+    if stats.imported:
+        bump_model_version(Recipe)
+    if stats.categories_created:
+        bump_model_version(Category)
+    logger.info(
+        "Recipes imported: %s, skipped: %s, categories created: %s",
+        stats.imported,
+        stats.skipped,
+        stats.categories_created,
+    )
+    return stats
@@ -0,0 +1,38 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from recipes_app.catalog_io import detect_format, export_rows, throughput, write_rows
+
+
+class Command(BaseCommand):
+    help = "Stream every recipe to a JSON Lines or CSV file."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Output file, or - for stdout.")
+        parser.add_argument("--format", choices=["jsonl", "csv"])
+        parser.add_argument("--batch-size", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        fmt = detect_format(path, options["format"])
+        started = time.perf_counter()
+
+        try:
+            stream = (
+                self.stdout
+                if path == "-"
+                else open(path, "w", encoding="utf-8", newline="")
+            )
+        except OSError as e:
+            raise CommandError(str(e)) from e
+        try:
+            count = write_rows(stream, fmt, export_rows(options["batch_size"]))
+        finally:
+            if stream is not self.stdout:
+                stream.close()
+
+        elapsed = time.perf_counter() - started
+        # звіт - у stderr, щоб не змішувати його з даними при виводі в stdout
+        self.stderr.write(f"Exported {count} recipes.")
+        self.stderr.write(throughput(count, elapsed))
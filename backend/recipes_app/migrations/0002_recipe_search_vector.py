@@ -0,0 +1,60 @@
+# Generated by Django 5.2.7 on 2026-10-18 10:05
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import AddIndexConcurrently, TrigramExtension
+from django.db import migrations
+
+SEARCH_VECTOR_SQL = """
+    setweight(to_tsvector('simple', coalesce({row}title, '')), 'A') ||
+    setweight(to_tsvector('simple', coalesce({row}description, '')), 'B') ||
+    setweight(to_tsvector('simple', coalesce({row}ingredients, '')), 'C')
+"""
+
+CREATE_TRIGGER_SQL = f"""
+CREATE OR REPLACE FUNCTION recipes_app_recipe_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector := {SEARCH_VECTOR_SQL.format(row="NEW.")};
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER recipes_app_recipe_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, description, ingredients
+    ON recipes_app_recipe
+    FOR EACH ROW EXECUTE FUNCTION recipes_app_recipe_search_vector_update();
+
+UPDATE recipes_app_recipe SET search_vector = {SEARCH_VECTOR_SQL.format(row="")};
+"""
+
+DROP_TRIGGER_SQL = """
+DROP TRIGGER IF EXISTS recipes_app_recipe_search_vector_trigger ON recipes_app_recipe;
+DROP FUNCTION IF EXISTS recipes_app_recipe_search_vector_update();
+"""
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('recipes_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recipe',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunSQL(CREATE_TRIGGER_SQL, DROP_TRIGGER_SQL),
+        TrigramExtension(),
+        AddIndexConcurrently(
+            model_name='recipe',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='recipe_search_vector_gin'),
+        ),
+        AddIndexConcurrently(
+            model_name='recipe',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['title'], name='recipe_title_trgm', opclasses=['gin_trgm_ops']),
+        ),
+    ]
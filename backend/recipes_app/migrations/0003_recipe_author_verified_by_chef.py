@@ -0,0 +1,65 @@
+# Generated by Django 5.2.7 on 2026-10-18 10:40
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def assign_authors(apps, schema_editor):
+    # рецепти з часів без колонки author отримують першого суперкористувача
+    Recipe = apps.get_model('recipes_app', 'Recipe')
+    orphans = Recipe.objects.filter(author__isnull=True)
+    if not orphans.exists():
+        return
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+    owner = (
+        User.objects.filter(is_superuser=True).order_by('pk').first()
+        or User.objects.order_by('pk').first()
+    )
+    if owner is None:
+        raise RuntimeError(
+            'Recipes without an author and no user to assign them to: '
+            'create a superuser and run migrate again.'
+        )
+    orphans.update(author=owner)
+
+
+class Migration(migrations.Migration):
+    """Bring the migration state in line with the models.
+
+    ``author`` is added as nullable and filled in by ``assign_authors``;
+    0005 makes it required. Databases that already have these columns apply
+    this migration with ``--fake`` (see README).
+    """
+
+    dependencies = [
+        ('recipes_app', '0002_recipe_search_vector'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='comment',
+            options={'ordering': ['-is_chef_comment', '-created_at']},
+        ),
+        migrations.AlterModelOptions(
+            name='recipe',
+            options={'ordering': ['-created_at']},
+        ),
+        migrations.AddField(
+            model_name='recipe',
+            name='author',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='recipes', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.RunPython(assign_authors, migrations.RunPython.noop),
+        migrations.AddField(
+            model_name='recipe',
+            name='verified_by_chef',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AlterField(
+            model_name='comment',
+            name='is_chef_comment',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.7 on 2026-10-18 10:42
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('recipes_app', '0003_recipe_author_verified_by_chef'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='recipe',
+            index=models.Index(fields=['category', '-created_at'], name='recipe_category_created_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='recipe',
+            index=models.Index(fields=['difficulty', '-created_at'], name='recipe_difficulty_created_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='recipe',
+            index=models.Index(condition=models.Q(('verified_by_chef', True)), fields=['-created_at'], name='recipe_verified_created_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='comment',
+            index=models.Index(fields=['recipe', '-is_chef_comment', '-created_at'], name='comment_recipe_ordering_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='favorite',
+            index=models.Index(fields=['user', '-created_at'], name='favorite_user_created_idx'),
+        ),
+    ]
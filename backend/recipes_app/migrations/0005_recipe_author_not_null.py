@@ -0,0 +1,24 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """Make ``Recipe.author`` required once 0003 has filled it in.
+
+    A separate migration: PostgreSQL refuses ``ALTER TABLE`` in the same
+    transaction as the ``UPDATE`` of a deferred foreign key.
+    """
+
+    dependencies = [
+        ('recipes_app', '0004_access_path_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='recipe',
+            name='author',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recipes', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
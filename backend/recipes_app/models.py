@@ -1,10 +1,14 @@
 from django.db import models
 from django.contrib.auth.models import User
-from django.core.mail import send_mail
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.conf import settings
 
 import logging
 
+from kyking_project.tracking import FieldTrackerMixin
+from notifications_app.outbox import enqueue_mail
+
 logger = logging.getLogger(__name__)
 
 
@@ -16,7 +20,7 @@ class Category(models.Model):
         return self.name
 
 
-class Recipe(models.Model):
+class Recipe(FieldTrackerMixin, models.Model):
     DIFFICULTY_CHOICES = [
         ("easy", "Easy"),
         ("medium", "Medium"),
@@ -40,25 +44,39 @@ class Recipe(models.Model):
     steps = models.TextField(max_length=500, help_text="Describe cooking steps")
     created_at = models.DateTimeField(auto_now_add=True)
     verified_by_chef = models.BooleanField(default=False)
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    tracked_fields = ("verified_by_chef",)
 
     def __str__(self):
         return self.title
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(
+                fields=["category", "-created_at"], name="recipe_category_created_idx"
+            ),
+            models.Index(
+                fields=["difficulty", "-created_at"],
+                name="recipe_difficulty_created_idx",
+            ),
+            models.Index(
+                fields=["-created_at"],
+                name="recipe_verified_created_idx",
+                condition=models.Q(verified_by_chef=True),
+            ),
+            GinIndex(fields=["search_vector"], name="recipe_search_vector_gin"),
+            GinIndex(
+                fields=["title"], name="recipe_title_trgm", opclasses=["gin_trgm_ops"]
+            ),
+        ]
 
     def save(self, *args, **kwargs):
         from users_app.models import UserProfile
 
         is_new = self.pk is None
-        previous_verified = None
-
-        if not is_new:
-            try:
-                previous = Recipe.objects.get(pk=self.pk)
-                previous_verified = previous.verified_by_chef
-            except Recipe.DoesNotExist:
-                previous_verified = None
+        previous_verified = None if is_new else self.previous_value("verified_by_chef")
 
         if is_new and self.author_id:
             profile = getattr(self.author, "profile", None)
@@ -70,12 +88,14 @@ class Recipe(models.Model):
 
         super().save(*args, **kwargs)
 
+        author = self.cached_related("author")
+        author_label = getattr(author, "username", self.author_id)
         if is_new:
             logger.info(
                 "Recipe created: id=%s, title=%s, author=%s, verified_by_chef=%s",
                 self.pk,
                 self.title,
-                self.author.username,
+                author_label,
                 self.verified_by_chef,
             )
         else:
@@ -83,7 +103,7 @@ class Recipe(models.Model):
                 "Recipe updated: id=%s, title=%s, author=%s, verified_by_chef=%s",
                 self.pk,
                 self.title,
-                self.author.username,
+                author_label,
                 self.verified_by_chef,
             )
 
@@ -108,26 +128,25 @@ class Recipe(models.Model):
                     "With love, KyKing!"
                 )
 
-                send_mail(
+                enqueue_mail(
                     subject,
                     message,
-                    getattr(settings, "DEFAULT_FROM_EMAIL", "no-reply@kyking.local"),
                     [self.author.email],
-                    fail_silently=True,
+                    getattr(settings, "DEFAULT_FROM_EMAIL", "no-reply@kyking.local"),
                 )
 
                 logger.info(
-                    "Approval email sent to user=%s for recipe id=%s",
+                    "Approval email queued for user=%s for recipe id=%s",
                     self.author.username,
                     self.pk,
                 )
             except Exception:
                 logger.exception(
-                    "Failed to send approval email for recipe id=%s", self.pk
+                    "Failed to queue approval email for recipe id=%s", self.pk
                 )
 
 
-class Comment(models.Model):
+class Comment(FieldTrackerMixin, models.Model):
     recipe = models.ForeignKey(
         Recipe, on_delete=models.CASCADE, related_name="comments"
     )
@@ -141,6 +160,12 @@ class Comment(models.Model):
 
     class Meta:
         ordering = ["-is_chef_comment", "-created_at"]
+        indexes = [
+            models.Index(
+                fields=["recipe", "-is_chef_comment", "-created_at"],
+                name="comment_recipe_ordering_idx",
+            ),
+        ]
 
     def save(self, *args, **kwargs):
         from users_app.models import UserProfile
@@ -151,12 +176,14 @@ class Comment(models.Model):
         is_new = self.pk is None
         super().save(*args, **kwargs)
 
+        author = self.cached_related("author")
+        author_label = getattr(author, "username", self.author_id)
         if is_new:
             logger.info(
                 "Comment created id=%s on recipe=%s by user %s (chef=%s)",
                 self.pk,
                 self.recipe_id,
-                self.author.username,
+                author_label,
                 self.is_chef_comment,
             )
         else:
@@ -164,7 +191,7 @@ class Comment(models.Model):
                 "Comment updated id=%s on recipe=%s by user %s (chef=%s)",
                 self.pk,
                 self.recipe_id,
-                self.author.username,
+                author_label,
                 self.is_chef_comment,
             )
 
@@ -185,6 +212,11 @@ class Favorite(models.Model):
                 fields=["user", "recipe"], name="unique_user_recipe_favorite"
             )
         ]
+        indexes = [
+            models.Index(
+                fields=["user", "-created_at"], name="favorite_user_created_idx"
+            ),
+        ]
         ordering = ["-created_at"]
 
     def save(self, *args, **kwargs):
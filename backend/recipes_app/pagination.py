@@ -0,0 +1,21 @@
+from rest_framework.pagination import CursorPagination, LimitOffsetPagination
+
+
+class RecipeCursorPagination(CursorPagination):
+    ordering = ("-created_at", "-id")
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+
+class RecipeSearchPagination(LimitOffsetPagination):
+    """Pages of ranked search results.
+
+    ``CursorPagination`` would re-order by ``created_at`` and lose the
+    ``-rank, -similarity`` order from ``search_recipes``, so search results
+    are paged by offset instead; ``page_size`` works as for the plain list.
+    """
+
+    default_limit = RecipeCursorPagination.page_size
+    limit_query_param = RecipeCursorPagination.page_size_query_param
+    max_limit = RecipeCursorPagination.max_page_size
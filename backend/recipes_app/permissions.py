@@ -2,21 +2,32 @@ from rest_framework import permissions
 from users_app.models import UserProfile
 
 
+def user_role(user):
+    """Role of ``user``, taken from the authenticated user when it carries one.
+
+    ``ClaimsJWTAuthentication`` puts ``role`` on ``request.user``, so no
+    profile query is needed; a full ``User`` falls back to its profile.
+    """
+    if not user or not user.is_authenticated:
+        return None
+    role = getattr(user, "role", None)
+    if role is not None:
+        return role
+    profile = getattr(user, "profile", None)
+    return getattr(profile, "role", None)
+
+
 class RoleRequired(permissions.BasePermission):
 
     def __init__(self, allowed_roles):
         self.allowed_roles = allowed_roles
 
     def has_permission(self, request, view):
-        user = request.user
-        if not user or not user.is_authenticated:
-            return False
-
-        profile = getattr(user, "profile", None)
-        if not profile:
+        role = user_role(request.user)
+        if not role:
             return False
 
-        return profile.role in self.allowed_roles
+        return role in self.allowed_roles
 
 
 class IsAuthorOrAdmin(permissions.BasePermission):
@@ -25,21 +36,19 @@ class IsAuthorOrAdmin(permissions.BasePermission):
         if not request.user.is_authenticated:
             return False
 
-        profile = getattr(request.user, "profile", None)
-        if profile and profile.role == UserProfile.Role.ADMIN:
+        if user_role(request.user) == UserProfile.Role.ADMIN:
             return True
 
-        return obj.author == request.user
+        return obj.author_id == request.user.id
 
 
 class IsFavoriteOwnerOrAdmin(permissions.BasePermission):
 
     def has_object_permission(self, request, view, obj):
-        profile = getattr(request.user, "profile", None)
-        if profile and profile.role == UserProfile.Role.ADMIN:
+        if user_role(request.user) == UserProfile.Role.ADMIN:
             return True
 
-        return obj.user == request.user
+        return obj.user_id == request.user.id
 
 
 class IsChefOrAdmin(permissions.BasePermission):
@@ -48,8 +57,7 @@ class IsChefOrAdmin(permissions.BasePermission):
         if not request.user.is_authenticated:
             return False
 
-        profile = getattr(request.user, "profile", None)
-        return profile and profile.role in [
+        return user_role(request.user) in [
             UserProfile.Role.CHEF,
             UserProfile.Role.ADMIN,
         ]
@@ -0,0 +1,20 @@
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramSimilarity
+from django.db import connection
+from django.db.models import F, Q
+
+SEARCH_CONFIG = "simple"
+
+
+def search_recipes(qs, text):
+    if connection.vendor != "postgresql":
+        return qs.filter(Q(title__icontains=text) | Q(description__icontains=text))
+
+    query = SearchQuery(text, config=SEARCH_CONFIG, search_type="websearch")
+    return (
+        qs.filter(Q(search_vector=query) | Q(title__trigram_similar=text))
+        .annotate(
+            rank=SearchRank(F("search_vector"), query),
+            similarity=TrigramSimilarity("title", text),
+        )
+        .order_by("-rank", "-similarity", "-created_at")
+    )
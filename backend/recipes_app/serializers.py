@@ -1,5 +1,7 @@
+from django.db.models import Exists, OuterRef
 from rest_framework import serializers
 from recipes_app.models import Category, Comment, Favorite, Recipe
+from users_app.authentication import full_user
 
 
 class CategorySerializer(serializers.ModelSerializer):
@@ -32,17 +34,38 @@ class RecipeSerializer(serializers.ModelSerializer):
         )
         read_only_fields = ("author", "verified_by_chef", "created_at")
 
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop("fields", None)
+        super().__init__(*args, **kwargs)
+        if fields:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+    @staticmethod
+    def with_favorites(queryset, user):
+        if not user or not user.is_authenticated:
+            return queryset
+        return queryset.annotate(
+            user_favorited=Exists(
+                Favorite.objects.filter(recipe=OuterRef("pk"), user_id=user.id)
+            )
+        )
+
     def get_is_favorite(self, obj):
         request = self.context.get("request")
         user = getattr(request, "user", None)
         if not user or not user.is_authenticated:
             return False
-        return obj.favorited_by.filter(user=user).exists()
+        annotated = getattr(obj, "user_favorited", None)
+        if annotated is not None:
+            return annotated
+        return obj.favorited_by.filter(user_id=user.id).exists()
 
     def create(self, validated_data):
         request = self.context.get("request")
         if request and request.user.is_authenticated:
-            validated_data["author"] = request.user
+            # Recipe.save перевіряє роль автора - профіль потрібен одразу
+            validated_data["author"] = full_user(request.user)
         return super().create(validated_data)
 
 
@@ -75,5 +98,5 @@ class FavoriteSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         request = self.context.get("request")
         if request and request.user.is_authenticated:
-            validated_data["user"] = request.user
+            validated_data["user_id"] = request.user.id
         return super().create(validated_data)
@@ -0,0 +1,5 @@
+from django.dispatch import Signal
+
+# Рецепти, вставлені через bulk_create (post_save для них не надсилається).
+# Аргумент ``recipes`` - список збережених Recipe з pk.
+recipes_imported = Signal()
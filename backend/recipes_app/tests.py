@@ -1,3 +1,411 @@
+import csv
+import io
+import json
+from unittest import skipUnless
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from recipes_app.models import Category, Comment, Favorite, Recipe
+from users_app.models import UserProfile
+
+
+class RecipeAPITestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = self.make_user("cook", UserProfile.Role.USER)
+        self.category = Category.objects.create(name="Супи", slug="soups")
+        self.client = APIClient()
+
+    def make_user(self, username, role):
+        user = User.objects.create_user(username, f"{username}@example.com", "pw")
+        UserProfile.objects.create(user=user, role=role)
+        return user
+
+    def recipe(self, title, author=None, **kwargs):
+        kwargs.setdefault("ingredients", "вода, сіль")
+        kwargs.setdefault("steps", "Зварити")
+        return Recipe.objects.create(
+            author=author or self.user, category=self.category, title=title, **kwargs
+        )
+
+    def login(self, user=None):
+        token = self.client.post(
+            reverse("token-obtain"),
+            {"username": (user or self.user).username, "password": "pw"},
+            format="json",
+        ).data["access"]
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+
+class SearchVectorColumnTests(RecipeAPITestCase):
+    def test_reads_do_not_select_search_vector(self):
+        recipe = self.recipe("Борщ")
+        Favorite.objects.create(user=self.user, recipe=recipe)
+        self.login()
+        urls = [
+            reverse("recipe-list-create"),
+            reverse("recipe-list-create") + "?page_size=5",
+            reverse("recipe-list-create") + "?stream=1",
+            reverse("recipe-detail", args=[recipe.pk]),
+            reverse("favorite-list-create"),
+            reverse("comment-list-create", args=[recipe.pk]),
+        ]
+        for url in urls:
+            with self.subTest(url=url), CaptureQueriesContext(connection) as ctx:
+                response = self.client.get(url)
+                if response.streaming:
+                    b"".join(response.streaming_content)
+                self.assertEqual(response.status_code, 200)
+            for query in ctx.captured_queries:
+                self.assertNotIn("search_vector", query["sql"])
+
+
+class RecipeListPaginationTests(RecipeAPITestCase):
+    def setUp(self):
+        super().setUp()
+        for i in range(25):
+            self.recipe(f"Рецепт {i}")
+        self.url = reverse("recipe-list-create")
+
+    def test_list_is_paginated_by_default(self):
+        seen = []
+        page = self.client.get(self.url).data
+        self.assertEqual(len(page["results"]), 20)
+        while True:
+            seen.extend(x["id"] for x in page["results"])
+            if not page["next"]:
+                break
+            page = self.client.get(page["next"]).data
+
+        self.assertEqual(len(seen), 25)
+        self.assertEqual(len(set(seen)), 25)
+
+    def test_stream_returns_full_list(self):
+        response = self.client.get(self.url, {"stream": 1, "fields": "id"})
+
+        rows = json.loads(b"".join(response.streaming_content))
+        self.assertEqual(len(rows), 25)
+        self.assertEqual(set(rows[0]), {"id"})
+
+    def test_fields(self):
+        response = self.client.get(self.url, {"fields": "id, title"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.data["results"][0]), {"id", "title"})
+
+    def test_unknown_fields_are_rejected(self):
+        for value in ("nope", "id,nope,author__password"):
+            with self.subTest(fields=value):
+                response = self.client.get(self.url, {"fields": value})
+                self.assertEqual(response.status_code, 400)
+                self.assertIn("nope", response.data["fields"][0])
+
+
+class RecipeListQueryCountTests(RecipeAPITestCase):
+    def setUp(self):
+        super().setUp()
+        chef = self.make_user("chef", UserProfile.Role.CHEF)
+        self.favorites = set()
+        for i in range(30):
+            recipe = self.recipe(f"Рецепт {i}", author=chef if i % 2 else None)
+            if i % 3 == 0:
+                Favorite.objects.create(user=self.user, recipe=recipe)
+                self.favorites.add(recipe.id)
+        self.login()
+        # перший запит кешує роль користувача
+        self.client.get(reverse("recipe-list-create"), {"page_size": 1})
+
+    def test_one_query_per_page(self):
+        url = reverse("recipe-list-create")
+        for page_size in (1, 5, 20, 30):
+            with self.subTest(page_size=page_size), self.assertNumQueries(1):
+                response = self.client.get(url, {"page_size": page_size})
+            self.assertEqual(len(response.data["results"]), page_size)
+            for row in response.data["results"]:
+                self.assertEqual(row["is_favorite"], row["id"] in self.favorites)
+
+    def test_one_query_for_next_page(self):
+        url = reverse("recipe-list-create")
+        first = self.client.get(url, {"page_size": 5}).data
+        with self.assertNumQueries(1):
+            response = self.client.get(first["next"])
+        self.assertEqual(len(response.data["results"]), 5)
+
+
+class WriteQueryCountTests(RecipeAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.chef = self.make_user("chef", UserProfile.Role.CHEF)
+        self.user.email = "cook@example.com"
+        self.user.save()
+
+    def warm_up(self, user=None):
+        # перший запит після входу кешує роль користувача
+        self.login(user)
+        self.client.get(reverse("recipe-list-create"), {"page_size": 1})
+
+    def test_create_recipe(self):
+        self.warm_up()
+        # категорія, автор, INSERT, індекс інгредієнтів, is_favorite у відповіді
+        with self.assertNumQueries(5):
+            response = self.client.post(
+                reverse("recipe-list-create"),
+                {
+                    "title": "Борщ",
+                    "category": self.category.id,
+                    "ingredients": "буряк, капуста",
+                    "steps": "Зварити",
+                },
+                format="json",
+            )
+        self.assertEqual(response.status_code, 201)
+
+    def test_verify_recipe(self):
+        recipe = self.recipe("Борщ")
+        self.warm_up(self.chef)
+        # рецепт з автором, UPDATE, лист в outbox, is_favorite у відповіді
+        with self.assertNumQueries(4):
+            response = self.client.post(reverse("recipe-verify", args=[recipe.pk]))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data["verified_by_chef"])
+
+    def test_create_comment(self):
+        recipe = self.recipe("Борщ")
+        self.warm_up(self.chef)
+        # рецепт, автор з профілем, INSERT
+        with self.assertNumQueries(3):
+            response = self.client.post(
+                reverse("comment-list-create", args=[recipe.pk]),
+                {"text": "Смачно"},
+                format="json",
+            )
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(Comment.objects.get().is_chef_comment)
+
+
+class FieldTrackingTests(RecipeAPITestCase):
+    def test_refresh_from_db_recaptures_values(self):
+        recipe = self.recipe("Борщ")
+        Recipe.objects.filter(pk=recipe.pk).update(verified_by_chef=True)
+
+        recipe.refresh_from_db()
+
+        self.assertIs(recipe.previous_value("verified_by_chef"), True)
+        self.assertFalse(recipe.has_changed("verified_by_chef"))
+
+    def test_partial_refresh_keeps_other_values(self):
+        recipe = self.recipe("Борщ")
+        recipe.verified_by_chef = True
+
+        recipe.refresh_from_db(fields=["title"])
+
+        self.assertIs(recipe.previous_value("verified_by_chef"), False)
+        self.assertTrue(recipe.has_changed("verified_by_chef"))
+
+    def test_comment_update_follows_author_role(self):
+        comment = Comment.objects.create(
+            recipe=self.recipe("Борщ"), author=self.user, text="Смачно"
+        )
+        self.user.profile.role = UserProfile.Role.CHEF
+        self.user.profile.save()
+
+        comment.text = "Дуже смачно"
+        comment.save()
+
+        self.assertTrue(comment.is_chef_comment)
+
+
+class ConditionalGetTests(RecipeAPITestCase):
+    def test_category_list(self):
+        Category.objects.create(name="Десерти", slug="desserts")
+        url = reverse("category-list-create")
+
+        with self.assertNumQueries(1):
+            first = self.client.get(url)
+        self.assertEqual(first.status_code, 200)
+        # тіло вже в кеші
+        with self.assertNumQueries(0):
+            cached = self.client.get(url)
+        self.assertEqual(cached.content, first.content)
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(response.status_code, 304)
+
+    def test_unknown_params_skip_body_cache(self):
+        url = reverse("category-list-create")
+        first = self.client.get(url)
+
+        for junk in ("a", "b"):
+            with self.assertNumQueries(1):
+                response = self.client.get(url, {"junk": junk})
+            self.assertEqual(response.content, first.content)
+        # невідомі параметри не входять в ETag
+        self.assertEqual(response["ETag"], first["ETag"])
+        with self.assertNumQueries(0):
+            self.client.get(url)
+
+    def test_recipe_list_for_authenticated_user(self):
+        self.recipe("Борщ")
+        self.login()
+        url = reverse("recipe-list-create")
+        self.client.get(url, {"page_size": 1})
+
+        with self.assertNumQueries(1):
+            first = self.client.get(url, {"page_size": 5})
+        with self.assertNumQueries(0):
+            response = self.client.get(
+                url, {"page_size": 5}, HTTP_IF_NONE_MATCH=first["ETag"]
+            )
+        self.assertEqual(response.status_code, 304)
+
+    def test_write_changes_etag(self):
+        url = reverse("category-list-create")
+        etag = self.client.get(url)["ETag"]
+
+        Category.objects.create(name="Десерти", slug="desserts")
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_evicted_version_changes_etag(self):
+        url = reverse("category-list-create")
+        etag = self.client.get(url)["ETag"]
+
+        cache.clear()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+
+class ExportRecipesTests(RecipeAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.recipe("Борщ", ingredients="буряк, капуста")
+        self.recipe("Суп", description='рядок з "лапками"')
+
+    def export(self, fmt):
+        out, err = io.StringIO(), io.StringIO()
+        call_command("export_recipes", "-", format=fmt, stdout=out, stderr=err)
+        self.assertIn("Exported 2 recipes.", err.getvalue())
+        return out.getvalue()
+
+    def test_jsonl_to_stdout(self):
+        lines = self.export("jsonl").splitlines()
+
+        self.assertEqual([json.loads(x)["title"] for x in lines], ["Борщ", "Суп"])
+
+    def test_csv_to_stdout(self):
+        rows = list(csv.DictReader(io.StringIO(self.export("csv"))))
+
+        self.assertEqual([x["title"] for x in rows], ["Борщ", "Суп"])
+        self.assertEqual(rows[1]["description"], 'рядок з "лапками"')
+
+
+@skipUnless(connection.vendor == "postgresql", "ranked search needs PostgreSQL")
+class RankedSearchTests(RecipeAPITestCase):
+    def test_paginated_search_keeps_rank_order(self):
+        best = self.recipe("Борщ", description="борщ борщ", ingredients="борщ")
+        self.recipe("Суп", description="не борщ")
+        self.recipe("Борщ зелений")
+        url = reverse("recipe-list-create")
+
+        query = {"search": "борщ"}
+
+        full = self.client.get(url, {**query, "page_size": 100}).data["results"]
+        pages = []
+        page = self.client.get(url, {**query, "page_size": 2}).data
+        while True:
+            pages.extend(x["id"] for x in page["results"])
+            if not page["next"]:
+                break
+            page = self.client.get(page["next"]).data
+
+        self.assertEqual(full[0]["id"], best.id)
+        self.assertEqual(pages, [x["id"] for x in full])
+
+
+@skipUnless(connection.vendor == "postgresql", "query plans need PostgreSQL")
+class AccessPathIndexTests(RecipeAPITestCase):
+    """The list, filter, comment and favorite queries use the 0004 indexes."""
+
+    @classmethod
+    def setUpTestData(cls):
+        users = User.objects.bulk_create(
+            User(username=f"reader{i}", email=f"reader{i}@example.com")
+            for i in range(20)
+        )
+        categories = Category.objects.bulk_create(
+            Category(name=f"Категорія {i}", slug=f"category-{i}") for i in range(20)
+        )
+        difficulties = [x for x, _ in Recipe.DIFFICULTY_CHOICES]
+        recipes = Recipe.objects.bulk_create(
+            Recipe(
+                author=users[i % len(users)],
+                category=categories[i % len(categories)],
+                difficulty=difficulties[i % len(difficulties)],
+                title=f"Рецепт {i}",
+                ingredients="буряк, капуста",
+                steps="Зварити",
+                verified_by_chef=i % 10 == 0,
+            )
+            for i in range(10000)
+        )
+        Comment.objects.bulk_create(
+            Comment(recipe=recipes[i % 500], author=users[i % len(users)], text="так")
+            for i in range(10000)
+        )
+        Favorite.objects.bulk_create(
+            Favorite(user=user, recipe=recipe)
+            for user in users
+            for recipe in recipes[:500]
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "ANALYZE recipes_app_recipe, recipes_app_comment, recipes_app_favorite"
+            )
+        cls.reader = users[0]
+        cls.reader_category = categories[0]
+        cls.commented = recipes[0]
+
+    def assert_uses_index(self, queryset, index):
+        plan = queryset.explain()
+        self.assertIn(index, plan)
+        self.assertNotIn("Seq Scan", plan)
+
+    def test_verified_list(self):
+        self.assert_uses_index(
+            Recipe.objects.filter(verified_by_chef=True).only("id")[:20],
+            "recipe_verified_created_idx",
+        )
+
+    def test_category_filter(self):
+        self.assert_uses_index(
+            Recipe.objects.filter(category=self.reader_category).only("id")[:20],
+            "recipe_category_created_idx",
+        )
+
+    def test_difficulty_filter(self):
+        self.assert_uses_index(
+            Recipe.objects.filter(difficulty="hard").only("id")[:20],
+            "recipe_difficulty_created_idx",
+        )
+
+    def test_recipe_comments(self):
+        self.assert_uses_index(
+            Comment.objects.filter(recipe=self.commented).only("id")[:20],
+            "comment_recipe_ordering_idx",
+        )
 
-# Create your tests here.
+    def test_user_favorites(self):
+        self.assert_uses_index(
+            Favorite.objects.filter(user=self.reader).only("id")[:20],
+            "favorite_user_created_idx",
+        )
@@ -1,5 +1,6 @@
 import logging
 
+from django.contrib.auth.models import User
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
@@ -16,8 +17,14 @@ from recipes_app.serializers import (
     FavoriteSerializer,
 )
 
+from kyking_project.http_cache import conditional_get
+from kyking_project.streaming import stream_requested, streaming_json_response
+from users_app.authentication import full_user
 from users_app.models import UserProfile
+from recipes_app.pagination import RecipeCursorPagination, RecipeSearchPagination
+from recipes_app.search import search_recipes
 from recipes_app.permissions import (
+    user_role,
     RoleRequired,
     IsAuthorOrAdmin,
     IsFavoriteOwnerOrAdmin,
@@ -34,6 +41,7 @@ class CategoryListCreate(APIView):
             return []
         return [RoleRequired(["ADMIN"])]
 
+    @conditional_get(Category, cache_body=True, params=())
     def get(self, request):
         categories = Category.objects.all().order_by("name")
         serializer = CategorySerializer(categories, many=True)
@@ -113,9 +121,9 @@ class RecipeListCreate(APIView):
             return []
         return [IsAuthenticated()]
 
+    @conditional_get(Recipe, Category, User, Favorite, per_user=True)
     def get(self, request):
-        
-        qs = Recipe.objects.select_related("author", "category").all()
+        qs = Recipe.objects.select_related("author", "category").defer("search_vector")
 
         category_slug = request.query_params.get("category")
         difficulty = request.query_params.get("difficulty")
@@ -136,12 +144,39 @@ class RecipeListCreate(APIView):
                 qs = qs.filter(verified_by_chef=False)
 
         if search:
-            qs = qs.filter(title__icontains=search) | qs.filter(
-                description__icontains=search
+            qs = search_recipes(qs, search)
+
+        qs = RecipeSerializer.with_favorites(qs, request.user)
+
+        fields = [
+            f.strip()
+            for f in request.query_params.get("fields", "").split(",")
+            if f.strip()
+        ]
+        unknown = set(fields) - set(RecipeSerializer.Meta.fields)
+        if unknown:
+            return Response(
+                {"fields": [f"Unknown fields: {', '.join(sorted(unknown))}"]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if fields:
+            skipped = {"description", "ingredients", "steps"} - set(fields)
+            if skipped:
+                qs = qs.defer(*skipped)
+
+        # повний список без сторінок - лише потоком
+        if stream_requested(request):
+            return streaming_json_response(
+                RecipeSerializer, qs, fields=fields, context={"request": request}
             )
 
-        serializer = RecipeSerializer(qs, many=True, context={"request": request})
-        return Response(serializer.data)
+        # ранжований пошук не можна гортати курсором по created_at
+        paginator = RecipeSearchPagination() if search else RecipeCursorPagination()
+        page = paginator.paginate_queryset(qs, request, view=self)
+        serializer = RecipeSerializer(
+            page, many=True, fields=fields, context={"request": request}
+        )
+        return paginator.get_paginated_response(serializer.data)
 
     def post(self, request):
         serializer = RecipeSerializer(
@@ -169,10 +204,15 @@ class RecipeDetail(APIView):
 
     def get_object(self, pk):
         try:
-            return Recipe.objects.select_related("author", "category").get(pk=pk)
+            return (
+                Recipe.objects.select_related("author", "category")
+                .defer("search_vector")
+                .get(pk=pk)
+            )
         except Recipe.DoesNotExist:
             return None
 
+    @conditional_get(Recipe, Category, User, Favorite, per_user=True)
     def get(self, request, pk):
         recipe = self.get_object(pk)
         if not recipe:
@@ -230,7 +270,11 @@ class RecipeVerify(APIView):
 
     def post(self, request, pk):
         try:
-            recipe = Recipe.objects.get(pk=pk)
+            recipe = (
+                Recipe.objects.select_related("author", "category")
+                .defer("search_vector")
+                .get(pk=pk)
+            )
         except Recipe.DoesNotExist:
             return Response(
                 {"detail": "Recipe not found"}, status=status.HTTP_404_NOT_FOUND
@@ -239,7 +283,7 @@ class RecipeVerify(APIView):
         self.check_permissions(request)
 
         recipe.verified_by_chef = True
-        recipe.save()
+        recipe.save(update_fields=["verified_by_chef"])
 
         logger.info(
             "Recipe verified by chef id=%s title=%s user=%s",
@@ -259,9 +303,12 @@ class CommentListCreate(APIView):
             return []
         return [IsAuthenticated()]
 
+    @conditional_get(Comment, User)
     def get(self, request, recipe_id):
-        comments = Comment.objects.filter(recipe_id=recipe_id).select_related(
-            "author", "recipe"
+        comments = (
+            Comment.objects.filter(recipe_id=recipe_id)
+            .select_related("author", "recipe")
+            .defer("recipe__search_vector")
         )
         serializer = CommentSerializer(comments, many=True)
         return Response(serializer.data)
@@ -272,7 +319,7 @@ class CommentListCreate(APIView):
 
         serializer = CommentSerializer(data=data)
         if serializer.is_valid():
-            comment = serializer.save(author=request.user)
+            comment = serializer.save(author=full_user(request.user))
             logger.info(
                 "Comment created: id=%s recipe=%s user=%s",
                 comment.id,
@@ -318,17 +365,21 @@ class FavoriteListCreate(APIView):
 
     def get(self, request):
 
-        profile = getattr(request.user, "profile", None)
-        qs = Favorite.objects.select_related("recipe", "user")
+        qs = Favorite.objects.select_related("recipe", "user").defer(
+            "recipe__search_vector"
+        )
 
-        if profile and profile.role == UserProfile.Role.ADMIN:
+        if user_role(request.user) == UserProfile.Role.ADMIN:
             user_id = request.query_params.get("user")
             if user_id:
                 qs = qs.filter(user_id=user_id)
             else:
-                qs = qs.filter(user=request.user)
+                qs = qs.filter(user_id=request.user.id)
         else:
-            qs = qs.filter(user=request.user)
+            qs = qs.filter(user_id=request.user.id)
+
+        if stream_requested(request):
+            return streaming_json_response(FavoriteSerializer, qs)
 
         serializer = FavoriteSerializer(qs, many=True)
         return Response(serializer.data)
@@ -342,7 +393,7 @@ class FavoriteListCreate(APIView):
             )
 
         favorite, created = Favorite.objects.get_or_create(
-            user=request.user,
+            user_id=request.user.id,
             recipe_id=recipe_id,
         )
 
@@ -368,7 +419,7 @@ class FavoriteDelete(APIView):
     def delete(self, request, recipe_id):
         try:
             favorite = Favorite.objects.get(
-                user=request.user,
+                user_id=request.user.id,
                 recipe_id=recipe_id,
             )
         except Favorite.DoesNotExist:
@@ -4,3 +4,16 @@ from django.apps import AppConfig
 class UsersAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'users_app'
+
+    def ready(self):
+        from django.contrib.auth.models import User
+
+        from kyking_project.http_cache import track
+
+        from .models import UserProfile
+
+        # last_login змінюється при кожному вході, але у відповідях не видно
+        track(User, ignore_fields=("last_login",))
+        track(UserProfile)
+
+        from . import signals  # noqa: F401
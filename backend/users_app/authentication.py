@@ -0,0 +1,152 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+from kyking_project import metrics
+
+# user_id -> (expires_at, is_active, role), від найдавніше використаних
+_roles = OrderedDict()
+_lock = threading.Lock()
+
+
+def _role_cache_ttl() -> float:
+    return getattr(settings, "ROLE_CACHE_TTL", 30)
+
+
+def _role_cache_size() -> int:
+    return getattr(settings, "ROLE_CACHE_SIZE", 10000)
+
+
+def cached_role(user_id):
+    """``(is_active, role)`` for ``user_id``; at most one query per TTL.
+
+    Returns ``None`` if the user does not exist. A role change reaches every
+    process within ``ROLE_CACHE_TTL`` seconds; the process that saved it sees
+    it at once (see ``forget_role``). At most ``ROLE_CACHE_SIZE`` users are
+    kept; the least recently used one is dropped first.
+    """
+    now = time.monotonic()
+    with _lock:
+        entry = _roles.get(user_id)
+        if entry is not None:
+            if entry[0] > now:
+                _roles.move_to_end(user_id)
+                return entry[1], entry[2]
+            del _roles[user_id]
+
+    row = (
+        User.objects.filter(pk=user_id)
+        .values_list("is_active", "profile__role")
+        .first()
+    )
+    if row is None:
+        return None
+    with _lock:
+        _roles[user_id] = (now + _role_cache_ttl(), row[0], row[1])
+        _roles.move_to_end(user_id)
+        while len(_roles) > _role_cache_size():
+            _roles.popitem(last=False)
+    return row
+
+
+def forget_role(user_id) -> None:
+    with _lock:
+        _roles.pop(user_id, None)
+
+
+def full_user(user):
+    """The ``User`` model instance (with profile) behind ``request.user``."""
+    if isinstance(user, User):
+        return user
+    return user.get_full_user()
+
+
+class ClaimsUser(TokenUser):
+    """Authenticated user built from token claims plus the role.
+
+    Answers ``id``, ``username`` and ``role`` without the database. Any other
+    attribute (``email``, ``profile``, ...) loads the real ``User`` once, on
+    first access; every such load is counted per endpoint in
+    ``lazy_user_load:<view name>``.
+    """
+
+    # неактивних відсіює автентифікація (або час життя токена)
+    is_active = True
+
+    def __init__(self, token, role, endpoint=None):
+        super().__init__(token)
+        self.role = role
+        self.endpoint = endpoint
+        self._full_user = None
+
+    def get_full_user(self):
+        if self._full_user is None:
+            metrics.incr(f"lazy_user_load:{self.endpoint or 'unknown'}")
+            self._full_user = User.objects.select_related("profile").get(pk=self.id)
+        return self._full_user
+
+    def __getattr__(self, attr):
+        if attr.startswith("_"):
+            raise AttributeError(attr)
+        return getattr(self.get_full_user(), attr)
+
+    def __str__(self):
+        return self.username
+
+    @cached_property
+    def id(self):
+        return int(self.token[api_settings.USER_ID_CLAIM])
+
+    def __eq__(self, other):
+        if isinstance(other, (TokenUser, User)):
+            return self.id == other.pk
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.id)
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """JWT authentication that does not load the ``User`` row per request.
+
+    By default the role and ``is_active`` come from ``cached_role``. With
+    ``AUTH_STATELESS_USER`` enabled the ``role`` claim is trusted as is and
+    no query runs at all; role changes and deactivation then take effect
+    when the access token expires.
+    """
+
+    def authenticate(self, request):
+        result = super().authenticate(request)
+        if result is not None:
+            match = getattr(request, "resolver_match", None)
+            result[0].endpoint = getattr(match, "view_name", None) or request.path
+        return result
+
+    def get_user(self, validated_token):
+        try:
+            user_id = int(validated_token[api_settings.USER_ID_CLAIM])
+        except (KeyError, TypeError, ValueError) as e:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification")
+            ) from e
+
+        if getattr(settings, "AUTH_STATELESS_USER", False):
+            return ClaimsUser(validated_token, validated_token.get("role"))
+
+        state = cached_role(user_id)
+        if state is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        is_active, role = state
+        if api_settings.CHECK_USER_IS_ACTIVE and not is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        return ClaimsUser(validated_token, role)
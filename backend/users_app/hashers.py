@@ -0,0 +1,18 @@
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+
+class TunablePBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """PBKDF2-SHA256 with the iteration count taken from settings.
+
+    Keeps the ``pbkdf2_sha256`` algorithm name, so existing hashes stay valid.
+    A stored hash with a different iteration count is re-encoded with
+    ``PASSWORD_PBKDF2_ITERATIONS`` on the next successful login
+    (``must_update`` -> ``check_password`` setter).
+    """
+
+    @property
+    def iterations(self):
+        return getattr(
+            settings, "PASSWORD_PBKDF2_ITERATIONS", PBKDF2PasswordHasher.iterations
+        )
@@ -2,10 +2,12 @@ from django.db import models
 from django.contrib.auth.models import User
 import logging
 
+from kyking_project.tracking import FieldTrackerMixin
+
 logger = logging.getLogger(__name__)
 
 
-class UserProfile(models.Model):
+class UserProfile(FieldTrackerMixin, models.Model):
     class Role(models.TextChoices):
         USER = "USER", "User"
         CHEF = "CHEF", "Chef"
@@ -24,23 +26,26 @@ class UserProfile(models.Model):
     bio = models.TextField(blank=True)
     avatar_url = models.URLField(blank=True)
 
+    tracked_fields = ("role",)
+
     def __str__(self):
         return f"{self.user.username} ({self.role})"
 
     def save(self, *args, **kwargs):
+        username = getattr(self.cached_related("user"), "username", self.user_id)
         if self.pk:
-            old = UserProfile.objects.get(pk=self.pk)
-            if old.role != self.role:
+            old_role = self.previous_value("role")
+            if old_role != self.role:
                 logger.info(
                     "Role for user %s changed from %s to %s",
-                    self.user.username,
-                    old.role,
+                    username,
+                    old_role,
                     self.role,
                 )
         else:
             logger.info(
                 "UserProfile created for user %s with role %s",
-                self.user.username,
+                username,
                 self.role,
             )
         super().save(*args, **kwargs)
@@ -1,3 +1,141 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache, caches
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from recipes_app.models import Category, Recipe
+from users_app import authentication, throttling
+from users_app.authentication import cached_role
+from users_app.models import UserProfile
+
+
+class RoleCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        authentication._roles.clear()
+        self.user = User.objects.create_user("cook", "cook@example.com", "pw")
+        UserProfile.objects.create(user=self.user, role=UserProfile.Role.USER)
+        self.now = 1000.0
+        clock = mock.patch.object(
+            authentication.time, "monotonic", side_effect=lambda: self.now
+        )
+        clock.start()
+        self.addCleanup(clock.stop)
+
+    def promote_elsewhere(self):
+        # так роль змінює інший процес: сигнали тут не спрацюють
+        UserProfile.objects.filter(user=self.user).update(role=UserProfile.Role.CHEF)
+
+    @override_settings(ROLE_CACHE_TTL=30)
+    def test_role_change_reaches_process_after_ttl(self):
+        self.assertEqual(cached_role(self.user.pk), (True, UserProfile.Role.USER))
+        self.promote_elsewhere()
+
+        self.now += 29
+        with self.assertNumQueries(0):
+            self.assertEqual(cached_role(self.user.pk)[1], UserProfile.Role.USER)
+        self.now += 2
+        self.assertEqual(cached_role(self.user.pk)[1], UserProfile.Role.CHEF)
+
+    def test_saving_profile_forgets_role(self):
+        cached_role(self.user.pk)
+        self.user.profile.role = UserProfile.Role.CHEF
+        self.user.profile.save()
+
+        self.assertEqual(cached_role(self.user.pk)[1], UserProfile.Role.CHEF)
+
+    def test_deactivated_user(self):
+        cached_role(self.user.pk)
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        self.now += 31
+
+        self.assertEqual(cached_role(self.user.pk), (False, UserProfile.Role.USER))
+
+    @override_settings(ROLE_CACHE_SIZE=2)
+    def test_cache_is_bounded(self):
+        users = [self.user] + [
+            User.objects.create_user(f"u{i}", f"u{i}@example.com", "pw")
+            for i in range(3)
+        ]
+        for user in users:
+            cached_role(user.pk)
+            self.assertLessEqual(len(authentication._roles), 2)
+        # використаний нещодавно лишається, найстаріший витіснено
+        cached_role(users[2].pk)
+        cached_role(users[0].pk)
+
+        self.assertEqual(list(authentication._roles), [users[2].pk, users[0].pk])
+
+    @override_settings(ROLE_CACHE_TTL=30)
+    def test_promoted_user_can_verify_after_ttl(self):
+        recipe = Recipe.objects.create(
+            author=self.user,
+            category=Category.objects.create(name="Супи", slug="soups"),
+            title="Борщ",
+            ingredients="буряк",
+            steps="Зварити",
+        )
+        client = APIClient()
+        token = client.post(
+            reverse("token-obtain"),
+            {"username": "cook", "password": "pw"},
+            format="json",
+        ).data["access"]
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        url = reverse("recipe-verify", args=[recipe.pk])
+
+        self.assertEqual(client.post(url).status_code, 403)
+        self.promote_elsewhere()
+        self.assertEqual(client.post(url).status_code, 403)
+        self.now += 31
+        self.assertEqual(client.post(url).status_code, 200)
+
+
+@override_settings(LOGIN_MAX_FAILURES_PER_IP=3, LOGIN_MAX_FAILURES_PER_USER=100)
+class LoginThrottleTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        caches[throttling.CACHE_ALIAS].clear()
+        self.client = APIClient()
+
+    def login(self, username, **extra):
+        return self.client.post(
+            reverse("token-obtain"),
+            {"username": username, "password": "wrong"},
+            format="json",
+            **extra,
+        )
+
+    def test_forwarded_for_is_ignored_without_proxies(self):
+        for i in range(3):
+            self.login(f"user{i}", HTTP_X_FORWARDED_FOR=f"10.0.0.{i}")
+
+        response = self.login("user9", HTTP_X_FORWARDED_FOR="10.0.0.9")
+
+        self.assertEqual(response.status_code, 429)
+
+    def test_trusted_proxy_forwarded_for(self):
+        rest_framework = {**settings.REST_FRAMEWORK, "NUM_PROXIES": 1}
+        with override_settings(REST_FRAMEWORK=rest_framework):
+            for i in range(3):
+                self.login(f"user{i}", HTTP_X_FORWARDED_FOR="10.0.0.1")
+            # клієнт дописує свою адресу, проксі - справжню в кінець
+            other = self.login("user9", HTTP_X_FORWARDED_FOR="10.0.0.1, 10.0.0.2")
+            same = self.login("user9", HTTP_X_FORWARDED_FOR="10.0.0.2, 10.0.0.1")
+
+        self.assertEqual(other.status_code, 401)
+        self.assertEqual(same.status_code, 429)
+
+    def test_buckets_survive_default_cache_churn(self):
+        for i in range(3):
+            self.login(f"user{i}")
+        # більше ключів, ніж вміщує LocMem за замовчуванням (300)
+        cache.set_many({f"churn:{i}": i for i in range(1000)})
+
+        response = self.login("user9")
+
+        self.assertEqual(response.status_code, 429)
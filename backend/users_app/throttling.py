@@ -0,0 +1,100 @@
+"""Failed-login throttling per username and per client IP.
+
+Failures are counted in the ``throttle`` cache with a sliding window made of
+two fixed buckets: the previous bucket is weighted by the part of it still
+inside the window. ``check`` runs before the password is hashed, so a burst of
+bad credentials is rejected without spending PBKDF2 time on it.
+
+The client IP comes from DRF's ``get_ident``: ``REMOTE_ADDR`` unless
+``REST_FRAMEWORK["NUM_PROXIES"]`` says how many trusted proxies append to
+``X-Forwarded-For``, so a client cannot pick a fresh IP per request.
+
+The buckets live in their own cache alias so that churn in the default cache
+cannot evict them. With LocMemCache every worker process counts separately
+(the effective limit is multiplied by the number of workers) and a restart
+forgets all failures; production needs a shared backend there.
+"""
+
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.throttling import BaseThrottle
+
+from kyking_project import counters, metrics
+
+CACHE_ALIAS = "throttle"
+KEY_PREFIX = "login_throttle:"
+
+
+def _window() -> int:
+    return getattr(settings, "LOGIN_THROTTLE_WINDOW", 300)
+
+
+def _scopes(request, username):
+    # (scope, ідентифікатор, ліміт невдалих спроб за вікно)
+    scopes = [
+        (
+            "ip",
+            BaseThrottle().get_ident(request),
+            getattr(settings, "LOGIN_MAX_FAILURES_PER_IP", 20),
+        )
+    ]
+    if username:
+        scopes.append(
+            (
+                "user",
+                username.strip().lower(),
+                getattr(settings, "LOGIN_MAX_FAILURES_PER_USER", 5),
+            )
+        )
+    return scopes
+
+
+def _bucket_keys(scope, ident, bucket):
+    base = f"{KEY_PREFIX}{scope}:{ident}:"
+    return f"{base}{bucket - 1}", f"{base}{bucket}"
+
+
+def check(request, username):
+    """Seconds to wait if ``username`` or the client IP is over its limit,
+    otherwise ``None``."""
+    window = _window()
+    now = time.time()
+    bucket = int(now // window)
+    elapsed = (now % window) / window
+
+    scopes = _scopes(request, username)
+    keys = [_bucket_keys(scope, ident, bucket) for scope, ident, _ in scopes]
+    counts = caches[CACHE_ALIAS].get_many([k for pair in keys for k in pair])
+
+    for (scope, _, limit), (prev_key, curr_key) in zip(scopes, keys):
+        prev = counts.get(prev_key, 0)
+        curr = counts.get(curr_key, 0)
+        if prev * (1 - elapsed) + curr >= limit:
+            metrics.incr(f"login_throttled:{scope}")
+            # коли зважена сума опуститься нижче ліміту; якщо переповнений
+            # поточний кошик - чекаємо, поки він стане попереднім і "згасне"
+            if curr < limit:
+                wait = (1 - (limit - curr) / prev - elapsed) * window
+            else:
+                wait = (2 - elapsed - limit / curr) * window
+            return max(1, int(wait) + 1)
+    return None
+
+
+def register_failure(request, username) -> None:
+    window = _window()
+    bucket = int(time.time() // window)
+    for scope, ident, _ in _scopes(request, username):
+        key = _bucket_keys(scope, ident, bucket)[1]
+        # кошик живе два вікна: у наступному він стає "попереднім"
+        counters.incr(key, timeout=2 * window, using=CACHE_ALIAS)
+
+
+def reset_user(username) -> None:
+    """Forget failures for ``username`` after a successful login."""
+    if not username:
+        return
+    bucket = int(time.time() // _window())
+    caches[CACHE_ALIAS].delete_many(_bucket_keys("user", username.strip().lower(), bucket))
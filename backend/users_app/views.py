@@ -1,18 +1,20 @@
 import logging
 
 from django.contrib.auth.models import User
-from rest_framework import generics, permissions, status, views, serializers
+from rest_framework import exceptions, generics, permissions, status, views, serializers
 from rest_framework.response import Response
 from rest_framework_simplejwt.views import TokenObtainPairView
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from django.conf import settings
 from django.utils.http import urlsafe_base64_encode, urlsafe_base64_decode
 from django.utils.encoding import force_bytes
-from django.core.mail import send_mail
 from django.shortcuts import redirect
 from django.urls import reverse
 from django.contrib.auth.tokens import default_token_generator
 
+from notifications_app.outbox import enqueue_mail
+from users_app import throttling
+from users_app.authentication import full_user
 from users_app.serializers import RegisterSerializer, UserSerializer
 
 logger = logging.getLogger(__name__)
@@ -44,11 +46,28 @@ class MyTokenObtainPairView(TokenObtainPairView):
 
     def post(self, request, *args, **kwargs):
         username = request.data.get("username")
+        if not isinstance(username, str):
+            username = None
         logger.info("Login attempt for user %s", username)
-        response = super().post(request, *args, **kwargs)
+
+        # відхиляємо до хешування пароля: PBKDF2 - найдорожча частина входу
+        wait = throttling.check(request, username)
+        if wait is not None:
+            logger.warning("Login throttled for user %s", username)
+            raise exceptions.Throttled(wait=wait)
+
+        try:
+            response = super().post(request, *args, **kwargs)
+        except exceptions.AuthenticationFailed:
+            throttling.register_failure(request, username)
+            logger.warning("Login failed for user %s (status=401)", username)
+            raise
+
         if response.status_code == 200:
+            throttling.reset_user(username)
             logger.info("Login successful for user %s", username)
         else:
+            throttling.register_failure(request, username)
             logger.warning(
                 "Login failed for user %s (status=%s)",
                 username,
@@ -80,12 +99,11 @@ class RegisterView(generics.CreateAPIView):
             f"If you didn’t register on KyKing, ignore this email"
         )
 
-        send_mail(
+        enqueue_mail(
             subject,
             message,
-            getattr(settings, "DEFAULT_FROM_EMAIL", "no-reply@kyking.local"),
             [user.email],
-            fail_silently=False,
+            getattr(settings, "DEFAULT_FROM_EMAIL", "no-reply@kyking.local"),
         )
 
 
@@ -127,4 +145,5 @@ class MeView(generics.RetrieveAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_object(self):
-        return self.request.user
+        # request.user несе лише id/username/role - повний профіль з бази
+        return full_user(self.request.user)
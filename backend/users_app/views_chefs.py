@@ -1,6 +1,12 @@
 from django.contrib.auth.models import User
 from rest_framework import generics, permissions
 
+from kyking_project.http_cache import conditional_get
+from kyking_project.streaming import (
+    STREAM_QUERY_PARAM,
+    stream_requested,
+    streaming_json_response,
+)
 from users_app.serializers import UserSerializer
 from users_app.models import UserProfile
 
@@ -14,6 +20,19 @@ class ChefsListView(generics.ListAPIView):
             profile__role=UserProfile.Role.CHEF
         )
 
+    @conditional_get(User, UserProfile, cache_body=True, params=(STREAM_QUERY_PARAM,))
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+    def list(self, request, *args, **kwargs):
+        if stream_requested(request):
+            return streaming_json_response(
+                self.get_serializer_class(),
+                self.filter_queryset(self.get_queryset()),
+                context=self.get_serializer_context(),
+            )
+        return super().list(request, *args, **kwargs)
+
 
 class ChefDetailView(generics.RetrieveAPIView):
     serializer_class = UserSerializer
@@ -24,3 +43,7 @@ class ChefDetailView(generics.RetrieveAPIView):
         return User.objects.select_related("profile").filter(
             profile__role=UserProfile.Role.CHEF
         )
+
+    @conditional_get(User, UserProfile)
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
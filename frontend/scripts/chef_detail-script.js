@@ -47,7 +47,8 @@ $(document).ready(function () {
     $("#recipes-container").html("Loading...");
 
     $.ajax({
-      url: API_RECIPES + "?author=" + chefId,
+      // повний список одним масивом, без сторінок
+      url: API_RECIPES + "?stream=1&author=" + chefId,
       method: "GET",
       success: function (recipes) {
         $("#recipes-container").empty();
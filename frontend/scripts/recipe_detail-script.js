@@ -91,16 +91,27 @@ $(document).ready(function () {
         setScaleStatus(`Scaling ×${factor}...`);
         $("#scaleResult").empty();
 
+        const useAi = $("#scaleUseAi").is(":checked");
+        // без AI - GET з ETag: браузер сам перевикористає збережену копію
+        const request = useAi
+            ? {
+                method: "POST",
+                contentType: "application/json",
+                data: JSON.stringify({
+                    recipe_id: Number(recipeId),
+                    factor: Number(factor),
+                    use_ai: true
+                })
+            }
+            : {
+                method: "GET",
+                data: { recipe_id: Number(recipeId), factor: Number(factor) }
+            };
+
         $.ajax({
             url: API_AI_SCALE,
-            method: "POST",
             headers: { Authorization: "Bearer " + token },
-            contentType: "application/json",
-            data: JSON.stringify({
-                recipe_id: Number(recipeId),
-                factor: Number(factor),
-                use_ai: $("#scaleUseAi").is(":checked")
-            }),
+            ...request,
             success: function (data) {
                 setScaleStatus(`Done ✅ (×${data.factor})`);
                 if (data.pretty) renderPretty(data.pretty);
@@ -42,6 +42,49 @@ $(document).ready(function () {
         });
     }
 
+    // наступна сторінка списку (курсор від API) або null
+    let nextPage = null;
+
+    function renderRecipes(recipes) {
+        recipes.forEach(r => {
+            $("#recipes-container").append(`
+                <div class="recipe-card">
+                    <h3>${r.title}</h3>
+                    <p><b>Author:</b> ${r.author_username}</p>
+                    <p><b>Difficulty:</b> ${r.difficulty}</p>
+                    <p><b>Category:</b> ${r.category_name}</p>
+                    <p>${(r.description || "").slice(0, 60)}...</p>
+                    <button class="open-recipe-btn" data-id="${r.id}">View Recipe</button>
+                </div>
+            `);
+        });
+    }
+
+    function loadPage(url, first) {
+        $("#load-more-btn").hide();
+
+        $.ajax({
+            url: url,
+            method: "GET",
+            success: function (page) {
+                if (first) $("#recipes-container").empty();
+
+                if (first && !page.results.length) {
+                    $("#recipes-container").html("<p>No recipes found.</p>");
+                    return;
+                }
+
+                renderRecipes(page.results);
+                nextPage = page.next;
+                if (nextPage) $("#load-more-btn").show();
+            },
+            error: function () {
+                if (first) $("#recipes-container").html("Failed to load recipes.");
+                else $("#load-more-btn").show();
+            }
+        });
+    }
+
     function loadRecipes() {
         const params = [];
 
@@ -56,41 +99,18 @@ $(document).ready(function () {
         if (ver) params.push(`verified=${encodeURIComponent(ver)}`);
 
         const url = API_RECIPES + (params.length ? "?" + params.join("&") : "");
+        nextPage = null;
+        loadPage(url, true);
+    }
 
-        $.ajax({
-            url: url,
-            method: "GET",
-            success: function (recipes) {
-                $("#recipes-container").empty();
-
-                if (!recipes.length) {
-                    $("#recipes-container").html("<p>No recipes found.</p>");
-                    return;
-                }
-
-                recipes.forEach(r => {
-                    $("#recipes-container").append(`
-                        <div class="recipe-card">
-                            <h3>${r.title}</h3>
-                            <p><b>Author:</b> ${r.author_username}</p>
-                            <p><b>Difficulty:</b> ${r.difficulty}</p>
-                            <p><b>Category:</b> ${r.category_name}</p>
-                            <p>${(r.description || "").slice(0, 60)}...</p>
-                            <button class="open-recipe-btn" data-id="${r.id}">View Recipe</button>
-                        </div>
-                    `);
-                });
+    $("#recipes-container").on("click", ".open-recipe-btn", function () {
+        const id = $(this).data("id");
+        window.location.href = `recipe_detail.html?recipe=${id}`;
+    });
 
-                $(".open-recipe-btn").click(function () {
-                    const id = $(this).data("id");
-                    window.location.href = `recipe_detail.html?recipe=${id}`;
-                });
-            },
-            error: function () {
-                $("#recipes-container").html("Failed to load recipes.");
-            }
-        });
-    }
+    $("#load-more-btn").click(() => {
+        if (nextPage) loadPage(nextPage, false);
+    });
 
     function mustHaveToken() {
         if (!token) {